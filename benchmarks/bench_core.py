@@ -0,0 +1,186 @@
+"""
+┌─────────────────────────────────┐
+│ Benchmarks for the core library │
+└─────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+Times the main scompta operations on a synthetic ledger, and saves the
+results as JSON so they can be compared across commits:
+
+    python benchmarks/bench_core.py --output results.json
+    python benchmarks/bench_core.py --compare results.json
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+
+from dataclasses import dataclass, asdict, field
+from pathlib     import Path
+
+import ledger_gen
+
+log = logging.getLogger("Benchmarks")
+
+
+# ┌────────────────────────────────────────┐
+# │ Timing helpers                         │
+# └────────────────────────────────────────┘
+
+@dataclass
+class Bench_Result:
+    name:    str
+    repeat:  int
+    best:    float
+    median:  float
+    samples: list = field(default_factory=list)
+
+
+def timeit(name, fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+
+    result = Bench_Result(name=name, repeat=repeat, best=min(samples), median=statistics.median(samples), samples=samples)
+    log.info(f"{name:<40} best {result.best * 1000:10.2f} ms, median {result.median * 1000:10.2f} ms")
+
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=str(Path(__file__).parent)
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+# ┌────────────────────────────────────────┐
+# │ Benchmarks                             │
+# └────────────────────────────────────────┘
+
+def benchmarks(root: Path, tmp_dir: Path):
+    """
+    Return the list of (name, function) to time for the given ledger
+    """
+    import scompta.db.accounts        as accounts_db
+    import scompta.db.ledger          as ledger_db
+    import scompta.db.periods         as periods_db
+    import scompta.db.transactions    as transactions_db
+    import scompta.views.transactions as transactions_views
+
+    period_paths = sorted(x / "transactions.csv" for x in periods_db.list_from_dir(root / "periods"))
+    last_period  = period_paths[-1]
+
+    df_accounts  = accounts_db.load_from_dir(root / "accounts")
+    df_tr        = transactions_db.load(last_period, sidecar=False)
+    account      = "assets/person1/checking"
+
+    def save():
+        transactions_db.save(tmp_dir / "transactions.csv", df_tr.copy())
+
+    benchs = [
+        ("accounts.load_from_dir",           lambda: accounts_db.load_from_dir(root / "accounts")),
+        ("transactions.load",                lambda: transactions_db.load(last_period, sidecar=False)),
+        ("transactions.load[columnar]",      lambda: transactions_db.load(last_period, columnar=True, sidecar=False)),
+        ("transactions.load[sidecar]",       lambda: transactions_db.load(last_period, columnar=True)),
+        ("transactions.save",                save),
+        ("views.transactions.input",         lambda: transactions_views.input (df_tr, df_accounts, account)),
+        ("views.transactions.output",        lambda: transactions_views.output(df_tr, df_accounts, account)),
+        ("views.transactions.undefined",     lambda: transactions_views.undefined_accounts(df_tr, df_accounts)),
+        ("ledger.load_ledger[columnar]",     lambda: ledger_db.load_ledger(root / "periods", columnar=True)),
+    ]
+
+    # Importers depend on optional parsing libraries
+    sources = sorted((root / "sources").glob("*"))
+    if sources:
+        try:
+            # Submodules are imported on first access
+            from scompta.importer import ofx, qif
+
+            ofx_path = sources[-1] / "person1" / "checking.ofx"
+            qif_path = sources[-1] / "person2" / "checking.qif"
+
+            benchs += [
+                ("importer.ofx.from_file", lambda: ofx.from_file("assets/person1/checking", ofx_path)),
+                ("importer.qif.from_file", lambda: qif.from_file("assets/person2/checking", qif_path, "EUR")),
+            ]
+
+        except ImportError as exc:
+            log.warning(f"Skip importer benchmarks: {exc!s}")
+
+    return benchs
+
+
+def run(root: Path, repeat: int, only=None):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = [
+            timeit(name, fn, repeat)
+            for name, fn in benchmarks(root, Path(tmp_dir))
+            if only is None or only in name
+        ]
+
+    return {
+        "revision": git_revision(),
+        "python":   platform.python_version(),
+        "machine":  platform.machine(),
+        "date":     time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results":  [asdict(x) for x in results]
+    }
+
+
+def compare(current, reference):
+    ref_results = {x["name"]: x for x in reference["results"]}
+
+    print(f"{'benchmark':<40} {'reference':>12} {'current':>12} {'ratio':>8}")
+    for res in current["results"]:
+        ref = ref_results.get(res["name"])
+        if ref is None:
+            print(f"{res['name']:<40} {'-':>12} {res['best'] * 1000:10.2f}ms {'-':>8}")
+        else:
+            print(f"{res['name']:<40} {ref['best'] * 1000:10.2f}ms {res['best'] * 1000:10.2f}ms {res['best'] / ref['best']:8.2f}")
+
+
+# ┌────────────────────────────────────────┐
+# │ Main                                   │
+# └────────────────────────────────────────┘
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Benchmark scompta core operations")
+    parser.add_argument("--root",         type=Path, help="Existing ledger root folder (generated if not given)")
+    parser.add_argument("--years",        type=int,  default=10 )
+    parser.add_argument("--transactions", type=int,  default=300, help="Transactions per month of the generated ledger")
+    parser.add_argument("--repeat",       type=int,  default=5  )
+    parser.add_argument("--only",         help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--output",       type=Path, help="Save results to this JSON file")
+    parser.add_argument("--compare",      type=Path, help="Compare results with this JSON file")
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as gen_dir:
+        root = args.root
+        if root is None:
+            root = Path(gen_dir)
+            ledger_gen.generate(root, ledger_gen.Ledger_Scale(years=args.years, transactions_per_month=args.transactions))
+
+        results = run(root, args.repeat, args.only)
+        results["ledger"] = {"root": str(args.root) if args.root else None, "years": args.years, "transactions": args.transactions}
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        log.info(f"Results saved to {args.output}")
+
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text()))
@@ -0,0 +1,169 @@
+"""
+┌────────────────────────────────┐
+│ Import time of scompta modules │
+└────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+Each module is imported in a fresh interpreter, and the time of the import
+statement is measured. Heavy dependencies (numpy, pandas, money, importers
+libraries) must only be loaded when used, so the benchmark also fails if a
+module loads them at import time:
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --budget 50 --output startup.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from dataclasses import dataclass, asdict, field
+from pathlib     import Path
+
+log = logging.getLogger("Startup benchmarks")
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+MODULES = (
+    "scompta.db.accounts",
+    "scompta.db.amounts",
+    "scompta.db.balances",
+    "scompta.db.cache",
+    "scompta.db.catalog",
+    "scompta.db.fx",
+    "scompta.db.journal",
+    "scompta.db.ledger",
+    "scompta.db.periods",
+    "scompta.db.reports",
+    "scompta.db.search",
+    "scompta.db.sidecar",
+    "scompta.db.snapshot",
+    "scompta.db.transactions",
+    "scompta.importer",
+    "scompta.views.query",
+    "scompta.views.transactions",
+    "scompta.__main__",
+)
+
+HEAVY   = ("numpy", "pandas", "money", "ofxtools", "quiffen")
+
+PROBE   = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+
+# Lazy modules only get into sys.modules once loaded
+heavy = [x for x in {heavy!r} if x in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "heavy": heavy}}))
+"""
+
+
+# ┌────────────────────────────────────────┐
+# │ Measure                                │
+# └────────────────────────────────────────┘
+
+@dataclass
+class Startup_Result:
+    name:    str
+    repeat:  int
+    best:    float
+    median:  float
+    heavy:   list = field(default_factory=list)
+    samples: list = field(default_factory=list)
+
+
+def probe(module: str):
+    """
+    Import the module in a fresh interpreter. Returns the import time and
+    the heavy dependencies it loaded
+    """
+    proc = subprocess.run([sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+        capture_output=True, text=True, check=True, env=dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (str(SRC_DIR), os.environ.get("PYTHONPATH")))))
+    )
+
+    data = json.loads(proc.stdout.strip().splitlines()[-1])
+    return data["elapsed"], data["heavy"]
+
+
+def measure(module: str, repeat: int):
+    samples = []
+    heavy   = []
+    for _ in range(repeat):
+        elapsed, heavy = probe(module)
+        samples.append(elapsed)
+
+    result = Startup_Result(name=module, repeat=repeat, best=min(samples), median=statistics.median(samples), heavy=heavy, samples=samples)
+    log.info(f"{module:<40} best {result.best * 1000:10.2f} ms, median {result.median * 1000:10.2f} ms {'loads ' + ', '.join(heavy) if heavy else ''}")
+
+    return result
+
+
+def run(modules, repeat: int):
+    results = []
+    errors  = []
+    for module in modules:
+        try:
+            results.append(measure(module, repeat))
+        except subprocess.CalledProcessError as exc:
+            errors.append(f"Could not import {module}: {exc.stderr.strip().splitlines()[-1] if exc.stderr else exc!s}")
+
+    return {
+        "python":   platform.python_version(),
+        "machine":  platform.machine(),
+        "date":     time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results":  [asdict(x) for x in results],
+        "errors":   errors
+    }
+
+
+def check(results, budget: float = None):
+    """
+    Return the list of failures: heavy dependencies loaded at import time,
+    or imports slower than budget milliseconds
+    """
+    failures = list(results["errors"])
+    for res in results["results"]:
+        if res["heavy"]:
+            failures.append(f"{res['name']} loads {', '.join(res['heavy'])} at import time")
+
+        if budget is not None and res["best"] * 1000 > budget:
+            failures.append(f"{res['name']} takes {res['best'] * 1000:.2f} ms to import, budget is {budget:.2f} ms")
+
+    return failures
+
+
+# ┌────────────────────────────────────────┐
+# │ Main                                   │
+# └────────────────────────────────────────┘
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Benchmark scompta modules import time")
+    parser.add_argument("--repeat", type=int,   default=5)
+    parser.add_argument("--only",   help="Only measure modules whose name contains this string")
+    parser.add_argument("--budget", type=float, help="Maximum import time of each module, in milliseconds")
+    parser.add_argument("--output", type=Path,  help="Save results to this JSON file")
+
+    args = parser.parse_args()
+
+    results = run([x for x in MODULES if args.only is None or args.only in x], args.repeat)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        log.info(f"Results saved to {args.output}")
+
+    failures = check(results, args.budget)
+    for failure in failures:
+        log.error(failure)
+
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,244 @@
+"""
+┌────────────────────────────┐
+│ Synthetic ledger generator │
+└────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+Builds a root folder following the recommended hierarchy of the README
+(accounts TOML tree, periods/YYYY-MM/transactions.csv), plus OFX and QIF
+statements in sources/YYYY-MM/ for the importers.
+"""
+
+import argparse
+import csv
+import logging
+import random
+
+from dataclasses import dataclass
+from pathlib     import Path
+
+log = logging.getLogger("Ledger generator")
+
+
+# ┌────────────────────────────────────────┐
+# │ Scale parameters                       │
+# └────────────────────────────────────────┘
+
+@dataclass
+class Ledger_Scale:
+    start_year:             int   = 2015
+    years:                  int   = 10
+    persons:                int   = 2
+    extra_accounts:         int   = 50  # Additional outcome accounts
+    transactions_per_month: int   = 300
+    statement_rows:         int   = 100 # Rows in each generated OFX/QIF file
+    currencies:             tuple = ("EUR",)
+    seed:                   int   = 0
+
+
+LABELS = (
+    "CARTE SUPERMARCHE", "PRLV SEPA ASSURANCE", "VIR SALAIRE", "LOYER",
+    "FACTURE INTERNET", "ABONNEMENT TV", "RESTAURANT", "BOULANGERIE",
+    "PHARMACIE", "CARBURANT", "PEAGE", "RETRAIT DAB", "ECHEANCE PRET"
+)
+
+TAGS = ("", "", "", "food", "home", "car", "health", "leisure")
+
+
+# ┌────────────────────────────────────────┐
+# │ Accounts                               │
+# └────────────────────────────────────────┘
+
+def account_slugs(scale: Ledger_Scale):
+    """
+    Return the list of (slug, type) for the generated accounts
+    """
+    slugs = [
+        ("assets/common/checking",                "assets"     ),
+        ("liabilities/common/house_loan",         "liabilities"),
+        ("outcome/common/household/food",         "outcome"    ),
+        ("outcome/common/household/internet",     "outcome"    ),
+        ("outcome/common/household/rent",         "outcome"    ),
+        ("outcome/common/household/tv",           "outcome"    ),
+    ]
+
+    for i in range(1, scale.persons + 1):
+        slugs += [
+            (f"assets/person{i}/cash",     "assets" ),
+            (f"assets/person{i}/checking", "assets" ),
+            (f"income/person{i}/salary",   "income" ),
+            (f"outcome/person{i}/food",    "outcome"),
+            (f"outcome/person{i}/phone",   "outcome"),
+        ]
+
+    for i in range(scale.extra_accounts):
+        slugs.append((f"outcome/common/misc/group{i // 10}/expense{i}", "outcome"))
+
+    return slugs
+
+
+def write_accounts(root: Path, slugs):
+    for slug, acc_type in slugs:
+        fpath = root / "accounts" / f"{slug}.toml"
+        fpath.parent.mkdir(parents=True, exist_ok=True)
+        fpath.write_text(f'[account]\nname="{slug.replace("/", " ")}"\ntype="{acc_type}"\n')
+
+
+# ┌────────────────────────────────────────┐
+# │ Transactions                           │
+# └────────────────────────────────────────┘
+
+def _amount(rng, currency, low, high):
+    return f"{currency} {rng.uniform(low, high):.2f}"
+
+
+def period_rows(rng, scale: Ledger_Scale, slugs):
+    assets   = [x for x, t in slugs if t == "assets" ]
+    incomes  = [x for x, t in slugs if t == "income" ]
+    outcomes = [x for x, t in slugs if t == "outcome"]
+
+    rows = []
+
+    # Salaries
+    for i, income in enumerate(incomes):
+        rows.append((1, "", "VIR SALAIRE", income, f"assets/person{i + 1}/checking",
+            _amount(rng, scale.currencies[0], 1500, 3500), ""))
+
+    while len(rows) < scale.transactions_per_month:
+        kind = rng.random()
+
+        if kind < 0.85:
+            origin, target = rng.choice(assets), rng.choice(outcomes)
+        elif kind < 0.95:
+            origin, target = rng.sample(assets, 2)
+        else:
+            origin, target = rng.choice(assets), "liabilities/common/house_loan"
+
+        rows.append((
+            rng.randint(1, 28),
+            f"{rng.randint(8, 21):02d}:{rng.randint(0, 59):02d}" if rng.random() < 0.2 else "",
+            f"{rng.choice(LABELS)} {rng.randint(1, 9999):04d}",
+            origin,
+            target,
+            _amount(rng, rng.choice(scale.currencies), 1, 300),
+            rng.choice(TAGS)
+        ))
+
+    rows.sort(key=lambda x: x[0])
+    return rows
+
+
+def write_period(root: Path, period: str, rows):
+    fpath = root / "periods" / period / "transactions.csv"
+    fpath.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(str(fpath), "w", newline="") as fhandle:
+        writer = csv.writer(fhandle, delimiter=";", lineterminator="\n")
+        writer.writerow(("day", "time", "label", "origin", "target", "amount", "tag"))
+        writer.writerows(rows)
+
+
+# ┌────────────────────────────────────────┐
+# │ Bank statements                        │
+# └────────────────────────────────────────┘
+
+def _statement_rows(rng, scale: Ledger_Scale):
+    return [
+        (rng.randint(1, 28), round(rng.uniform(-300, 300), 2), f"{rng.choice(LABELS)} {rng.randint(1, 9999):04d}")
+        for _ in range(scale.statement_rows)
+    ]
+
+
+def write_ofx(fpath: Path, year: int, month: int, rows):
+    trns = "".join(
+        "<STMTTRN>"
+        f"<TRNTYPE>{'CREDIT' if amount > 0 else 'DEBIT'}</TRNTYPE>"
+        f"<DTPOSTED>{year:04d}{month:02d}{day:02d}120000</DTPOSTED>"
+        f"<TRNAMT>{amount:.2f}</TRNAMT>"
+        f"<FITID>{year:04d}{month:02d}{i:06d}</FITID>"
+        f"<NAME>{label}</NAME>"
+        "</STMTTRN>\n"
+        for i, (day, amount, label) in enumerate(rows)
+    )
+
+    fpath.parent.mkdir(parents=True, exist_ok=True)
+    fpath.write_text(
+        '<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n'
+        '<?OFX OFXHEADER="200" VERSION="220" SECURITY="NONE" OLDFILEUID="NONE" NEWFILEUID="NONE"?>\n'
+        "<OFX>"
+        "<SIGNONMSGSRSV1><SONRS><STATUS><CODE>0</CODE><SEVERITY>INFO</SEVERITY></STATUS>"
+        f"<DTSERVER>{year:04d}{month:02d}28120000</DTSERVER><LANGUAGE>FRA</LANGUAGE></SONRS></SIGNONMSGSRSV1>"
+        "<BANKMSGSRSV1><STMTTRNRS><TRNUID>0</TRNUID><STATUS><CODE>0</CODE><SEVERITY>INFO</SEVERITY></STATUS>"
+        "<STMTRS><CURDEF>EUR</CURDEF>"
+        "<BANKACCTFROM><BANKID>12345</BANKID><ACCTID>000111</ACCTID><ACCTTYPE>CHECKING</ACCTTYPE></BANKACCTFROM>"
+        f"<BANKTRANLIST><DTSTART>{year:04d}{month:02d}01120000</DTSTART><DTEND>{year:04d}{month:02d}28120000</DTEND>\n"
+        f"{trns}"
+        "</BANKTRANLIST>"
+        f"<LEDGERBAL><BALAMT>0.00</BALAMT><DTASOF>{year:04d}{month:02d}28120000</DTASOF></LEDGERBAL>"
+        "</STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n"
+    )
+
+
+def write_qif(fpath: Path, year: int, month: int, rows):
+    fpath.parent.mkdir(parents=True, exist_ok=True)
+    fpath.write_text("!Type:Bank\n" + "".join(
+        f"D{day:02d}/{month:02d}/{year:04d}\nT{amount:.2f}\nP{label}\n^\n"
+        for day, amount, label in rows
+    ))
+
+
+# ┌────────────────────────────────────────┐
+# │ Generate                               │
+# └────────────────────────────────────────┘
+
+def generate(root: Path, scale: Ledger_Scale = None, sources: bool = True):
+    """
+    Generate a synthetic ledger in the given root folder. Returns the list
+    of generated period names.
+    """
+    root  = Path(root)
+    scale = scale or Ledger_Scale()
+    rng   = random.Random(scale.seed)
+
+    slugs = account_slugs(scale)
+    write_accounts(root, slugs)
+
+    periods = []
+    for year in range(scale.start_year, scale.start_year + scale.years):
+        for month in range(1, 13):
+            period = f"{year:04d}-{month:02d}"
+            periods.append(period)
+
+            log.debug(f"Generate period {period}")
+            write_period(root, period, period_rows(rng, scale, slugs))
+
+            if sources:
+                write_ofx(root / "sources" / period / "person1" / "checking.ofx", year, month, _statement_rows(rng, scale))
+                write_qif(root / "sources" / period / "person2" / "checking.qif", year, month, _statement_rows(rng, scale))
+
+    log.info(f"Generated {len(periods)} periods and {len(slugs)} accounts in {root}")
+
+    return periods
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic ledger")
+    parser.add_argument("root", type=Path)
+    parser.add_argument("--years",        type=int, default=10 )
+    parser.add_argument("--transactions", type=int, default=300, help="Transactions per month")
+    parser.add_argument("--accounts",     type=int, default=50 , help="Additional outcome accounts")
+    parser.add_argument("--seed",         type=int, default=0  )
+    parser.add_argument("--no-sources",   action="store_true"  , help="Don't generate bank statements")
+
+    args = parser.parse_args()
+
+    generate(args.root, Ledger_Scale(
+        years                  = args.years,
+        transactions_per_month = args.transactions,
+        extra_accounts         = args.accounts,
+        seed                   = args.seed
+    ), sources=not args.no_sources)
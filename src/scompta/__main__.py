@@ -0,0 +1,182 @@
+"""
+┌────────────────────────────────────┐
+│ Command line for common ledger use │
+└────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+Quick queries on a root folder following the recommended hierarchy:
+
+    python -m scompta balance assets/person1/checking --period 2023-04
+    python -m scompta summary 2023-04
+    python -m scompta undefined
+    python -m scompta import 2023-04 2023-05
+
+Modules are only imported by the command using them, so small queries
+don't pay for the importers.
+
+Changes journaled by a running web server are applied in memory: queries
+never write the transactions files.
+"""
+
+import argparse
+import logging
+import sys
+
+from pathlib import Path
+
+log = logging.getLogger(__file__)
+
+
+# ┌────────────────────────────────────────┐
+# │ Helpers                                │
+# └────────────────────────────────────────┘
+
+def _format_money(values):
+    return ", ".join(f"{x.amount} {cur}" for cur, x in sorted(values.items())) or "0"
+
+
+# ┌────────────────────────────────────────┐
+# │ Commands                               │
+# └────────────────────────────────────────┘
+
+def cmd_balance(args):
+    """
+    Balance of an account, or of all the accounts, at the end of a period
+    """
+    from scompta.db import balances
+
+    engine = balances.Balance_Engine(args.root / "periods")
+    engine.refresh()
+
+    if not engine.periods:
+        log.warning("No periods found")
+        return 0
+
+    period = args.period or engine.periods[-1]
+
+    if args.account is not None:
+        print(f"{args.account} at the end of {period}: {_format_money(engine.balance(args.account, period))}")
+        print(f"    opening: {_format_money(engine.opening(args.account, period))}")
+        print(f"    delta:   {_format_money(engine.delta  (args.account, period))}")
+
+    else:
+        for account in engine.accounts(period):
+            print(f"{account:<50} {_format_money(engine.balance(account, period))}")
+
+    return 0
+
+
+def cmd_summary(args):
+    """
+    Number of transactions, days and per currency totals of periods
+    """
+    from scompta.db import accounts, catalog
+
+    period_catalog = catalog.Period_Catalog(args.root / "periods", accounts.Account_Index(args.root / "accounts"))
+    period_catalog.refresh()
+
+    names = args.periods or period_catalog.periods
+    for name in names:
+        if name not in period_catalog.summaries:
+            log.error(f"Period not found: {name}")
+            return 1
+
+        summary = period_catalog.summary(name).to_dict()
+        print(f"{name}: {summary['rows']} transactions, days {summary['first_day']} to {summary['last_day']}")
+
+        for cur, totals in summary["totals"].items():
+            print(f"    {cur}: total {totals['total']}, in {totals['in']}, out {totals['out']}")
+
+    return 0
+
+
+def cmd_undefined(args):
+    """
+    Accounts used by transactions but not defined in the accounts folder
+    """
+    from scompta.db    import accounts, ledger
+    from scompta.views import transactions as transactions_views
+
+    df_accounts = accounts.load_from_dir(args.root / "accounts")
+    df_tr       = ledger.load_ledger(args.root / "periods", periods=args.periods or None, journals=True)
+
+    df_unknown, tr_unknown = transactions_views.undefined_accounts(df_tr, df_accounts)
+
+    for path in df_unknown["path"]:
+        count = int(((tr_unknown["origin"] == path) | (tr_unknown["target"] == path)).sum())
+        print(f"{path:<50} {count} transactions")
+
+    # Non zero exit code, for use in scripts
+    return 1 if len(df_unknown) else 0
+
+
+def cmd_import(args):
+    """
+    Import the statements of the sources folder, skipping already imported
+    transactions
+    """
+    from scompta.importer import dedup, sources
+
+    specs  = sources.load_specs(args.specs or args.root / "sources.toml")
+    result = dedup.ingest_new(args.root / "sources", args.root / "periods", specs,
+        period_names=args.periods or None, workers=args.workers
+    )
+
+    for period, count in sorted(result.items()):
+        print(f"{period}: {count} new transactions")
+
+    return 0
+
+
+# ┌────────────────────────────────────────┐
+# │ Main                                   │
+# └────────────────────────────────────────┘
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="scompta", description="Quick queries on a scompta ledger")
+    parser.add_argument("--root",    type=Path, default=Path("."), help="Root folder, with accounts and periods folders")
+    parser.add_argument("--verbose", action="store_true")
+
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    p_balance = commands.add_parser("balance", help=cmd_balance.__doc__.strip())
+    p_balance.add_argument("account", nargs="?", help="Account slug, all accounts if not given")
+    p_balance.add_argument("--period", help="YYYY-MM period, the last one if not given")
+    p_balance.set_defaults(func=cmd_balance)
+
+    p_summary = commands.add_parser("summary", help=cmd_summary.__doc__.strip())
+    p_summary.add_argument("periods", nargs="*", help="YYYY-MM periods, all if not given")
+    p_summary.set_defaults(func=cmd_summary)
+
+    p_undefined = commands.add_parser("undefined", help=cmd_undefined.__doc__.strip())
+    p_undefined.add_argument("periods", nargs="*", help="YYYY-MM periods, all if not given")
+    p_undefined.set_defaults(func=cmd_undefined)
+
+    p_import = commands.add_parser("import", help=cmd_import.__doc__.strip())
+    p_import.add_argument("periods", nargs="*", help="YYYY-MM periods, all if not given")
+    p_import.add_argument("--specs",   type=Path, help="Source specs file, sources.toml of the root folder by default")
+    p_import.add_argument("--workers", type=int,  help="Number of worker processes")
+    p_import.set_defaults(func=cmd_import)
+
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    try:
+        return args.func(args)
+
+    except FileNotFoundError as exc:
+        log.error(f"File not found: {exc.filename or exc!s}")
+        return 1
+
+    except RuntimeError as exc:
+        # Journal conflicts, see scompta.db.journal
+        log.error(str(exc))
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,20 +8,29 @@
 """
 
 import logging
+import os
+import threading
+import time
 import traceback
 
 import toml
-import pandas as pd
 
-from dataclasses import asdict
+from concurrent         import futures
+from dataclasses        import asdict, fields
+from itertools          import repeat
 
 from pathlib import Path
 
+from scompta.model         import slugs
 from scompta.model.account import (
     Account,
     Account_Type
 )
 
+from scompta.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
 log = logging.getLogger(__file__)
 
 
@@ -47,6 +56,23 @@ def load_from_file(path: Path, acc_path):
         # Return account information
         return Account(path=acc_path, **acc_data)
 
+def _load_acc(root_path: Path, fpath: Path):
+    fpath = Path(fpath)
+
+    try:
+        # Get account relative path name
+        acc_path = slugs.intern(str(fpath.parent.relative_to(root_path) / fpath.stem))
+
+        # Load account object
+        return load_from_file(fpath, acc_path)
+    except Exception as exc:
+        log.warn(f"Failed to process data from {fpath}, Skipping")
+        log.warn(traceback.format_exc())
+
+def _accounts_frame(accs):
+    # Columns are known even without accounts
+    return pd.DataFrame(accs, columns=[x.name for x in fields(Account)]).set_index("path")
+
 def load_from_dir(root_path: Path):
     """
     Loads the account hierarchy from given folder. Returns a DataFrame
@@ -54,22 +80,105 @@ def load_from_dir(root_path: Path):
     """
     root_path = Path(root_path)
 
-    def load_acc(fpath):
-        try:
-            # Get account relative path name
-            acc_path = str(fpath.parent.relative_to(root_path) / fpath.stem)
+    log.info(f"Load accounts from path: {root_path}")
+
+    accs_gen = map(lambda fpath: _load_acc(root_path, fpath), root_path.glob("**/*.toml"))
 
-            # Load account object
-            return load_from_file(fpath, acc_path)
-        except Exception as exc:
-            log.warn(f"Failed to process data from {fpath}, Skipping")
-            log.warn(traceback.format_exc())
+    return _accounts_frame([acc for acc in accs_gen if acc is not None])
 
-    log.info(f"Load accounts from path: {root_path}")
 
-    accs_gen = map(load_acc, root_path.glob("**/*.toml"))
+# ┌────────────────────────────────────────┐
+# │ Cached account index                   │
+# └────────────────────────────────────────┘
+
+class Account_Index:
+    """
+    Cached version of load_from_dir. Each call to load() walks the
+    directory and only parses the files that were added or modified
+    since the last call. generation is incremented each time the
+    account list changes.
+
+    Callers on a hot path can pass max_age, in seconds, to skip the
+    directory walk if the last one is more recent.
+    """
+
+    def __init__(self, root_path: Path, workers=None, parallel_threshold=256):
+        self.root_path          = Path(root_path)
+        self.workers            = workers
+        self.parallel_threshold = parallel_threshold
+
+        self.generation         = 0
+        self.scanned            = None # time.monotonic() of the last walk
+
+        self._files             = {} # path -> ((mtime_ns, size), Account)
+        self._df                = None
+        self._lock              = threading.Lock()
+
+    def _scan(self):
+        stats = {}
+        for dirpath, dirnames, filenames in os.walk(str(self.root_path)):
+            for fname in filenames:
+                if fname.endswith(".toml"):
+                    fpath = os.path.join(dirpath, fname)
+                    st    = os.stat(fpath)
+
+                    stats[fpath] = (st.st_mtime_ns, st.st_size)
+
+        return stats
+
+    def _parse(self, fpaths):
+        if len(fpaths) >= self.parallel_threshold and self.workers != 1:
+            with futures.ProcessPoolExecutor(max_workers=self.workers) as pool:
+                accs = list(pool.map(_load_acc, repeat(self.root_path), fpaths, chunksize=32))
+
+            # Paths coming back from the workers are new string objects
+            for acc in accs:
+                if acc is not None:
+                    acc.path = slugs.intern(acc.path)
+
+            return accs
+        else:
+            return [_load_acc(self.root_path, x) for x in fpaths]
+
+    def refresh(self, max_age=None):
+        """
+        Update the index from the directory content. Returns True if
+        the account list changed
+        """
+        with self._lock:
+            if max_age is not None and self._df is not None and time.monotonic() - self.scanned < max_age:
+                return False
+
+            stats        = self._scan()
+            self.scanned = time.monotonic()
+
+            changed = [x for x, v in stats.items() if x not in self._files or self._files[x][0] != v]
+            removed = [x for x in self._files if x not in stats]
+
+            if self._df is not None and not changed and not removed:
+                return False
+
+            log.info(f"Update account index from {self.root_path}: {len(changed)} changed, {len(removed)} removed")
+
+            for fpath in removed:
+                del self._files[fpath]
+
+            for fpath, acc in zip(changed, self._parse(changed)):
+                self._files[fpath] = (stats[fpath], acc)
+
+            accs     = [acc for _, (_, acc) in sorted(self._files.items()) if acc is not None]
+            self._df = _accounts_frame(accs)
+
+            self.generation += 1
+
+            return True
 
-    return pd.DataFrame(accs_gen).set_index("path")
+    def load(self, max_age=None):
+        """
+        Return the accounts DataFrame, as load_from_dir would
+        """
+        self.refresh(max_age)
+        return self._df.copy()
 
 
 # ┌────────────────────────────────────────┐
@@ -0,0 +1,214 @@
+"""
+┌───────────────────────────────────────┐
+│ Fixed-point columnar amounts          │
+└───────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+In columnar mode, the amount column holds int64 values in minor units
+(amount * SCALE), and the currency is kept in a separate categorical
+column. Money objects are only built back at the edges.
+"""
+
+import logging
+
+from scompta.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+money = lazy_import("money")
+
+log = logging.getLogger(__file__)
+
+DECIMALS     = 4
+SCALE        = 10 ** DECIMALS
+
+# Minimum number of decimals when formatting values back
+MIN_DECIMALS = 2
+
+
+# ┌────────────────────────────────────────┐
+# │ Parse and format                       │
+# └────────────────────────────────────────┘
+
+def parse(values: "pd.Series"):
+    """
+    Parse a series of "CUR 123.45" strings. Returns the int64 array of
+    minor units and the categorical currency array.
+
+    Strings are handled as a bytes matrix, one column per character
+    position, so the work is a few array operations per position instead
+    of per row.
+    """
+
+    if len(values) == 0:
+        return np.zeros(0, dtype="int64"), pd.Categorical([])
+
+    raw      = np.char.strip(np.asarray(values, dtype="S"))
+    n, width = len(raw), raw.dtype.itemsize
+    chars    = np.ascontiguousarray(raw.view(np.uint8).reshape(n, width).T)
+
+    sep      = np.full(n, width, dtype="int64") # Position of the space after the currency
+    minor    = np.zeros(n, dtype="int64")
+    digits   = np.zeros(n, dtype="int64")
+    decimals = np.zeros(n, dtype="int64")
+    point    = np.zeros(n, dtype=bool)
+    negative = np.zeros(n, dtype=bool)
+    invalid  = np.zeros(n, dtype=bool)
+
+    for pos, c in enumerate(chars):
+        sep    = np.where((c == ord(" ")) & (sep == width), pos, sep)
+
+        number = (pos > sep) & (c != 0)
+        digit  = number & (c >= ord("0")) & (c <= ord("9"))
+        dot    = number & (c == ord("."))
+        sign   = number & ((c == ord("-")) | (c == ord("+")))
+
+        # Sign first, a single dot, nothing else than digits (no spaces,
+        # as Money would refuse them)
+        invalid  |= (number & ~(digit | dot | sign)) | (sign & ((digits > 0) | point)) | (dot & point)
+
+        minor     = np.where(digit, minor * 10 + (c - ord("0")), minor)
+        digits   += digit
+        decimals += digit & point
+        point    |= dot
+        negative |= sign & (c == ord("-"))
+
+    # More digits would overflow int64, currency codes fit in 8 bytes
+    invalid |= (digits == 0) | (digits > 18 - DECIMALS) | (sep > 8)
+    if invalid.any():
+        raise ValueError(f"Invalid amount: {values.iloc[invalid.argmax()]!r}")
+
+    # Don't silently lose precision
+    extra = np.maximum(decimals - DECIMALS, 0)
+    lost  = minor % (10 ** extra) != 0
+    if lost.any():
+        raise ValueError(f"Amount with more than {DECIMALS} decimals: {values.iloc[lost.argmax()]!r}")
+
+    minor = minor // (10 ** extra) * (10 ** np.maximum(DECIMALS - decimals, 0))
+    minor = np.where(negative, -minor, minor)
+
+    # Currency codes as 8 bytes integers, factorized without Python objects
+    currency = np.zeros((8, n), dtype=np.uint8)
+    rows     = min(width, 8)
+
+    currency[:rows] = np.where(np.arange(rows)[:, None] < sep, chars[:rows], 0)
+    codes, uniques  = pd.factorize(np.ascontiguousarray(currency.T).view("<u8").ravel())
+
+    names = [x.tobytes().rstrip(b"\0").decode("ascii") for x in uniques]
+    return minor, pd.Categorical.from_codes(codes, names).reorder_categories(sorted(names))
+
+
+def format_values(minor):
+    """
+    Format minor units back to decimal strings
+    """
+    minor = pd.Series(np.asarray(minor, dtype="int64"))
+
+    sign  = pd.Series(np.where(minor < 0, "-", ""), dtype=object)
+    absv  = minor.abs()
+
+    ints  = (absv // SCALE).astype(str)
+    fracs = (absv %  SCALE).astype(str).str.zfill(DECIMALS).str.rstrip("0").str.ljust(MIN_DECIMALS, "0")
+
+    return sign + ints + "." + fracs
+
+
+def to_strings(df: "pd.DataFrame"):
+    """
+    Format a columnar DataFrame amounts as "CUR 123.45" strings, the
+    format used in transactions CSV files
+    """
+    values = format_values(df["amount"]).to_numpy()
+    return pd.Series(df["currency"].astype(str).to_numpy() + " " + values, index=df.index)
+
+
+def to_money(df: "pd.DataFrame"):
+    """
+    Convert columnar amounts to a Series of Money objects
+    """
+    values = format_values(df["amount"])
+    return pd.Series(
+        [money.Money(v, c) for v, c in zip(values, df["currency"])],
+        index=df.index, dtype=object
+    )
+
+
+def _minor_units(value: "money.Money"):
+    minor = value.amount * SCALE
+    if minor != minor.to_integral_value():
+        raise ValueError(f"Amount with more than {DECIMALS} decimals: {value!s}")
+
+    return int(minor)
+
+
+def from_money(amounts: "pd.Series"):
+    """
+    Convert a Series of Money objects to minor units and currencies.
+    Amounts with more than DECIMALS decimals are refused.
+    """
+    minor    = np.fromiter((_minor_units(x) for x in amounts), dtype="int64", count=len(amounts))
+    currency = pd.Categorical([x.currency for x in amounts])
+
+    return minor, currency
+
+
+# ┌────────────────────────────────────────┐
+# │ Columnar DataFrames                    │
+# └────────────────────────────────────────┘
+
+def is_columnar(df: "pd.DataFrame"):
+    return "currency" in df.columns and pd.api.types.is_integer_dtype(df["amount"])
+
+
+def columnar(df: "pd.DataFrame"):
+    """
+    Return a columnar copy of a DataFrame holding Money amounts
+    """
+    if is_columnar(df):
+        return df.copy()
+
+    minor, currency = from_money(df["amount"])
+    return df.assign(amount=minor, currency=currency)
+
+
+def with_money(df: "pd.DataFrame"):
+    """
+    Return a copy of a columnar DataFrame with Money amounts
+    """
+    if not is_columnar(df):
+        return df.copy()
+
+    return df.assign(amount=to_money(df)).drop(columns=["currency"])
+
+
+# ┌────────────────────────────────────────┐
+# │ Aggregations                           │
+# └────────────────────────────────────────┘
+
+def total(df: "pd.DataFrame"):
+    """
+    Sum amounts per currency. Returns a dict currency -> Money
+    """
+    sums = df.groupby("currency", observed=True)["amount"].sum()
+    return {cur: money.Money(v, cur) for cur, v in zip(sums.index.astype(str), format_values(sums.to_numpy()))}
+
+
+def groupby_total(df: "pd.DataFrame", by):
+    """
+    Sum amounts grouped by the given columns and per currency. Returns
+    a columnar DataFrame
+    """
+    if isinstance(by, str):
+        by = [by]
+
+    return df.groupby([*by, "currency"], observed=True)["amount"].sum().reset_index()
+
+
+def negate(df: "pd.DataFrame"):
+    """
+    Return a copy with negated amounts
+    """
+    return df.assign(amount=-df["amount"])
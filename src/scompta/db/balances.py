@@ -0,0 +1,213 @@
+"""
+┌────────────────────────────────────────────┐
+│ Per-account balances with period snapshots │
+└────────────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+Balances are computed from the transactions: the target account of a
+transaction is credited with its amount, and the origin account debited.
+For each period, the per-account deltas and the closing balances are kept
+in a snapshot file, so only modified periods are read again.
+"""
+
+import bisect
+import logging
+
+from pathlib     import Path
+
+from scompta.db  import amounts, snapshot
+
+from scompta.lazy import lazy_import
+
+money = lazy_import("money")
+
+log = logging.getLogger(__file__)
+
+SNAPSHOT_NAME = ".balances.json"
+
+
+# ┌────────────────────────────────────────┐
+# │ Helpers                                │
+# └────────────────────────────────────────┘
+
+def period_deltas(df):
+    """
+    Compute the balance variation of each account for the given columnar
+    transactions DataFrame. Returns a dict account -> currency -> minor units
+    """
+    deltas = {}
+
+    for col, sign in (("target", 1), ("origin", -1)):
+        for acc, cur, value in amounts.groupby_total(df, col).itertuples(index=False):
+            acc_deltas      = deltas.setdefault(str(acc), {})
+            acc_deltas[cur] = acc_deltas.get(cur, 0) + sign * int(value)
+
+    return deltas
+
+
+def _add(balances, deltas):
+    result = {acc: dict(x) for acc, x in balances.items()}
+
+    for acc, acc_deltas in deltas.items():
+        acc_result = result.setdefault(acc, {})
+        for cur, value in acc_deltas.items():
+            acc_result[cur] = acc_result.get(cur, 0) + value
+
+    return result
+
+
+def _to_money(values):
+    # Same decimals as the transactions files
+    return {cur: money.Money(v, cur) for cur, v in zip(values, amounts.format_values(list(values.values())))}
+
+
+# ┌────────────────────────────────────────┐
+# │ Balance engine                         │
+# └────────────────────────────────────────┘
+
+class Balance_Engine:
+    """
+    Keeps opening and closing balances for each account and period of the
+    given periods folder. Call refresh() to take modified periods into
+    account.
+    """
+
+    def __init__(self, root: Path, snapshot_path: Path = None):
+        self.root          = Path(root)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path is not None else self.root / SNAPSHOT_NAME
+
+        self.periods       = [] # Sorted period names
+        self.versions      = {} # period -> file version
+        self.deltas        = {} # period -> account -> currency -> minor units
+        self.closing       = {} # period -> account -> currency -> minor units
+
+        self._load_snapshot()
+
+    # ─────────────── Snapshot ─────────────── #
+
+    def _load_snapshot(self):
+        if not self.snapshot_path.is_file():
+            return
+
+        try:
+            data          = snapshot.read_json(self.snapshot_path)
+
+            self.periods  = data["periods"]
+            self.versions = data["versions"]
+            self.deltas   = data["deltas"]
+            self.closing  = data["closing"]
+
+        except Exception as exc:
+            log.warning(f"Could not load balance snapshot {self.snapshot_path}: {exc!s}, rebuilding")
+
+            self.periods, self.versions, self.deltas, self.closing = [], {}, {}, {}
+
+    def save(self):
+        """
+        Write the snapshot file
+        """
+        snapshot.write_json(self.snapshot_path, {
+            "periods":  self.periods,
+            "versions": self.versions,
+            "deltas":   self.deltas,
+            "closing":  self.closing
+        })
+
+    # ──────────────── Refresh ─────────────── #
+
+    def refresh(self):
+        """
+        Recompute the deltas of modified periods, and the closing balances
+        from the first modified period onwards. Returns True if anything
+        changed.
+        """
+        # Periods without deltas are computed again
+        changes = snapshot.changes(self.root, {x: v for x, v in self.versions.items() if x in self.deltas})
+        names   = changes.names
+
+        first_changed = None
+
+        # Removed periods invalidate the balances after them
+        for name in set(self.periods) - set(names):
+            log.info(f"Period {name} removed from balances")
+
+            self.versions.pop(name, None)
+            self.deltas  .pop(name, None)
+            self.closing .pop(name, None)
+
+            idx = bisect.bisect_left(names, name)
+            first_changed = idx if first_changed is None else min(first_changed, idx)
+
+        for name, (fpath, version) in changes.changed.items():
+            log.info(f"Compute balance deltas for period {name}")
+
+            self.deltas  [name] = period_deltas(snapshot.load_frame(fpath, version))
+            self.versions[name] = version
+
+            idx = names.index(name)
+            first_changed = idx if first_changed is None else min(first_changed, idx)
+
+        self.periods = names
+        if first_changed is None:
+            return False
+
+        # Update prefix sums
+        prev = self.closing[names[first_changed - 1]] if first_changed > 0 else {}
+        for name in names[first_changed:]:
+            prev = _add(prev, self.deltas[name])
+            self.closing[name] = prev
+
+        self.save()
+
+        return True
+
+    # ──────────────── Queries ─────────────── #
+
+    def _closing_before(self, period, inclusive):
+        if inclusive:
+            idx = bisect.bisect_right(self.periods, period)
+        else:
+            idx = bisect.bisect_left (self.periods, period)
+
+        if idx == 0:
+            return {}
+        else:
+            return self.closing[self.periods[idx - 1]]
+
+    def balance(self, account: str, period: str = None):
+        """
+        Balance of the account at the end of the given period (or of the
+        last period). Returns a dict currency -> Money
+        """
+        if period is None:
+            closing = self.closing[self.periods[-1]] if self.periods else {}
+        else:
+            closing = self._closing_before(period, inclusive=True)
+
+        return _to_money(closing.get(account, {}))
+
+    def accounts(self, period: str = None):
+        """
+        Sorted slugs of the accounts with a balance at the end of the given
+        period (or of the last period)
+        """
+        if period is None:
+            closing = self.closing[self.periods[-1]] if self.periods else {}
+        else:
+            closing = self._closing_before(period, inclusive=True)
+
+        return sorted(closing)
+
+    def opening(self, account: str, period: str):
+        """
+        Balance of the account at the start of the given period
+        """
+        return _to_money(self._closing_before(period, inclusive=False).get(account, {}))
+
+    def delta(self, account: str, period: str):
+        """
+        Balance variation of the account during the given period
+        """
+        return _to_money(self.deltas.get(period, {}).get(account, {}))
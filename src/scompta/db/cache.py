@@ -0,0 +1,170 @@
+"""
+┌──────────────────────────────────────────────┐
+│ In-process cache for period transaction data │
+└──────────────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+import logging
+import os
+import sys
+import threading
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib     import Path
+
+from scompta.db  import transactions
+
+log = logging.getLogger(__file__)
+
+
+# ┌────────────────────────────────────────┐
+# │ File version                           │
+# └────────────────────────────────────────┘
+
+@dataclass(frozen=True)
+class File_Version:
+    """
+    Identifies one state of a file on disk. Any write to the file
+    changes at least one of these fields, and a replace through a
+    rename changes the inode.
+    """
+
+    mtime_ns: int
+    size:     int
+    inode:    int
+
+    @classmethod
+    def from_path(cls, fpath: Path):
+        st = os.stat(str(fpath))
+        return cls(mtime_ns=st.st_mtime_ns, size=st.st_size, inode=st.st_ino)
+
+
+# ┌────────────────────────────────────────┐
+# │ Period cache                           │
+# └────────────────────────────────────────┘
+
+@dataclass
+class _Cache_Entry:
+    version: File_Version
+    df:      object
+    nbytes:  int
+    extras:  dict = field(default_factory=dict)
+
+
+def _extra_size(value):
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    elif isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(map(_extra_size, value))
+    else:
+        return sys.getsizeof(value)
+
+
+class Period_Cache:
+    """
+    LRU cache of loaded period DataFrames, keyed by the CSV path and
+    validated against the file version at each access. Derived values
+    (serialized payloads, indexes, ...) can be attached to an entry and
+    are dropped together with it when the file changes.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, loader=transactions.load):
+        self.max_bytes = max_bytes
+        self.loader    = loader
+
+        self._entries  = OrderedDict()
+        self._nbytes   = 0
+        self._lock     = threading.RLock()
+
+    # ──────────────── Helpers ─────────────── #
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry.nbytes
+
+    def _evict(self):
+        # Always keep the most recent entry, even if it is bigger than the budget
+        while self._nbytes > self.max_bytes and len(self._entries) > 1:
+            key, _ = next(iter(self._entries.items()))
+            log.debug(f"Evict {key} from period cache")
+            self._drop(key)
+
+    def _entry(self, fpath: Path):
+        key     = str(Path(fpath).resolve())
+        version = File_Version.from_path(key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                return entry
+
+        # Version is taken before parsing: if the file changes meanwhile,
+        # the next access sees a new version and reloads.
+        log.debug(f"Load {key} into period cache")
+        df     = self.loader(key)
+        nbytes = int(df.memory_usage(index=True, deep=True).sum())
+        entry  = _Cache_Entry(version=version, df=df, nbytes=nbytes)
+
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = entry
+            self._nbytes      += nbytes
+            self._evict()
+
+        return entry
+
+    # ─────────────── Accessors ────────────── #
+
+    def version(self, fpath: Path):
+        """
+        Current version of the file at the given path
+        """
+        return File_Version.from_path(fpath)
+
+    def load(self, fpath: Path):
+        """
+        Return a copy of the period DataFrame, parsing the file only if
+        it changed since the last access
+        """
+        return self._entry(fpath).df.copy()
+
+    def derived(self, fpath: Path, name: str, builder):
+        """
+        Return a value derived from the period DataFrame. builder is
+        called with a copy of the DataFrame and its file version on a
+        cache miss, and its result is kept until the file changes.
+        """
+        entry = self._entry(fpath)
+
+        with self._lock:
+            if name in entry.extras:
+                return entry.extras[name]
+
+        value  = builder(entry.df.copy(), entry.version)
+        nbytes = _extra_size(value)
+
+        with self._lock:
+            # Entry may have been replaced or evicted while building
+            key = str(Path(fpath).resolve())
+            if self._entries.get(key) is entry and name not in entry.extras:
+                entry.extras[name] = value
+                entry.nbytes      += nbytes
+                self._nbytes      += nbytes
+                self._evict()
+
+        return value
+
+    def invalidate(self, fpath: Path):
+        with self._lock:
+            self._drop(str(Path(fpath).resolve()))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
@@ -0,0 +1,204 @@
+"""
+┌──────────────────────────────────────┐
+│ Period catalog with summary metadata │
+└──────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+For each period, the catalog keeps the number of transactions, the first
+and last day, and per currency totals. It is stored in a file of the
+periods folder, along with the version of each transactions file, so only
+modified periods are read again.
+
+In and out totals depend on the accounts types, so all the periods are
+summarized again when they change.
+"""
+
+import hashlib
+import logging
+import threading
+
+from dataclasses      import dataclass, field, asdict
+from pathlib          import Path
+from typing           import Optional
+
+from scompta.db                import amounts, snapshot
+from scompta.views.transactions import classify
+
+log = logging.getLogger(__file__)
+
+CATALOG_NAME = ".catalog.json"
+
+
+# ┌────────────────────────────────────────┐
+# │ Period summary                         │
+# └────────────────────────────────────────┘
+
+@dataclass
+class Period_Summary:
+    """
+    Totals are in minor units (see scompta.db.amounts), per currency:
+        - total: sum of all the amounts
+        - in:    money coming from income accounts
+        - out:   money going to outcome accounts
+
+    Account types are taken from the accounts DataFrame, as in
+    scompta.views.transactions.
+    """
+
+    name:      str
+    version:   list
+    rows:      int
+    first_day: Optional[int]
+    last_day:  Optional[int]
+    totals:    dict = field(default_factory=dict)
+
+    @classmethod
+    def from_frame(cls, name: str, version: list, df, df_accounts):
+        if not amounts.is_columnar(df):
+            df = amounts.columnar(df)
+
+        classification = classify(df, df_accounts)
+
+        totals = {}
+        for key, mask in (("total", None), ("in", classification.income), ("out", classification.outcome)):
+            sub = df if mask is None else df.loc[mask]
+            for cur, value in sub.groupby("currency", observed=True)["amount"].sum().items():
+                totals.setdefault(str(cur), {"total": 0, "in": 0, "out": 0})[key] = int(value)
+
+        days = df["day"].dropna()
+
+        return cls(
+            name      = name,
+            version   = version,
+            rows      = len(df),
+            first_day = int(days.min()) if len(days) else None,
+            last_day  = int(days.max()) if len(days) else None,
+            totals    = totals,
+        )
+
+    def to_dict(self):
+        """
+        JSON friendly dict, with amounts as decimal strings
+        """
+        data = asdict(self)
+        del data["version"]
+
+        for cur, values in data["totals"].items():
+            data["totals"][cur] = dict(zip(values, amounts.format_values(list(values.values()))))
+
+        return data
+
+
+# ┌────────────────────────────────────────┐
+# │ Catalog                                │
+# └────────────────────────────────────────┘
+
+def accounts_key(df_accounts):
+    """
+    Digest of the accounts types, changes when summaries must be computed again
+    """
+    pairs = sorted(f"{path}={getattr(tt, 'value', tt)}" for path, tt in df_accounts["type"].items())
+    return hashlib.blake2b("\n".join(pairs).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class Period_Catalog:
+    """
+    Summaries of all the periods of the given periods folder, with account
+    types from the given accounts.Account_Index. Call refresh() to take
+    modified periods and accounts into account.
+    """
+
+    def __init__(self, root: Path, accounts_index, catalog_path: Path = None):
+        self.root           = Path(root)
+        self.accounts_index = accounts_index
+        self.catalog_path   = Path(catalog_path) if catalog_path is not None else self.root / CATALOG_NAME
+
+        self.summaries      = {}   # period -> Period_Summary
+        self.accounts       = None # accounts_key() of the summaries
+
+        self._generation    = None # Account_Index generation, accounts key
+        self._lock          = threading.Lock()
+
+        self._load_catalog()
+
+    # ──────────────── Storage ─────────────── #
+
+    def _load_catalog(self):
+        if not self.catalog_path.is_file():
+            return
+
+        try:
+            data           = snapshot.read_json(self.catalog_path)
+            self.summaries = {x["name"]: Period_Summary(**x) for x in data["periods"]}
+            self.accounts  = data["accounts"]
+
+        except Exception as exc:
+            log.warning(f"Could not load period catalog {self.catalog_path}: {exc!s}, rebuilding")
+            self.summaries, self.accounts = {}, None
+
+    def save(self):
+        """
+        Write the catalog file
+        """
+        snapshot.write_json(self.catalog_path, {
+            "accounts": self.accounts,
+            "periods":  [asdict(x) for x in self.summaries.values()]
+        })
+
+    # ──────────────── Refresh ─────────────── #
+
+    def refresh(self):
+        """
+        Summarize the modified periods again. Returns True if anything changed.
+        """
+        with self._lock:
+            # Accounts are only hashed again when the index changed
+            self.accounts_index.refresh()
+            if self._generation is None or self._generation[0] != self.accounts_index.generation:
+                df_accounts      = self.accounts_index.load()
+                self._generation = (self.accounts_index.generation, accounts_key(df_accounts), df_accounts)
+
+            _, key, df_accounts = self._generation
+
+            changed = False
+
+            if key != self.accounts:
+                log.info("Account types changed, summarize all periods")
+
+                self.summaries = {}
+                self.accounts  = key
+                changed        = True
+
+            changes = snapshot.changes(self.root, {name: x.version for name, x in self.summaries.items()})
+
+            for name in changes.removed:
+                log.info(f"Period {name} removed from catalog")
+
+                del self.summaries[name]
+                changed = True
+
+            for name, (fpath, version) in changes.changed.items():
+                log.info(f"Summarize period {name}")
+
+                self.summaries[name] = Period_Summary.from_frame(name, version, snapshot.load_frame(fpath, version), df_accounts)
+                changed = True
+
+            if changed:
+                self.summaries = dict(sorted(self.summaries.items()))
+                self.save()
+
+            return changed
+
+    # ─────────────── Accessors ────────────── #
+
+    @property
+    def periods(self):
+        return list(self.summaries)
+
+    def summary(self, period: str):
+        return self.summaries[period]
+
+    def to_dict(self):
+        return {name: x.to_dict() for name, x in self.summaries.items()}
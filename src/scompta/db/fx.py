@@ -0,0 +1,233 @@
+"""
+┌──────────────────────────────────────┐
+│ Currency conversion from rate tables │
+└──────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+Historical rates are read from local CSV files, one per currency, in a
+rates folder:
+
+.. code::
+
+    rates/USD.csv
+        date;rate
+        2023-01-02;0.9325
+        2023-01-03;0.9418
+
+rate is the value of one unit of the currency in the base currency of
+the table. Dates are either days (YYYY-MM-DD) or whole months (YYYY-MM).
+A rate applies until the next one, so monthly rates cover their month and
+daily rates cover week-ends.
+
+Rates are kept as one dense array per currency, indexed by day, so a whole
+amount column is converted with a single array lookup.
+"""
+
+import logging
+import threading
+
+from dataclasses      import astuple
+from datetime         import date
+from pathlib          import Path
+
+from scompta.db       import amounts
+from scompta.db.cache import File_Version
+
+from scompta.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+money = lazy_import("money")
+
+log = logging.getLogger(__file__)
+
+
+# ┌────────────────────────────────────────┐
+# │ Helpers                                │
+# └────────────────────────────────────────┘
+
+def period_ordinal(period: str):
+    """
+    Ordinal of the first day of the given YYYY-MM period
+    """
+    return date(int(period[:4]), int(period[5:7]), 1).toordinal()
+
+
+def day_ordinals(periods, days):
+    """
+    Vectorized ordinals of (period, day) pairs. Only distinct periods are
+    parsed.
+    """
+    codes, uniques = pd.factorize(np.asarray(periods, dtype=object))
+    starts         = np.asarray([period_ordinal(x) for x in uniques], dtype="int64")
+
+    return starts[codes] + np.asarray(days, dtype="int64") - 1
+
+
+def _parse_date(value: str):
+    value = value.strip()
+    if len(value) == 7:
+        return period_ordinal(value)
+    else:
+        return date.fromisoformat(value).toordinal()
+
+
+def _read_rates(fpath: Path):
+    """
+    Read a rates file. Returns the sorted ordinals and rates arrays
+    """
+    df = pd.read_csv(str(fpath), sep=";", dtype={"date": str, "rate": float}, skipinitialspace=True)
+
+    ordinals = np.asarray([_parse_date(x) for x in df["date"]], dtype="int64")
+    rates    = df["rate"].to_numpy(dtype="float64")
+    order    = np.argsort(ordinals, kind="stable")
+
+    return ordinals[order], rates[order]
+
+
+# ┌────────────────────────────────────────┐
+# │ Rate table                             │
+# └────────────────────────────────────────┘
+
+class Rate_Table:
+    """
+    Rates of all the currencies of the given folder against the base
+    currency. Files are read again when they change.
+    """
+
+    def __init__(self, root: Path, base: str = "EUR"):
+        self.root      = Path(root)
+        self.base      = base
+
+        self.versions  = {} # currency -> file version
+        self.points    = {} # currency -> (ordinals, rates)
+
+        # Dense arrays, rebuilt when any file changes
+        self.currencies = [] # Row of each currency in matrix
+        self.start      = 0
+        self.matrix     = np.zeros((0, 0))
+
+        self._lock      = threading.Lock()
+
+    # ──────────────── Refresh ─────────────── #
+
+    def refresh(self):
+        """
+        Read the added or modified rates files. Returns True if anything changed.
+        """
+        with self._lock:
+            fpaths  = {x.stem: x for x in sorted(self.root.glob("*.csv"))}
+            changed = False
+
+            for cur in set(self.points) - set(fpaths):
+                log.info(f"Rates for {cur} removed")
+
+                del self.points  [cur]
+                del self.versions[cur]
+                changed = True
+
+            for cur, fpath in fpaths.items():
+                version = astuple(File_Version.from_path(fpath))
+                if self.versions.get(cur) != version:
+                    log.info(f"Load rates for {cur} from {fpath}")
+
+                    self.points  [cur] = _read_rates(fpath)
+                    self.versions[cur] = version
+                    changed = True
+
+            if changed or not self.currencies:
+                self._build_matrix()
+
+            return changed
+
+    def _build_matrix(self):
+        points = {cur: x for cur, x in self.points.items() if len(x[0])}
+
+        if points:
+            start = min(x[0][0]  for x in points.values())
+            end   = max(x[0][-1] for x in points.values())
+        else:
+            start = end = 0
+
+        currencies = [self.base] + sorted(x for x in points if x != self.base)
+        matrix     = np.full((len(currencies), end - start + 1), np.nan)
+        matrix[0]  = 1.0
+
+        for row, cur in enumerate(currencies[1:], start=1):
+            ordinals, rates = points[cur]
+
+            # Forward fill: each day takes the last known rate
+            known                   = np.full(end - start + 1, -1, dtype="int64")
+            known[ordinals - start] = np.arange(len(ordinals))
+            known                   = np.maximum.accumulate(known)
+
+            matrix[row] = np.where(known >= 0, rates[np.maximum(known, 0)], np.nan)
+
+        self.currencies = currencies
+        self.start      = start
+        self.matrix     = matrix
+
+    # ──────────────── Lookup ──────────────── #
+
+    def rates(self, currencies, ordinals):
+        """
+        Value in base currency of one unit of each currency, at each day
+        ordinal. Days after the last known rate use it.
+        """
+        with self._lock:
+            table, start, matrix = self.currencies, self.start, self.matrix
+
+        currencies = np.asarray(currencies, dtype=object)
+        ordinals   = np.asarray(ordinals,   dtype="int64")
+
+        rows = pd.Index(table).get_indexer(currencies)
+        if (rows < 0).any():
+            missing = sorted(set(currencies[rows < 0]))
+            raise KeyError(f"No rates for currencies: {', '.join(map(str, missing))}")
+
+        vals = matrix[rows, np.clip(ordinals - start, 0, matrix.shape[1] - 1)]
+
+        # Before the first known rate, the base currency is always 1
+        vals[(ordinals < start) & (rows != 0)] = np.nan
+
+        return vals
+
+    def convert(self, df: "pd.DataFrame", to: str = None, period: str = None):
+        """
+        Return a columnar copy of df with all the amounts converted to the
+        given currency (the base currency by default). Dates come from the
+        period column (see ledger.load_ledger), or from the period argument
+        for a single period DataFrame.
+        """
+        to = to or self.base
+        if not amounts.is_columnar(df):
+            df = amounts.columnar(df)
+
+        # Only stats the rates files when nothing changed
+        self.refresh()
+
+        if period is not None:
+            ordinals = period_ordinal(period) + df["day"].to_numpy(dtype="int64") - 1
+        else:
+            ordinals = day_ordinals(df["period"].astype(object).to_numpy(), df["day"].to_numpy())
+
+        currency = df["currency"].astype(object).to_numpy()
+        factor   = self.rates(currency, ordinals) / self.rates(np.full(len(df), to, dtype=object), ordinals)
+
+        if np.isnan(factor).any():
+            raise ValueError(f"Missing rates to convert {int(np.isnan(factor).sum())} amounts to {to}")
+
+        converted = np.rint(df["amount"].to_numpy() * factor).astype("int64")
+
+        return df.assign(amount=converted, currency=pd.Categorical.from_codes(np.zeros(len(df), dtype="int8"), categories=[to]))
+
+
+def total(df: "pd.DataFrame", table: Rate_Table, to: str = None, period: str = None):
+    """
+    Sum of all the amounts converted to the given currency, as Money
+    """
+    to = to or table.base
+    return amounts.total(table.convert(df, to, period)).get(to, money.Money(0, to))
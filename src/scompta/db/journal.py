@@ -0,0 +1,567 @@
+"""
+┌────────────────────────────────────────┐
+│ Write-ahead journal for period changes │
+└────────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+Changes to a period (appended transactions, patches, deletes) are first
+written to a journal file in the period folder, one JSON line per
+operation. Concurrent commits are grouped, so a single fsync makes a whole
+batch durable.
+
+Each transaction has a stable ID, which doesn't change when other rows
+are deleted. IDs of the rows of the transactions file are kept in the
+journal state file. Deletes are only tombstones until compaction.
+
+Journaled operations are later applied to the transactions file by
+compact(): the new file is written next to it and renamed over it. Before
+the rename, the state file records the last applied operation, the IDs of
+the new file and its version, so a crash at any point never applies an
+operation twice nor loses it.
+
+A transactions file modified outside of the journal gets new IDs. Deletes
+and patches journaled before refer to the old ones: compact() refuses to
+apply them rather than dropping them.
+
+Only the process committing to the journal compacts it. Other processes
+(the command line while the web server runs) use read(), which applies
+the journaled operations in memory without writing anything.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from dataclasses      import astuple
+from pathlib          import Path
+
+from scompta.db       import amounts, transactions
+from scompta.db.cache import File_Version
+
+from scompta.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+money = lazy_import("money")
+
+log = logging.getLogger(__file__)
+
+JOURNAL_NAME  = ".journal.log"
+STATE_NAME    = ".journal.state"
+
+DEFAULT_STATE = {"seq": 0, "version": None, "ids": [], "next": 1, "base": None}
+
+
+# ┌────────────────────────────────────────┐
+# │ Helpers                                │
+# └────────────────────────────────────────┘
+
+def _encode_record(record):
+    record = dict(record)
+    amount = record.get("amount", None)
+    if isinstance(amount, money.Money):
+        record["amount"] = f"{amount.currency} {amount.amount}"
+
+    return record
+
+
+def _decode_record(record):
+    record = dict(record)
+    if isinstance(record.get("amount", None), str):
+        currency, value  = record["amount"].split(" ")
+        record["amount"] = money.Money(value, currency)
+
+    return record
+
+
+def _record_ids(operations, kind):
+    if kind == "append":
+        return {r.get("id", 0) for x in operations if x["op"] == "append" for r in x["records"]}
+    else:
+        return {i for x in operations if x["op"] == "delete" for i in x["ids"]}
+
+
+def _fsync_dir(dpath: Path):
+    # Makes a rename durable. Not possible on all platforms
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+
+    fd = os.open(str(dpath), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _replace(tmp_path: Path, fpath: Path):
+    os.replace(str(tmp_path), str(fpath))
+    _fsync_dir(Path(fpath).parent)
+
+
+def _write_json(fpath: Path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=str(fpath.parent), prefix=f".{fpath.name}.", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "w") as fhandle:
+            json.dump(data, fhandle, separators=(",", ":"))
+            fhandle.flush()
+            os.fsync(fhandle.fileno())
+
+        _replace(tmp_path, fpath)
+
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _version(fpath: Path):
+    try:
+        return list(astuple(File_Version.from_path(fpath)))
+    except FileNotFoundError:
+        return None
+
+
+def apply_operations(df: "pd.DataFrame", operations):
+    """
+    Apply journal operations in order to a transactions DataFrame with an
+    id column
+    """
+    for op in operations:
+        if op["op"] == "append":
+            records = pd.DataFrame([_decode_record(x) for x in op["records"]], columns=["id", *transactions.COLUMNS])
+            df      = pd.concat([df, records], ignore_index=True)
+
+        elif op["op"] == "delete":
+            df = df.loc[~df["id"].isin(op["ids"])].reset_index(drop=True)
+
+        elif op["op"] == "patch":
+            rows   = df.index[(df["id"] == op["id"]).to_numpy()]
+            fields = _decode_record(op["fields"])
+
+            for row in rows:
+                for col, value in fields.items():
+                    df.at[row, col] = value
+
+        else:
+            log.warning(f"Unknown journal operation {op['op']}, skipping")
+
+    return df
+
+
+# ┌────────────────────────────────────────┐
+# │ Period journal                         │
+# └────────────────────────────────────────┘
+
+class Period_Journal:
+    """
+    Journal of one period folder. commit() can be called from many
+    threads: the first waiting thread writes the operations of all the
+    others along with its own.
+    """
+
+    def __init__(self, period_dir: Path):
+        self.period_dir    = Path(period_dir)
+        self.fpath         = self.period_dir / JOURNAL_NAME
+        self.state_path    = self.period_dir / STATE_NAME
+        self.csv_path      = self.period_dir / "transactions.csv"
+
+        self._cond         = threading.Condition()
+        self._pending      = [] # Encoded lines waiting for the next flush
+        self._waiting      = 0  # Number of commits in _pending
+        self._flushing     = False
+        self._failed       = [] # [first, last, exception, commits yet to return] of failed flushes
+
+        self._compact_lock = threading.Lock()
+        self._ids          = None # (file version, row IDs, set of row IDs)
+
+        state              = self._read_state()
+        operations         = self._unapplied(self._read_operations(), state)
+
+        self._seq          = max([x["seq"] for x in operations] + [state["seq"]])
+        self._flushed      = self._seq
+        self._next_id      = max([state["next"]] + [x + 1 for x in _record_ids(operations, "append")])
+
+        self._summarize(operations)
+
+    # ──────────────── Storage ─────────────── #
+
+    def _read_state(self):
+        try:
+            return {**DEFAULT_STATE, **json.loads(self.state_path.read_text())}
+        except (FileNotFoundError, ValueError):
+            return dict(DEFAULT_STATE)
+
+    def _read_operations(self):
+        if not self.fpath.is_file():
+            return []
+
+        operations = []
+        for line in self.fpath.read_bytes().splitlines():
+            try:
+                operations.append(json.loads(line))
+            except ValueError:
+                # Last line of an interrupted write
+                log.warning(f"Skip truncated journal entry in {self.fpath}")
+
+        return operations
+
+    def _unapplied(self, operations, state):
+        # Operations are in the file only if it is the one the state refers to
+        if state["version"] is not None and _version(self.csv_path) == state["version"]:
+            return [x for x in operations if x["seq"] > state["seq"]]
+        else:
+            return operations
+
+    def _summarize(self, operations):
+        # Called with _cond held, or before any other access
+        self._tombstones = frozenset(_record_ids(operations, "delete"))
+        self._added      = frozenset(_record_ids(operations, "append"))
+        self._changes    = sum(1 for x in operations if x["op"] != "delete")
+
+    def _flush(self, lines):
+        with open(str(self.fpath), "ab") as fhandle:
+            size = fhandle.seek(0, os.SEEK_END)
+
+            try:
+                fhandle.write(b"".join(lines))
+                fhandle.flush()
+                os.fsync(fhandle.fileno())
+
+            except BaseException:
+                # A partial line would corrupt the next one
+                os.ftruncate(fhandle.fileno(), size)
+                raise
+
+    def _wait_idle(self):
+        # Called with _cond held
+        while self._flushing:
+            self._cond.wait()
+
+    # ───────────────── IDs ────────────────── #
+
+    def _row_ids(self):
+        version = _version(self.csv_path)
+        if version is None:
+            return None, [], frozenset()
+
+        ids = self._ids
+        if ids is not None and ids[0] == version:
+            return ids
+
+        with self._cond:
+            state = self._read_state()
+            base  = state["base"] or {}
+
+            if state["version"] == version:
+                row_ids = state["ids"]
+
+            elif base.get("version", None) == version:
+                # Interrupted compaction, the file is the previous one
+                row_ids = base["ids"]
+
+            else:
+                nrows          = len(transactions.load(self.csv_path, columnar=True))
+                row_ids        = list(range(self._next_id, self._next_id + nrows))
+                self._next_id += nrows
+
+                log.info(f"Assign IDs to the {nrows} transactions of {self.csv_path}")
+                _write_json(self.state_path, dict(state, version=version, ids=row_ids, next=self._next_id, base=None))
+
+            self._ids = (version, row_ids, frozenset(row_ids))
+
+        return self._ids
+
+    def row_ids(self):
+        """
+        Stable IDs of the rows of the transactions file, in order. If the
+        file was modified outside of the journal, its rows get new IDs.
+        """
+        return self._row_ids()[1]
+
+    def exists(self, tr_id: int):
+        """
+        True if the given ID is a transaction which isn't deleted
+        """
+        if tr_id in self._tombstones:
+            return False
+
+        return tr_id in self._added or tr_id in self._row_ids()[2]
+
+    @property
+    def tombstones(self):
+        """
+        IDs of the transactions deleted since the last compaction
+        """
+        return self._tombstones
+
+    @property
+    def seq(self):
+        return self._seq
+
+    # ──────────────── Commit ──────────────── #
+
+    def commit(self, operations):
+        """
+        Durably journal the given operations, dicts with an "op" key:
+            - {"op": "append", "records": [...]}
+            - {"op": "patch",  "id": ..., "fields": {...}}
+            - {"op": "delete", "ids": [...]}
+        Returns once they are written to disk, with the list of the IDs
+        given to appended records.
+        """
+        committed = []
+        new_ids   = []
+
+        if not operations:
+            return new_ids
+
+        with self._cond:
+            for op in operations:
+                self._seq += 1
+
+                op = dict(op, seq=self._seq)
+                if op["op"] == "append":
+                    op["records"]  = [dict(_encode_record(x), id=self._next_id + i) for i, x in enumerate(op["records"])]
+
+                    new_ids       += [x["id"] for x in op["records"]]
+                    self._next_id += len(op["records"])
+
+                elif op["op"] == "patch":
+                    op["fields"] = _encode_record(op["fields"])
+
+                committed.append(op)
+                self._pending.append(json.dumps(op, default=str).encode("utf-8") + b"\n")
+
+            ticket         = self._seq
+            self._waiting += 1
+
+            while self._flushed < ticket:
+                if self._flushing:
+                    self._cond.wait()
+                    continue
+
+                # Become the writer for all pending operations
+                lines, self._pending = self._pending, []
+                first, last          = self._flushed + 1, self._seq
+                commits              = self._waiting
+                self._waiting        = 0
+                self._flushing       = True
+
+                self._cond.release()
+                try:
+                    self._flush(lines)
+                except BaseException as exc:
+                    # Raised below by each commit of the batch, this one included
+                    self._failed.append([first, last, exc, commits])
+                finally:
+                    self._cond.acquire()
+
+                    self._flushed  = last
+                    self._flushing = False
+                    self._cond.notify_all()
+
+            # Operations of a failed batch are not written
+            for failed in self._failed:
+                first, last, exc, _ = failed
+                if first <= ticket <= last:
+                    # Forgotten once all the commits of the batch know
+                    failed[3] -= 1
+                    if failed[3] == 0:
+                        self._failed.remove(failed)
+
+                    raise exc
+
+            # Visible once durable
+            self._tombstones = self._tombstones | _record_ids(committed, "delete")
+            self._added      = self._added      | _record_ids(committed, "append")
+            self._changes   += sum(1 for x in committed if x["op"] != "delete")
+
+        return new_ids
+
+    @property
+    def pending(self):
+        """
+        True if some journaled operations are not applied yet
+        """
+        try:
+            return os.stat(str(self.fpath)).st_size > 0
+        except FileNotFoundError:
+            return False
+
+    @property
+    def needs_compaction(self):
+        """
+        True if appends or patches are waiting. Deletes alone are
+        filtered out with the tombstones.
+        """
+        return self._changes > 0
+
+    # ───────────────── Read ───────────────── #
+
+    def read(self, columnar: bool = False):
+        """
+        Transactions of the period with the journaled operations applied
+        in memory. Nothing is written: the journal may be committed to and
+        compacted by another process meanwhile.
+        """
+        while True:
+            version    = _version(self.csv_path)
+            state      = self._read_state()
+            operations = self._unapplied(self._read_operations(), state)
+
+            if not operations:
+                df = transactions.load(self.csv_path, columnar=columnar)
+
+            else:
+                self._check_version(state, operations)
+
+                df   = transactions.load(self.csv_path, sidecar=False)
+                base = state["base"] or {}
+
+                if state["version"] == version:
+                    ids = state["ids"]
+                elif base.get("version", None) == version:
+                    ids = base["ids"]
+                else:
+                    # No IDs given yet, only appends refer to rows
+                    ids = [0] * len(df)
+
+                df.insert(0, "id", ids)
+                df = apply_operations(df, operations).drop(columns=["id"])
+
+                if columnar:
+                    df = amounts.columnar(df)
+
+            # Compacted meanwhile, the operations may be in the file
+            if _version(self.csv_path) == version:
+                return df
+
+    # ──────────────── Compact ─────────────── #
+
+    def _check_version(self, state, operations):
+        if state["version"] is None:
+            return
+
+        version = _version(self.csv_path)
+        if version in (state["version"], (state["base"] or {}).get("version", None)):
+            return
+
+        stale = [x for x in operations if x["op"] in ("delete", "patch")]
+        if stale:
+            raise RuntimeError(
+                f"{self.csv_path} was modified outside of the journal, its transactions have new IDs. "
+                f"{len(stale)} journaled deletes and patches refer to the old ones: revert the file, "
+                f"or remove {self.fpath} to drop them."
+            )
+
+    def compact(self):
+        """
+        Apply the journaled operations to the transactions file. Returns
+        the number of applied operations.
+        """
+        with self._compact_lock:
+            with self._cond:
+                # No partially written lines
+                self._wait_idle()
+                operations = self._read_operations()
+
+            state      = self._read_state()
+            operations = self._unapplied(operations, state)
+            if not operations:
+                return 0
+
+            self._check_version(state, operations)
+
+            log.info(f"Apply {len(operations)} journal operations to {self.csv_path}")
+
+            base_version, base_ids, _ = self._row_ids()
+
+            if base_version is not None:
+                df = transactions.load(self.csv_path, sidecar=False)
+            else:
+                df = pd.DataFrame(columns=list(transactions.COLUMNS))
+
+            df.insert(0, "id", base_ids)
+            df = apply_operations(df, operations)
+
+            # Write the new file, then record what it contains before it
+            # replaces the old one
+            tmp_path = self.period_dir / ".transactions.csv.compact"
+            transactions.save(tmp_path, df.drop(columns=["id"]))
+
+            last    = max(x["seq"] for x in operations)
+            version = _version(tmp_path)
+            ids     = [int(x) for x in df["id"]]
+
+            with self._cond:
+                _write_json(self.state_path, {
+                    "seq":     last,
+                    "version": version,
+                    "ids":     ids,
+                    "next":    self._next_id,
+                    "base":    {"version": base_version, "ids": base_ids}
+                })
+
+            _replace(tmp_path, self.csv_path)
+
+            # Keep operations committed meanwhile
+            with self._cond:
+                # Flushes write to the file being replaced
+                self._wait_idle()
+
+                remaining = [x for x in self._read_operations() if x["seq"] > last]
+                tmp_path  = self.fpath.with_name(self.fpath.name + ".tmp")
+
+                with open(str(tmp_path), "wb") as fhandle:
+                    fhandle.write(b"".join(json.dumps(x).encode("utf-8") + b"\n" for x in remaining))
+                    fhandle.flush()
+                    os.fsync(fhandle.fileno())
+
+                _replace(tmp_path, self.fpath)
+
+                self._ids = (version, ids, frozenset(ids))
+                self._summarize(remaining)
+
+            return len(operations)
+
+
+# ┌────────────────────────────────────────┐
+# │ Journals registry                      │
+# └────────────────────────────────────────┘
+
+class Journal_Set:
+    """
+    One Period_Journal per period folder of the given root
+    """
+
+    def __init__(self, root: Path):
+        self.root      = Path(root)
+        self._journals = {}
+        self._lock     = threading.Lock()
+
+    def __getitem__(self, period: str):
+        with self._lock:
+            journal = self._journals.get(period)
+            if journal is None:
+                journal = self._journals[period] = Period_Journal(self.root / period)
+
+            return journal
+
+    def pending(self):
+        """
+        Names of the periods with operations to apply, including journals
+        left by a previous process
+        """
+        return sorted(x.parent.name for x in self.root.glob(f"*/{JOURNAL_NAME}") if self[x.parent.name].pending)
+
+    def compact_pending(self):
+        """
+        Apply the journaled operations of all the periods
+        """
+        for period in self.pending():
+            self[period].compact()
@@ -0,0 +1,111 @@
+"""
+┌─────────────────────────────────────┐
+│ Load transactions from all periods  │
+└─────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+import logging
+
+from concurrent         import futures
+from itertools          import repeat
+from pathlib            import Path
+
+from scompta.db         import journal, periods, transactions
+
+from scompta.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+log = logging.getLogger(__file__)
+
+CATEGORICAL_COLUMNS = ("origin", "target", "tag")
+
+
+# ┌────────────────────────────────────────┐
+# │ Helpers                                │
+# └────────────────────────────────────────┘
+
+def _load_period(fpath: Path, columnar: bool, journals: bool = False):
+    # Top-level function so it can be sent to worker processes
+    if journals:
+        return journal.Period_Journal(Path(fpath).parent).read(columnar=columnar)
+    else:
+        return transactions.load(fpath, columnar=columnar)
+
+
+def period_paths(root: Path, names=None):
+    """
+    Return the sorted list of (period name, transactions path) for the given
+    periods, or for all periods in root if names is None. Periods without
+    a transactions file are skipped.
+    """
+    root = Path(root)
+
+    if names is None:
+        names = [x.name for x in periods.list_from_dir(root)]
+
+    result = []
+    for name in sorted(names):
+        fpath = root / name / "transactions.csv"
+        if fpath.is_file():
+            result.append((name, fpath))
+        else:
+            log.warning(f"No transactions file for period {name}, skipping")
+
+    return result
+
+
+# ┌────────────────────────────────────────┐
+# │ Load ledger                            │
+# └────────────────────────────────────────┘
+
+def load_ledger(root: Path, periods=None, workers=None, columnar: bool = False, journals: bool = False):
+    """
+    Load transactions from all the periods in the root folder (or only the
+    given period names) into a single DataFrame, with an added period
+    column. Periods are parsed in a pool of worker processes; workers=None
+    uses one worker per CPU, workers=1 loads in the current process.
+
+    If journals is True, the operations journaled by the web server and
+    not compacted yet are applied in memory (see scompta.db.journal).
+    """
+    paths = period_paths(root, periods)
+    names = [name for name, _ in paths]
+
+    log.info(f"Load {len(paths)} periods from {root}")
+
+    if workers == 1 or len(paths) <= 1:
+        frames = [_load_period(fpath, columnar, journals) for _, fpath in paths]
+    else:
+        with futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(_load_period, [fpath for _, fpath in paths], repeat(columnar), repeat(journals)))
+
+    return concat_periods(names, frames, columnar)
+
+
+def concat_periods(names, frames, columnar: bool = False):
+    """
+    Concatenate the transactions DataFrames of the given periods, as
+    load_ledger does. The given DataFrames are not modified.
+    """
+    if not frames:
+        columns = list(transactions.COLUMNS) + (["currency"] if columnar else []) + ["period"]
+        return pd.DataFrame(columns=columns)
+
+    frames              = [df.assign(period=name) for name, df in zip(names, frames)]
+
+    df_ledger           = pd.concat(frames, ignore_index=True)
+    df_ledger["period"] = pd.Categorical(df_ledger["period"], categories=names, ordered=True)
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df_ledger.columns:
+            df_ledger[col] = df_ledger[col].astype("category")
+
+    # Currencies of different periods may have different categories
+    if columnar:
+        df_ledger["currency"] = df_ledger["currency"].astype("category")
+
+    return df_ledger
@@ -0,0 +1,188 @@
+"""
+┌───────────────────────────────────────┐
+│ Materialized per-period report tables │
+└───────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+The report table holds, for each period, account, tag and currency, the
+money coming in (account as target), going out (account as origin), the
+net variation and the number of transactions. It is computed with a single
+groupby over the ledger, stored in a file of the periods folder, and only
+the rows of modified periods are computed again on refresh().
+"""
+
+import logging
+import threading
+
+from pathlib          import Path
+
+from scompta.db       import amounts, ledger, snapshot
+
+from scompta.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+log = logging.getLogger(__file__)
+
+REPORTS_NAME = ".reports.json"
+
+COLUMNS      = ("period", "account", "tag", "currency", "in", "out", "net", "count")
+
+
+# ┌────────────────────────────────────────┐
+# │ Aggregation                            │
+# └────────────────────────────────────────┘
+
+def aggregate(df):
+    """
+    Compute the report rows of a columnar ledger DataFrame (with a period
+    column, see ledger.load_ledger). Amounts are in minor units.
+    """
+    if len(df) == 0:
+        return pd.DataFrame({x: pd.Series(dtype="int64" if x in ("in", "out", "net", "count") else object) for x in COLUMNS})
+
+    n = len(df)
+
+    # Each transaction is counted once as target, once as origin
+    flows = pd.DataFrame({
+        "period":   np.concatenate([df["period"]  .astype(object).to_numpy()] * 2),
+        "account":  np.concatenate([df["target"]  .astype(object).to_numpy(), df["origin"].astype(object).to_numpy()]),
+        "tag":      np.concatenate([df["tag"]     .astype(object).fillna("").to_numpy()] * 2),
+        "currency": np.concatenate([df["currency"].astype(object).to_numpy()] * 2),
+        "in":       np.concatenate([df["amount"].to_numpy(), np.zeros(n, dtype="int64")]),
+        "out":      np.concatenate([np.zeros(n, dtype="int64"), df["amount"].to_numpy()]),
+    })
+
+    table = flows.dropna(subset=["account"]) \
+        .groupby(["period", "account", "tag", "currency"], sort=True) \
+        .agg(**{"in": ("in", "sum"), "out": ("out", "sum"), "count": ("in", "size")}) \
+        .reset_index()
+
+    table["net"] = table["in"] - table["out"]
+
+    return table[list(COLUMNS)]
+
+
+# ┌────────────────────────────────────────┐
+# │ Report engine                          │
+# └────────────────────────────────────────┘
+
+class Report_Engine:
+    """
+    Materialized report table for the given periods folder. Call refresh()
+    to take modified periods into account.
+    """
+
+    def __init__(self, root: Path, reports_path: Path = None, workers=None):
+        self.root         = Path(root)
+        self.reports_path = Path(reports_path) if reports_path is not None else self.root / REPORTS_NAME
+        self.workers      = workers
+
+        self.versions     = {} # period -> file version
+        self.table        = aggregate(pd.DataFrame())
+
+        self._lock        = threading.Lock()
+
+        self._load_reports()
+
+    # ──────────────── Storage ─────────────── #
+
+    def _load_reports(self):
+        if not self.reports_path.is_file():
+            return
+
+        try:
+            data          = snapshot.read_json(self.reports_path)
+
+            self.versions = data["versions"]
+            self.table    = pd.DataFrame(data["table"], columns=list(COLUMNS))
+
+        except Exception as exc:
+            log.warning(f"Could not load reports {self.reports_path}: {exc!s}, rebuilding")
+
+            self.versions = {}
+            self.table    = aggregate(pd.DataFrame())
+
+    def save(self):
+        """
+        Write the reports file
+        """
+        snapshot.write_json(self.reports_path, {
+            "versions": self.versions,
+            "table":    {col: self.table[col].tolist() for col in COLUMNS}
+        })
+
+    # ──────────────── Refresh ─────────────── #
+
+    def refresh(self):
+        """
+        Compute the rows of added or modified periods again, and drop the
+        rows of removed ones. Returns True if anything changed.
+        """
+        with self._lock:
+            changes = snapshot.changes(self.root, self.versions)
+            if not changes:
+                return False
+
+            log.info(f"Refresh reports: {len(changes.changed)} changed periods, {len(changes.removed)} removed")
+
+            # All modified periods in one groupby
+            names  = sorted(changes.changed)
+            frames = snapshot.load_frames([changes.changed[x] for x in names], workers=self.workers)
+            rows   = aggregate(ledger.concat_periods(names, frames, columnar=True)) if names else aggregate(pd.DataFrame())
+
+            kept       = self.table.loc[~self.table["period"].isin(changes.removed | set(names))]
+            self.table = pd.concat([kept, rows], ignore_index=True).sort_values(["period", "account", "tag", "currency"], ignore_index=True)
+
+            for name in changes.removed:
+                del self.versions[name]
+            self.versions.update({name: ver for name, (_, ver) in changes.changed.items()})
+
+            self.save()
+
+            return True
+
+    # ──────────────── Queries ─────────────── #
+
+    def series(self, account: str = None, tag: str = None, subtree: bool = False, currency: str = None, start: str = None, end: str = None):
+        """
+        Per period and currency totals for the given account (with the
+        accounts below it if subtree is True) and tag, between the start
+        and end periods included. With subtree, transfers between accounts
+        of the subtree count both as in and out.
+        """
+        with self._lock:
+            table = self.table
+
+        mask = np.ones(len(table), dtype=bool)
+
+        if account is not None:
+            if subtree:
+                mask &= ((table["account"] == account) | table["account"].str.startswith(account + "/")).to_numpy()
+            else:
+                mask &= (table["account"] == account).to_numpy()
+
+        if tag is not None:
+            mask &= (table["tag"] == tag).to_numpy()
+
+        if currency is not None:
+            mask &= (table["currency"] == currency).to_numpy()
+
+        if start is not None:
+            mask &= (table["period"] >= start).to_numpy()
+
+        if end is not None:
+            mask &= (table["period"] <= end).to_numpy()
+
+        return table.loc[mask].groupby(["period", "currency"], sort=True)[["in", "out", "net", "count"]].sum().reset_index()
+
+
+def series_to_dict(series: "pd.DataFrame"):
+    """
+    JSON friendly list of series rows, with amounts as decimal strings
+    """
+    data = series.assign(**{col: amounts.format_values(series[col].to_numpy()).to_numpy() for col in ("in", "out", "net")})
+    return data.to_dict(orient="records")
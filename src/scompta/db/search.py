@@ -0,0 +1,232 @@
+"""
+┌─────────────────────────────────────────┐
+│ Inverted index over transactions labels │
+└─────────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+Labels and tags of all the periods are split into tokens (lower case,
+without accents). For each token, the index keeps the rows where it
+appears, per period. It is stored in a hidden folder of the periods
+folder, one file per period: only modified periods are tokenized again
+and written on refresh().
+"""
+
+import bisect
+import logging
+import re
+import threading
+import unicodedata
+
+from pathlib          import Path
+
+from scompta.db       import snapshot
+
+from scompta.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+log = logging.getLogger(__file__)
+
+INDEX_NAME = ".labels"
+
+__RE_TOKEN = re.compile(r"[0-9a-z]+")
+
+
+# ┌────────────────────────────────────────┐
+# │ Tokens                                 │
+# └────────────────────────────────────────┘
+
+def tokenize(text):
+    """
+    Split text into lower case tokens without accents
+    """
+    if not isinstance(text, str):
+        return []
+
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(x for x in text if not unicodedata.combining(x))
+
+    return __RE_TOKEN.findall(text.lower())
+
+
+def period_postings(df):
+    """
+    Return a dict token -> sorted list of row positions for the label
+    and tag columns of the given transactions DataFrame
+    """
+    postings = {}
+
+    for col in ("label", "tag"):
+        # Labels repeat a lot, tokenize distinct values only
+        codes, uniques = pd.factorize(df[col].astype(object).to_numpy())
+        order          = np.argsort(codes, kind="stable")
+        bounds         = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+        for code, value in enumerate(uniques):
+            rows = order[bounds[code]:bounds[code + 1]]
+            for token in set(tokenize(value)):
+                postings.setdefault(token, []).append(rows)
+
+    return {token: np.unique(np.concatenate(x)).tolist() for token, x in postings.items()}
+
+
+# ┌────────────────────────────────────────┐
+# │ Label index                            │
+# └────────────────────────────────────────┘
+
+class Label_Index:
+    """
+    Token search over the labels and tags of the given periods folder.
+    Call refresh() to take modified periods into account.
+    """
+
+    def __init__(self, root: Path, index_path: Path = None):
+        self.root       = Path(root)
+        self.index_path = Path(index_path) if index_path is not None else self.root / INDEX_NAME # Folder
+
+        self.versions   = {} # period -> file version
+        self.postings   = {} # period -> token -> row positions
+
+        self._tokens    = {} # token -> period -> row positions
+        self._sorted    = [] # Sorted tokens, for prefix search
+        self._lock      = threading.Lock()
+
+        self._load_index()
+
+    # ──────────────── Storage ─────────────── #
+
+    def _period_path(self, name):
+        return self.index_path / f"{name}.json"
+
+    def _load_index(self):
+        if not self.index_path.is_dir():
+            return
+
+        for fpath in sorted(self.index_path.glob("*.json")):
+            try:
+                data = snapshot.read_json(fpath)
+                self.versions[fpath.stem] = data["version"]
+                self.postings[fpath.stem] = data["postings"]
+
+            except Exception as exc:
+                log.warning(f"Could not load label index {fpath}: {exc!s}, rebuilding")
+
+        for name, postings in self.postings.items():
+            self._add_tokens(name, postings)
+
+    def _save_period(self, name):
+        self.index_path.mkdir(exist_ok=True)
+        snapshot.write_json(self._period_path(name), {"version": self.versions[name], "postings": self.postings[name]})
+
+    def _remove_period(self, name):
+        try:
+            self._period_path(name).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _add_tokens(self, period, postings):
+        for token, rows in postings.items():
+            if token not in self._tokens:
+                self._tokens[token] = {}
+                bisect.insort(self._sorted, token)
+
+            self._tokens[token][period] = rows
+
+    def _remove_tokens(self, period, postings):
+        for token in postings:
+            periods = self._tokens[token]
+            periods.pop(period, None)
+
+            if not periods:
+                del self._tokens[token]
+                del self._sorted[bisect.bisect_left(self._sorted, token)]
+
+    # ──────────────── Refresh ─────────────── #
+
+    def refresh(self):
+        """
+        Tokenize the modified periods again. Returns True if anything changed.
+        """
+        with self._lock:
+            # Periods without postings are indexed again. Positions are rows
+            # of the transactions files, pending journals are left out.
+            changes = snapshot.changes(self.root, {x: v for x, v in self.versions.items() if x in self.postings}, journals=False)
+
+            for name in changes.removed:
+                log.info(f"Period {name} removed from label index")
+
+                self._remove_tokens(name, self.postings.pop(name))
+                self.versions.pop(name, None)
+                self._remove_period(name)
+
+            for name, (fpath, version) in changes.changed.items():
+                log.info(f"Index labels of period {name}")
+
+                postings = period_postings(snapshot.load_frame(fpath, version, journals=False))
+
+                self._remove_tokens(name, self.postings.get(name, {}))
+                self._add_tokens(name, postings)
+
+                self.postings[name] = postings
+                self.versions[name] = version
+                self._save_period(name)
+
+            return bool(changes)
+
+    # ──────────────── Queries ─────────────── #
+
+    def _token_rows(self, token, prefix):
+        if not prefix:
+            return self._tokens.get(token, {})
+
+        # Union of the postings of all the tokens starting with token
+        result = {}
+        for i in range(bisect.bisect_left(self._sorted, token), len(self._sorted)):
+            other = self._sorted[i]
+            if not other.startswith(token):
+                break
+
+            for period, rows in self._tokens[other].items():
+                result.setdefault(period, set()).update(rows)
+
+        return result
+
+    def search(self, text: str, prefix: bool = True):
+        """
+        Return the sorted (period, row) positions of the transactions whose
+        label or tag contains all the tokens of text. If prefix is True, the
+        last token may be the start of a word.
+        """
+        return self.search_versions(text, prefix)[0]
+
+    def search_versions(self, text: str, prefix: bool = True):
+        """
+        Same as search(), also returning the dict period -> indexed file
+        version of the periods with hits. Positions are rows of these
+        versions.
+        """
+        tokens = tokenize(text)
+        if not tokens:
+            return [], {}
+
+        with self._lock:
+            hits = self._search(tokens, prefix)
+            return hits, {period: self.versions[period] for period, _ in hits}
+
+    def _search(self, tokens, prefix):
+        hits = None
+        for i, token in enumerate(tokens):
+            rows = self._token_rows(token, prefix and i == len(tokens) - 1)
+
+            if hits is None:
+                hits = {period: set(x) for period, x in rows.items()}
+            else:
+                hits = {period: hits[period] & set(x) for period, x in rows.items() if period in hits}
+
+            if not hits:
+                return []
+
+        return [(period, row) for period in sorted(hits) for row in sorted(hits[period])]
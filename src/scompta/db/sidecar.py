@@ -0,0 +1,249 @@
+"""
+┌─────────────────────────────────────────┐
+│ Binary columnar cache next to CSV files │
+└─────────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+The CSV file stays the source of truth. Its parsed columnar content is
+stored next to it, in a hidden directory holding one .npy file per array
+and a meta.json file describing the CSV version it was built from.
+Arrays are memory-mapped when read, and numeric columns of the returned
+DataFrame use the mapped arrays as is: they are read-only, copy the
+DataFrame before modifying its values in place.
+
+Array files are never modified: each write uses new names, listed in the
+new meta.json, so a reader never pairs arrays and meta of different
+writes. Writers are serialized with a lock file.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import uuid
+
+from contextlib import contextmanager
+from pathlib    import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from scompta.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+log = logging.getLogger(__file__)
+
+FORMAT_VERSION = 2
+
+_write_lock    = threading.Lock()
+
+
+# ┌────────────────────────────────────────┐
+# │ Helpers                                │
+# └────────────────────────────────────────┘
+
+def sidecar_path(fpath: Path):
+    """
+    Directory of the sidecar cache for the given CSV file
+    """
+    fpath = Path(fpath)
+    return fpath.parent / f".{fpath.name}.cache"
+
+
+def content_hash(data: bytes):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _stat(fpath: Path):
+    st = os.stat(str(fpath))
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _save_array(dpath: Path, name: str, arr):
+    # Unique name, only referenced once the meta is written
+    with open(str(dpath / f"{name}.npy"), "xb") as fhandle:
+        np.save(fhandle, arr, allow_pickle=False)
+
+
+def _load_array(dpath: Path, name: str):
+    return np.load(str(dpath / f"{name}.npy"), mmap_mode="r", allow_pickle=False)
+
+
+def _write_meta(dpath: Path, meta):
+    fd, tmp_path = tempfile.mkstemp(dir=str(dpath), prefix=".meta.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as fhandle:
+            json.dump(meta, fhandle)
+
+        os.replace(tmp_path, str(dpath / "meta.json"))
+
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+@contextmanager
+def _locked(dpath: Path):
+    # Threads of this process, then other processes
+    with _write_lock:
+        with open(str(dpath / ".lock"), "a") as fhandle:
+            if fcntl is not None:
+                fcntl.flock(fhandle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fhandle.fileno(), fcntl.LOCK_UN)
+
+
+def _remove_unused(dpath: Path, generation: str):
+    # Files still mapped by readers stay valid until unmapped
+    for fpath in dpath.glob("*.npy"):
+        if not fpath.name.startswith(generation + "."):
+            try:
+                fpath.unlink()
+            except OSError:
+                pass
+
+
+# ┌────────────────────────────────────────┐
+# │ Read and write                         │
+# └────────────────────────────────────────┘
+
+def write(fpath: Path, df: "pd.DataFrame", stat, digest: str):
+    """
+    Store the DataFrame parsed from the CSV file. stat and digest
+    identify the CSV content the DataFrame was parsed from.
+    """
+    dpath = sidecar_path(fpath)
+    dpath.mkdir(exist_ok=True)
+
+    generation = uuid.uuid4().hex
+
+    with _locked(dpath):
+        columns = []
+        for name in df.columns:
+            col = df[name]
+
+            categorical = isinstance(col.dtype, pd.CategoricalDtype)
+
+            if pd.api.types.is_numeric_dtype(col.dtype) and not categorical:
+                _save_array(dpath, f"{generation}.{name}.values", col.to_numpy())
+                columns.append({"name": name, "kind": "values"})
+
+            else:
+                codes, uniques = pd.factorize(col)
+                _save_array(dpath, f"{generation}.{name}.codes", codes.astype("int32"))
+                _save_array(dpath, f"{generation}.{name}.cats",  np.asarray(uniques, dtype=str))
+                columns.append({"name": name, "kind": "strings", "categorical": categorical})
+
+        _write_meta(dpath, {
+            "format":     FORMAT_VERSION,
+            "generation": generation,
+            "stat":       list(stat),
+            "hash":       digest,
+            "rows":       len(df),
+            "columns":    columns
+        })
+
+        _remove_unused(dpath, generation)
+
+
+def _read_meta(fpath: Path):
+    meta_path = sidecar_path(fpath) / "meta.json"
+
+    try:
+        meta = json.loads(meta_path.read_text())
+        if meta.get("format") != FORMAT_VERSION:
+            return None
+        return meta
+
+    except (OSError, ValueError):
+        return None
+
+
+def _read(fpath: Path, meta):
+    """
+    Read the arrays listed in meta. Returns None if they were removed by
+    a newer write in the meantime.
+    """
+    try:
+        return _read_arrays(fpath, meta)
+    except FileNotFoundError:
+        return None
+
+
+def _read_arrays(fpath: Path, meta):
+    dpath = sidecar_path(fpath)
+    data  = {}
+
+    for col in meta["columns"]:
+        name = f"{meta['generation']}.{col['name']}"
+
+        if col["kind"] == "values":
+            data[col["name"]] = _load_array(dpath, f"{name}.values")
+
+        else:
+            codes = _load_array(dpath, f"{name}.codes")
+            cats  = _load_array(dpath, f"{name}.cats")
+
+            values = pd.Categorical.from_codes(np.asarray(codes), categories=pd.Index(np.asarray(cats), dtype=object))
+            data[col["name"]] = values if col["categorical"] else values.astype(object)
+
+    # Numeric columns stay mapped, pages are only read when used
+    return pd.DataFrame(data, columns=[x["name"] for x in meta["columns"]], copy=False)
+
+
+def load(fpath: Path, parse):
+    """
+    Load the DataFrame for the given CSV file from its sidecar if it is
+    fresh. Otherwise, read the CSV content, parse it with parse(buffer)
+    and rebuild the sidecar.
+    """
+    fpath = Path(fpath)
+    stat  = _stat(fpath)
+    meta  = _read_meta(fpath)
+
+    if meta is not None and meta["stat"] == stat:
+        df = _read(fpath, meta)
+        if df is not None:
+            return df
+
+    data   = fpath.read_bytes()
+    digest = content_hash(data)
+
+    # Touched but unmodified file (git checkout, copy, ...)
+    if meta is not None and meta["hash"] == digest:
+        log.debug(f"Refresh sidecar version for {fpath}")
+        df = _read(fpath, meta)
+
+        if df is not None:
+            try:
+                dpath = sidecar_path(fpath)
+                with _locked(dpath):
+                    # Unless rebuilt meanwhile
+                    if _read_meta(fpath) == meta:
+                        _write_meta(dpath, dict(meta, stat=stat))
+
+            except OSError as exc:
+                log.debug(f"Could not update sidecar for {fpath}: {exc!s}")
+
+            return df
+
+    log.debug(f"Rebuild sidecar for {fpath}")
+    df = parse(data)
+
+    try:
+        write(fpath, df, stat, digest)
+    except OSError as exc:
+        log.warning(f"Could not write sidecar for {fpath}: {exc!s}")
+
+    return df
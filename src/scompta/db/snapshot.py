@@ -0,0 +1,197 @@
+"""
+┌──────────────────────────────────────┐
+│ Data derived from the periods folder │
+└──────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+Balances, catalog, label index and reports all keep data derived from the
+transactions files in hidden files of the periods folder. They refresh it
+the same way: compare the version of each transactions file with the stored
+one, process the changed periods, then write the result with a unique
+temporary file and a rename.
+
+Parsed periods are shared, so a period changed once is only parsed once
+for all of them.
+
+Operations journaled by the web server and not compacted yet are part of
+the period: the journal file version is added to the transactions file
+one, and the operations are applied in memory when parsing.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from collections      import OrderedDict
+from concurrent       import futures
+from dataclasses      import astuple, dataclass, field
+from pathlib          import Path
+
+from scompta.db       import journal, ledger
+from scompta.db.cache import File_Version
+
+log = logging.getLogger(__file__)
+
+# Parsed periods kept in memory, a year of periods by default
+FRAMES_MAX = 12
+
+
+# ┌────────────────────────────────────────┐
+# │ Changed periods                        │
+# └────────────────────────────────────────┘
+
+@dataclass
+class Period_Changes:
+    """
+    Difference between the periods folder and stored versions:
+        - names:   sorted names of all the periods with a transactions file
+        - changed: period -> (transactions path, version) of new or modified periods
+        - removed: periods that are gone
+    """
+
+    names:   list = field(default_factory=list)
+    changed: dict = field(default_factory=dict)
+    removed: set  = field(default_factory=set)
+
+    def __bool__(self):
+        return bool(self.changed or self.removed)
+
+
+def version_of(file_version: File_Version):
+    """
+    JSON friendly form of the given File_Version
+    """
+    return list(astuple(file_version))
+
+
+def version(fpath: Path):
+    """
+    Version of the given file, in its JSON friendly form
+    """
+    return version_of(File_Version.from_path(fpath))
+
+
+def period_version(fpath: Path, journals: bool = True):
+    """
+    Version of the given transactions file, with the version of its
+    pending journal if journals is True
+    """
+    result = version(fpath)
+
+    if journals:
+        jpath = Path(fpath).parent / journal.JOURNAL_NAME
+        try:
+            if jpath.stat().st_size > 0:
+                result += version(jpath)
+        except FileNotFoundError:
+            pass
+
+    return result
+
+
+def changes(root: Path, versions: dict, journals: bool = True):
+    """
+    Compare the transactions files of the periods folder with the versions
+    dict, period -> version. If journals is False, pending journals are
+    ignored.
+    """
+    paths  = ledger.period_paths(root)
+    result = Period_Changes(names=[name for name, _ in paths])
+
+    for name, fpath in paths:
+        current = period_version(fpath, journals)
+        if versions.get(name) != current:
+            result.changed[name] = (fpath, current)
+
+    result.removed = set(versions) - set(result.names)
+
+    return result
+
+
+# ┌────────────────────────────────────────┐
+# │ Storage                                │
+# └────────────────────────────────────────┘
+
+def read_json(fpath: Path):
+    """
+    Content of the given JSON file, None if missing
+    """
+    if not Path(fpath).is_file():
+        return None
+
+    return json.loads(Path(fpath).read_text())
+
+
+def write_json(fpath: Path, data):
+    """
+    Replace the given file. Concurrent writers each use their own
+    temporary file, the last rename wins.
+    """
+    fpath        = Path(fpath)
+    fd, tmp_path = tempfile.mkstemp(dir=str(fpath.parent), prefix=f".{fpath.name}.", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "w") as fhandle:
+            json.dump(data, fhandle, separators=(",", ":"))
+
+        os.replace(tmp_path, str(fpath))
+
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+# ┌────────────────────────────────────────┐
+# │ Shared parsed periods                  │
+# └────────────────────────────────────────┘
+
+_frames      = OrderedDict() # (path, version, journals) -> columnar DataFrame
+_frames_lock = threading.Lock()
+
+
+def load_frames(items, workers=1, journals: bool = True):
+    """
+    Columnar DataFrames of the given (transactions path, version) items,
+    with their pending journals applied if journals is True. Periods not
+    parsed yet for this version are parsed in a pool of worker processes
+    unless workers is 1, as in ledger.load_ledger.
+
+    The DataFrames are shared, they must not be modified.
+    """
+    keys = [(str(Path(fpath).resolve()), tuple(ver), journals) for fpath, ver in items]
+
+    with _frames_lock:
+        found = {key: _frames[key] for key in keys if key in _frames}
+
+    missing = [key for key in keys if key not in found]
+    if missing:
+        paths = [path for path, _, _ in missing]
+
+        if workers == 1 or len(missing) <= 1:
+            parsed = [ledger._load_period(path, True, journals) for path in paths]
+        else:
+            with futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed = list(pool.map(ledger._load_period, paths, [True] * len(paths), [journals] * len(paths)))
+
+        found.update(zip(missing, parsed))
+
+    with _frames_lock:
+        for key in keys:
+            _frames[key] = found[key]
+            _frames.move_to_end(key)
+
+        while len(_frames) > FRAMES_MAX:
+            _frames.popitem(last=False)
+
+    return [found[key] for key in keys]
+
+
+def load_frame(fpath: Path, ver, journals: bool = True):
+    """
+    Columnar DataFrame of one transactions file version, see load_frames
+    """
+    return load_frames([(fpath, ver)], journals=journals)[0]
@@ -7,18 +7,28 @@
  October 2022
 """
 
+import io
 import logging
-import pandas as pd
+import os
 
+from pathlib                   import Path
 
-from pathlib import Path
-from money   import Money
-
+from scompta.db                import amounts
+from scompta.db                import sidecar as sidecar_db
+from scompta.model             import slugs
 from scompta.model.account     import Account_Type
 from scompta.model.transaction import Transaction
 
+from scompta.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+money = lazy_import("money")
+
 log = logging.getLogger(__file__)
 
+COLUMNS = ("day", "time", "label", "origin", "target", "amount", "tag")
+
 
 # ┌────────────────────────────────────────┐
 # │ Helpers                                │
@@ -29,37 +39,90 @@ def __money_conv(x):
     currency = data[0]
     value    = data[1]
 
-    return Money(value, currency)
+    return money.Money(value, currency)
 
 
 # ┌────────────────────────────────────────┐
 # │ Load and save from CSV                 │
 # └────────────────────────────────────────┘
 
-def load(fpath: Path):
-    fpath = Path(fpath)
-
-    csv_data = pd.read_csv(str(fpath),
+def __parse_columnar(source):
+    csv_data = pd.read_csv(source,
         sep=";",
-        converters={
-            "amount": __money_conv
+        dtype={
+            "amount": str
         },
 
         skipinitialspace=True
     )
 
+    minor, currency      = amounts.parse(csv_data["amount"])
+    csv_data["amount"]   = minor
+    csv_data["currency"] = currency
+
+    return csv_data
+
+
+def load(fpath: Path, columnar: bool = False, sidecar: bool = True):
+    """
+    Load transactions from CSV file. In columnar mode, the amount column
+    holds int64 minor units and the currency is given in a separate
+    categorical column (see scompta.db.amounts).
+
+    In columnar mode, if sidecar is True, the parsed data is cached in a
+    binary sidecar next to the CSV file, rebuilt when the CSV content
+    changes. Numeric columns are then read-only memory maps (see
+    scompta.db.sidecar). Money mode always parses the CSV file, keeping the amounts
+    text as written.
+    """
+    fpath = Path(fpath)
+
+    if columnar and sidecar:
+        csv_data = sidecar_db.load(fpath, lambda data: __parse_columnar(io.BytesIO(data)))
+
+    elif columnar:
+        csv_data = __parse_columnar(str(fpath))
+
+    else:
+        csv_data = pd.read_csv(str(fpath),
+            sep=";",
+            converters={
+                "amount": __money_conv
+            },
+
+            skipinitialspace=True
+        )
+
     # Check shape?
     # TODO
 
-    return csv_data
+    return slugs.intern_frame(csv_data)
 
 
-def save(fpath: Path, df: pd.DataFrame):
-    df["amount"] = df["amount"].apply(lambda x: f"{x.currency} {x.amount}")
-    df.to_csv(str(fpath),
-        sep=";",
-        index=False
-    )
+def save(fpath: Path, df: "pd.DataFrame"):
+    """
+    Save transactions to a CSV file. The data is written to a temporary
+    file which then replaces the target, so a crash never leaves a
+    partially written file. The given DataFrame is left untouched.
+    """
+    fpath = Path(fpath)
+
+    if amounts.is_columnar(df):
+        df = df.drop(columns=["currency"]).assign(amount=amounts.to_strings(df))
+    else:
+        df = df.assign(amount=df["amount"].map(lambda x: f"{x.currency} {x.amount}"))
+
+    tmp_path = fpath.with_name(f".{fpath.name}.tmp")
+    with open(str(tmp_path), "w", newline="") as fhandle:
+        df.to_csv(fhandle,
+            sep=";",
+            index=False
+        )
+
+        fhandle.flush()
+        os.fsync(fhandle.fileno())
+
+    os.replace(str(tmp_path), str(fpath))
 
 
 # ┌────────────────────────────────────────┐
@@ -70,5 +133,5 @@ def create(fpath: Path):
     """
     Create boilerplace CSV file for transaction list
     """
-    log.info("Initialize transactions list in {fpath}")
-    fpath.write_text("day;time;label;origin;target;amount;tag")
+    log.info(f"Initialize transactions list in {fpath}")
+    fpath.write_text(";".join(COLUMNS) + "\n")
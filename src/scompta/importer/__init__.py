@@ -5,7 +5,18 @@ Support for various file formats
 
 :Authors: - Florian Dupeyron <florian.dupeyron@mugcat.fr>
 :Date: March 2023
+
+Submodules are imported on first access, so ``ofxtools`` and ``quiffen``
+are only loaded when a file of their format is imported.
 """
 
-from . import ofx
-from . import qif
+import importlib
+
+__all__ = ["dedup", "frames", "ofx", "qif", "sources"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
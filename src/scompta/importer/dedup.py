@@ -0,0 +1,227 @@
+"""
+=========================================
+Fingerprint index for idempotent imports
+=========================================
+
+:Authors: - Florian Dupeyron <florian.dupeyron@mugcat.fr>
+:Date: October 2026
+
+Each imported row gets fingerprints computed from its content (day,
+signed amount, currency, normalized label) and from its source ID (FITID)
+when the statement provides one. Fingerprints of already ingested rows are
+stored per period and account, in a ``.fingerprints.json`` file of the
+period folder, so re-importing a statement, or an overlapping one, only
+adds the new rows.
+
+Identical rows of the same statement (two coffees the same day) are told
+apart by their occurrence number.
+
+New rows are appended through the period journal (see scompta.db.journal),
+so the existing transactions keep their IDs.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import unicodedata
+
+from pathlib                import Path
+
+from scompta.db             import amounts, journal, snapshot, transactions
+from scompta.importer       import sources
+
+log = logging.getLogger("Import dedup")
+
+INDEX_NAME = ".fingerprints.json"
+
+__RE_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+# ┌────────────────────────────────────────┐
+# │ Fingerprints                           │
+# └────────────────────────────────────────┘
+
+def normalize_label(label):
+    """
+    Lower case, accents removed, punctuation and spaces collapsed
+    """
+    if not isinstance(label, str):
+        return ""
+
+    label = unicodedata.normalize("NFKD", label)
+    label = "".join(x for x in label if not unicodedata.combining(x))
+
+    return __RE_NON_ALNUM.sub(" ", label.lower()).strip()
+
+
+def _digest(*parts):
+    return hashlib.blake2b("\x1f".join(map(str, parts)).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def fingerprints(df, account: str):
+    """
+    Compute the fingerprints of the rows of df involving the given
+    account. Returns a list with, for each row, the set of its fingerprints.
+    """
+    if amounts.is_columnar(df):
+        minor, currency = df["amount"].to_numpy(), df["currency"].astype(str).to_numpy()
+    else:
+        minor, currency = amounts.from_money(df["amount"])
+        currency        = currency.astype(str)
+
+    incoming = (df["target"] == account).to_numpy()
+    fitids   = df["fitid"].to_numpy() if "fitid" in df.columns else [None] * len(df)
+
+    result      = []
+    occurrences = {}
+    for day, label, value, cur, is_in, fitid in zip(df["day"], df["label"], minor, currency, incoming, fitids):
+        content = (account, int(day), int(value) if is_in else -int(value), cur, normalize_label(label))
+
+        # Number identical rows
+        occ                  = occurrences.get(content, 0)
+        occurrences[content] = occ + 1
+
+        fps = {_digest("content", *content, occ)}
+        if isinstance(fitid, str) and fitid:
+            fps.add(_digest("fitid", account, fitid))
+
+        result.append(fps)
+
+    return result
+
+
+# ┌────────────────────────────────────────┐
+# │ Fingerprint index                      │
+# └────────────────────────────────────────┘
+
+class Fingerprint_Index:
+    """
+    Fingerprints of the rows already ingested in one period, per account
+    """
+
+    def __init__(self, fpath: Path):
+        self.fpath    = Path(fpath)
+        self.accounts = {} # account -> set of fingerprints
+
+        if self.fpath.is_file():
+            data          = json.loads(self.fpath.read_text())
+            self.accounts = {acc: set(fps) for acc, fps in data.items()}
+
+    @classmethod
+    def for_period(cls, period_dir: Path):
+        """
+        Load the index of the given period folder. If there is no index yet
+        but the period has transactions, they are used to seed it.
+        """
+        period_dir = Path(period_dir)
+        index      = cls(period_dir / INDEX_NAME)
+
+        tr_path    = period_dir / "transactions.csv"
+        if not index.fpath.is_file() and tr_path.is_file():
+            log.info(f"Seed fingerprint index from {tr_path}")
+            index.seed(transactions.load(tr_path, columnar=True))
+
+        return index
+
+    def seed(self, df):
+        """
+        Add the fingerprints of existing transactions, for all the accounts
+        they involve
+        """
+        for account in set(df["origin"].dropna()) | set(df["target"].dropna()):
+            mask = ((df["origin"] == account) | (df["target"] == account)).to_numpy()
+            self.add(account, fingerprints(df.loc[mask], account))
+
+    def add(self, account: str, row_fps):
+        acc_fps = self.accounts.setdefault(account, set())
+        for fps in row_fps:
+            acc_fps |= fps
+
+    def filter_new(self, df, account: str):
+        """
+        Return the rows of df that were not ingested yet, and their fingerprints
+        """
+        acc_fps = self.accounts.get(account, set())
+        row_fps = fingerprints(df, account)
+
+        mask    = [acc_fps.isdisjoint(fps) for fps in row_fps]
+        new_fps = [fps for fps, is_new in zip(row_fps, mask) if is_new]
+
+        return df.loc[mask], new_fps
+
+    def save(self):
+        snapshot.write_json(self.fpath, {acc: sorted(fps) for acc, fps in self.accounts.items()})
+
+
+# ┌────────────────────────────────────────┐
+# │ Incremental merge                      │
+# └────────────────────────────────────────┘
+
+def merge_into_period(period_dir: Path, account: str, df, index: Fingerprint_Index = None, period_journal=None):
+    """
+    Append the rows of df that were not ingested yet to the period's
+    transactions, through the given journal.Period_Journal. Without
+    journal, the period's one is used and compacted right away. Returns
+    the number of appended rows.
+    """
+    period_dir     = Path(period_dir)
+    index          = index or Fingerprint_Index.for_period(period_dir)
+    compact        = period_journal is None
+    period_journal = period_journal or journal.Period_Journal(period_dir)
+
+    df_new, new_fps = index.filter_new(df, account)
+    if df_new.empty:
+        return 0
+
+    tr_path = period_dir / "transactions.csv"
+    if not tr_path.is_file():
+        period_dir.mkdir(parents=True, exist_ok=True)
+        transactions.create(tr_path)
+
+    df_new = amounts.with_money(df_new.drop(columns=["fitid"], errors="ignore")).astype(object)
+    df_new = df_new.where(df_new.notna(), None)
+    period_journal.commit([{"op": "append", "records": df_new.to_dict(orient="records")}])
+
+    # Only recorded once the rows are journaled
+    index.add(account, new_fps)
+    index.save()
+
+    if compact:
+        period_journal.compact()
+
+    log.info(f"Added {len(df_new)} new transactions for {account} in {tr_path}")
+
+    return len(df_new)
+
+
+def ingest_new(sources_root: Path, periods_root: Path, specs, period_names=None, workers=None):
+    """
+    Import the statements of the given periods (see sources.ingest), and
+    merge the rows that were not ingested yet into the periods transactions
+    files. Returns a dict period -> number of added rows.
+
+    Rows are written through the periods journals. The web server keeps
+    its own journals: don't import while it is running.
+    """
+    periods_root = Path(periods_root)
+    journals     = journal.Journal_Set(periods_root)
+
+    # Fingerprints are seeded from complete transactions files
+    journals.compact_pending()
+
+    jobs   = sources.jobs_for(sources_root, specs, period_names, columnar=True, with_ids=True)
+    result = {}
+
+    indexes = {}
+    for period, account, df in sources.run_jobs(jobs, workers):
+        period_dir = periods_root / period
+        index      = indexes.get(period)
+        if index is None:
+            index = indexes[period] = Fingerprint_Index.for_period(period_dir)
+
+        result[period] = result.get(period, 0) + merge_into_period(period_dir, account, df, index, journals[period])
+
+    journals.compact_pending()
+
+    return result
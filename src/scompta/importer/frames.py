@@ -0,0 +1,95 @@
+"""
+==============================================
+Helpers to build DataFrames from imported rows
+==============================================
+
+:Authors: - Florian Dupeyron <florian.dupeyron@mugcat.fr>
+:Date: October 2026
+"""
+
+from itertools import islice
+
+from scompta.db                import amounts
+from scompta.db.transactions   import COLUMNS
+from scompta.model             import slugs
+from scompta.model.batch       import Transaction_Batch
+from scompta.model.transaction import Transaction
+
+from scompta.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+money = lazy_import("money")
+
+
+def batched(iterable, size: int):
+    """
+    Yield lists of at most size items from iterable
+    """
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def to_frame(rows, columnar: bool = False, with_ids: bool = False):
+    """
+    Build a DataFrame in the transactions.load schema from a list of
+    (day, label, origin, target, amount, currency, source_id) tuples.
+    amount is a Decimal value. If with_ids is True, the source_id values
+    (FITID for OFX files) are kept in a fitid column.
+    """
+    days, labels, origins, targets, values, currencies, ids = zip(*rows) if rows else ((),) * 7
+
+    data = {
+        "day":    np.asarray(days, dtype="int64"),
+        "time":   [None] * len(rows),
+        "label":  list(labels),
+        "origin": slugs.intern_values(origins),
+        "target": slugs.intern_values(targets),
+        "amount": None,
+        "tag":    [None] * len(rows),
+    }
+
+    if columnar:
+        data["amount"]   = np.fromiter((int((x * amounts.SCALE).to_integral_value()) for x in values), dtype="int64", count=len(rows))
+        data["currency"] = pd.Categorical(currencies)
+    else:
+        data["amount"]   = [money.Money(amount=v, currency=c) for v, c in zip(values, currencies)]
+
+    columns = list(COLUMNS) + (["currency"] if columnar else [])
+    if with_ids:
+        data["fitid"] = list(ids)
+        columns.append("fitid")
+
+    return pd.DataFrame(data, columns=columns)
+
+
+def to_transactions(rows):
+    """
+    Build Transaction objects from (day, label, origin, target, amount, currency, source_id) tuples
+    """
+    return [
+        Transaction(
+            day    = day,
+            time   = "",
+            label  = label,
+            origin = slugs.intern(origin),
+            target = slugs.intern(target),
+
+            amount = money.Money(amount=value, currency=currency),
+            tag    = None,
+        )
+        for day, label, origin, target, value, currency, _ in rows
+    ]
+
+
+def to_batch(rows):
+    """
+    Build a packed Transaction_Batch from (day, label, origin, target,
+    amount, currency, source_id) tuples
+    """
+    return Transaction_Batch.from_rows(rows)
@@ -9,27 +9,24 @@ Importer for OFX files
 
 import logging
 
-from money                     import Money # Gotta get rich!
-from scompta.model.transaction import Transaction
+from scompta.importer          import frames
 from pathlib                   import Path
 
 from ofxtools.Parser           import OFXTree
 
 log = logging.getLogger("OFX import")
 
-def from_file(account_slug: str, fpath: Path):
+def iter_rows(account_slug: str, fpath: Path):
     """
-    Process an OFX file into a list of transactions
-    
+    Process an OFX file into (day, label, origin, target, amount, currency, source_id) tuples
+
     :param account_slug: Account slug
     :param fpath: Path to OFX file
-    :return: A list of transactions
     """
 
     log.info(f"Process OFX file: {fpath} for {account_slug}")
 
     fpath = Path(fpath)
-    ops   = []
 
     parser = OFXTree()
     parser.parse(str(fpath))
@@ -38,7 +35,6 @@ def from_file(account_slug: str, fpath: Path):
     currency     = ofx.statements[0].curdef
     transactions = ofx.statements[0].transactions
 
-    
     for tr in transactions:
         dtposted = tr.dtposted
         amount   = tr.trnamt
@@ -47,17 +43,43 @@ def from_file(account_slug: str, fpath: Path):
         origin   = "<ORIGIN>" if amount  > 0 else account_slug
         target   = "<TARGET>" if amount <= 0 else account_slug
 
-        amount   = abs(amount)
+        yield (dtposted.day, memo, origin, target, abs(amount), currency, tr.fitid)
+
+def from_file(account_slug: str, fpath: Path):
+    """
+    Process an OFX file into a list of transactions
+    
+    :param account_slug: Account slug
+    :param fpath: Path to OFX file
+    :return: A list of transactions
+    """
+
+    return frames.to_transactions(iter_rows(account_slug, fpath))
+
+def iter_batches(account_slug: str, fpath: Path, batch_size: int = 10000, columnar: bool = False, with_ids: bool = False):
+    """
+    Process an OFX file into DataFrames of at most batch_size rows, using
+    the transactions.load schema
+
+    :param account_slug: Account slug
+    :param fpath: Path to OFX file
+    :param columnar: Use columnar amounts (see scompta.db.amounts)
+    :param with_ids: Keep the source transaction IDs in a fitid column
+    """
+
+    for batch in frames.batched(iter_rows(account_slug, fpath), batch_size):
+        yield frames.to_frame(batch, columnar=columnar, with_ids=with_ids)
 
-        ops.append(Transaction(
-            day    = dtposted.day,
-            time   = "",
-            label  = memo,
-            origin = origin,
-            target = target,
+def to_frame(account_slug: str, fpath: Path, columnar: bool = False, with_ids: bool = False):
+    """
+    Process an OFX file into a DataFrame, using the transactions.load schema
+    """
 
-            amount = Money(amount=amount, currency=currency),
-            tag    = None,
-        ))
+    return frames.to_frame(list(iter_rows(account_slug, fpath)), columnar=columnar, with_ids=with_ids)
+
+def to_batch(account_slug: str, fpath: Path):
+    """
+    Process an OFX file into a packed Transaction_Batch
+    """
 
-    return ops
+    return frames.to_batch(iter_rows(account_slug, fpath))
@@ -9,28 +9,25 @@ Importer for QIF files
 
 import logging
 
-from money                     import Money
-from scompta.model.transaction import Transaction
+from scompta.importer          import frames
 from pathlib                   import Path
 
 from quiffen                   import Qif, QifDataType
 
 log = logging.getLogger("QIF import")
 
-def from_file(account_slug: str, fpath: Path, currency: str):
+def iter_rows(account_slug: str, fpath: Path, currency: str):
     """
-    Process a QIF file into a list of transactions
+    Process a QIF file into (day, label, origin, target, amount, currency, source_id) tuples
 
     :param account_slug: Account slug
     :param fpath: Path to QIF file
     :param currency: Name of currency
-    :return: A list of transactions
     """
 
     log.info(f"Process QIF source: {fpath}")
 
     fpath = Path(fpath)
-    ops   = []
 
     # FIXME # Day first adjustement for various locales
     qif = Qif.parse(str(fpath), day_first=True)
@@ -39,24 +36,50 @@ def from_file(account_slug: str, fpath: Path, currency: str):
     for tr in acc.transactions["Bank"]:
         day    = tr.date.day
         amount = tr.amount
-        label  = tr.payee.replace(";", " - ")
+        label  = (tr.payee or tr.memo or "").replace(";", " - ")
 
         origin = "<ORIGIN>" if amount  > 0 else account_slug
         target = "<TARGET>" if amount <= 0 else account_slug
 
-        amount = abs(amount)
+        yield (day, label, origin, target, abs(amount), currency, None)
 
-        ops.append(Transaction(
-            day    = day,
-            time   = "",
-            label  = label,
+def from_file(account_slug: str, fpath: Path, currency: str):
+    """
+    Process a QIF file into a list of transactions
 
-            origin = origin,
-            target = target,
+    :param account_slug: Account slug
+    :param fpath: Path to QIF file
+    :param currency: Name of currency
+    :return: A list of transactions
+    """
+
+    return frames.to_transactions(iter_rows(account_slug, fpath, currency))
 
-            amount = Money(amount=amount, currency=currency),
-            tag    = None,
-        ))
+def iter_batches(account_slug: str, fpath: Path, currency: str, batch_size: int = 10000, columnar: bool = False, with_ids: bool = False):
+    """
+    Process a QIF file into DataFrames of at most batch_size rows, using
+    the transactions.load schema
 
-    return ops
+    :param account_slug: Account slug
+    :param fpath: Path to QIF file
+    :param currency: Name of currency
+    :param columnar: Use columnar amounts (see scompta.db.amounts)
+    :param with_ids: Keep the source transaction IDs in a fitid column
+    """
+
+    for batch in frames.batched(iter_rows(account_slug, fpath, currency), batch_size):
+        yield frames.to_frame(batch, columnar=columnar, with_ids=with_ids)
+
+def to_frame(account_slug: str, fpath: Path, currency: str, columnar: bool = False, with_ids: bool = False):
+    """
+    Process a QIF file into a DataFrame, using the transactions.load schema
+    """
+
+    return frames.to_frame(list(iter_rows(account_slug, fpath, currency)), columnar=columnar, with_ids=with_ids)
+
+def to_batch(account_slug: str, fpath: Path, currency: str):
+    """
+    Process a QIF file into a packed Transaction_Batch
+    """
 
+    return frames.to_batch(iter_rows(account_slug, fpath, currency))
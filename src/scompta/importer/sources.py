@@ -0,0 +1,148 @@
+"""
+=======================================
+Ingestion of bank statements by periods
+=======================================
+
+:Authors: - Florian Dupeyron <florian.dupeyron@mugcat.fr>
+:Date: October 2026
+
+Statements are stored in a ``sources/YYYY-MM/`` folder per period. A list
+of source specs tells which account each statement file belongs to,
+for instance in a ``sources.toml`` file:
+
+.. code:: toml
+
+    [[source]]
+    path    = "person1/checking.ofx"
+    account = "assets/person1/checking"
+
+    [[source]]
+    path     = "person2/checking.qif"
+    account  = "assets/person2/checking"
+    currency = "EUR"
+"""
+
+import logging
+
+import toml
+
+from concurrent         import futures
+from dataclasses        import dataclass
+from pathlib            import Path
+from typing             import Optional
+
+from scompta.db         import periods
+from scompta.model      import slugs
+
+from scompta.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+log = logging.getLogger("Sources import")
+
+
+# ┌────────────────────────────────────────┐
+# │ Source specs                           │
+# └────────────────────────────────────────┘
+
+@dataclass
+class Source_Spec:
+    path:     str           # Relative to the period sources folder, can be a glob pattern
+    account:  str           # Account slug
+    currency: Optional[str] = None # Mandatory for QIF files
+
+def load_specs(fpath: Path):
+    """
+    Load source specs from a TOML file
+    """
+    with open(str(fpath), "r") as fhandle:
+        data = toml.load(fhandle)
+
+    return [Source_Spec(**x) for x in data.get("source", [])]
+
+
+# ┌────────────────────────────────────────┐
+# │ Import one file                        │
+# └────────────────────────────────────────┘
+
+def import_file(fpath: Path, spec: Source_Spec, columnar: bool = False, with_ids: bool = False):
+    """
+    Import a statement file into a DataFrame, choosing the importer
+    from the file extension
+    """
+    fpath  = Path(fpath)
+    suffix = fpath.suffix.lower()
+
+    if suffix in (".ofx", ".qfx"):
+        from scompta.importer import ofx
+        return ofx.to_frame(spec.account, fpath, columnar=columnar, with_ids=with_ids)
+
+    elif suffix == ".qif":
+        if spec.currency is None:
+            raise ValueError(f"Currency is required for QIF source {fpath}")
+
+        from scompta.importer import qif
+        return qif.to_frame(spec.account, fpath, spec.currency, columnar=columnar, with_ids=with_ids)
+
+    else:
+        raise ValueError(f"Unsupported source file: {fpath}")
+
+
+def _import_job(job):
+    # Top-level function so it can be sent to worker processes
+    period, fpath, spec, columnar, with_ids = job
+    return period, spec.account, import_file(fpath, spec, columnar=columnar, with_ids=with_ids)
+
+
+# ┌────────────────────────────────────────┐
+# │ Ingest sources tree                    │
+# └────────────────────────────────────────┘
+
+def jobs_for(sources_root: Path, specs, period_names=None, columnar: bool = False, with_ids: bool = False):
+    """
+    List the (period, file, spec, columnar, with_ids) import jobs for the given periods
+    """
+    sources_root = Path(sources_root)
+
+    if period_names is None:
+        period_names = [x.name for x in periods.list_from_dir(sources_root)]
+
+    jobs = []
+    for period in sorted(period_names):
+        for spec in specs:
+            for fpath in sorted((sources_root / period).glob(spec.path)):
+                jobs.append((period, fpath, spec, columnar, with_ids))
+
+    return jobs
+
+
+def run_jobs(jobs, workers=None):
+    """
+    Run import jobs, in parallel worker processes if workers isn't 1.
+    Returns a list of (period, account, DataFrame)
+    """
+    if workers == 1 or len(jobs) <= 1:
+        return list(map(_import_job, jobs))
+
+    with futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_import_job, jobs))
+
+    # Slugs coming back from the workers are new string objects
+    return [(period, slugs.intern(account), slugs.intern_frame(df)) for period, account, df in results]
+
+
+def ingest(sources_root: Path, specs, period_names=None, workers=None, columnar: bool = False):
+    """
+    Import all the statement files of the given periods (all periods if
+    None), in parallel worker processes. Returns a dict period name ->
+    DataFrame in the transactions.load schema.
+    """
+    jobs = jobs_for(sources_root, specs, period_names, columnar)
+
+    log.info(f"Ingest {len(jobs)} source files from {sources_root}")
+
+    frames = {}
+    for period, _, df in run_jobs(jobs, workers):
+        frames.setdefault(period, []).append(df)
+
+    return {period: pd.concat(dfs, ignore_index=True) for period, dfs in frames.items()}
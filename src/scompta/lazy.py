@@ -0,0 +1,82 @@
+"""
+┌───────────────────────────────┐
+│ Lazy imports of heavy modules │
+└───────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+numpy, pandas and money take most of the import time of scompta. Modules
+bind them with lazy_import(), so they are only loaded when first used:
+
+.. code:: python
+
+    from scompta.lazy import lazy_import
+
+    pd = lazy_import("pandas")
+
+Annotations using them must be strings, as they are evaluated when the
+function is defined.
+
+The module is imported by the first attribute access, under a lock, and
+its attributes are then copied to the proxy so later accesses are plain
+attribute lookups.
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+
+_lock = threading.RLock()
+
+
+class _Lazy_Module:
+    """
+    Stands for a module until its first attribute access
+    """
+
+    def __init__(self, name: str):
+        self.__dict__["_lazy_name"]   = name
+        self.__dict__["_lazy_module"] = None
+
+    def _lazy_load(self):
+        with _lock:
+            module = self._lazy_module
+            if module is None:
+                module = importlib.import_module(self._lazy_name)
+
+                # Copied before being published: other threads either see
+                # no module, or a complete proxy
+                self.__dict__.update(module.__dict__)
+                self.__dict__["_lazy_module"] = module
+
+            return module
+
+    def __getattr__(self, attr):
+        # Only called for attributes not copied yet
+        return getattr(self._lazy_load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._lazy_load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._lazy_load())
+
+    def __repr__(self):
+        return f"<lazy module '{self._lazy_name}'>"
+
+
+def lazy_import(name: str):
+    """
+    Return the module with the given name, loaded on first attribute
+    access. Already imported modules are returned as is.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    return _Lazy_Module(name)
@@ -11,6 +11,8 @@ from enum        import Enum
 from dataclasses import dataclass, field, asdict
 from typing      import Optional
 
+from .slots      import slotted
+
 
 # ┌────────────────────────────────────────┐
 # │ Account types                          │
@@ -29,9 +31,23 @@ class Account_Type(Enum):
 # │ Account data class                     │
 # └────────────────────────────────────────┘
 
+@slotted
 @dataclass
 class Account:
     path: str
     name: str
     type: Account_Type
     tag:  Optional[str] = field(default=None)
+
+
+@slotted
+@dataclass(frozen=True)
+class Frozen_Account:
+    """
+    Immutable and hashable variant of Account
+    """
+
+    path: str
+    name: str
+    type: Account_Type
+    tag:  Optional[str] = field(default=None)
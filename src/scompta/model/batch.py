@@ -0,0 +1,228 @@
+"""
+┌────────────────────────────┐
+│ Packed transaction batches │
+└────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+A Transaction_Batch holds many transactions in one numpy array per field
+instead of one object per transaction. Account slugs and currencies are
+stored as int32 codes into small lists of interned strings, amounts as
+int64 minor units (see scompta.db.amounts). Transaction objects are only
+built when rows are accessed.
+"""
+
+from scompta.db   import amounts
+
+from .slugs       import SLUGS
+from .transaction import Transaction
+
+from scompta.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+money = lazy_import("money")
+
+
+def _encode(values, table=None):
+    """
+    Return the int32 codes and the list of distinct values
+    """
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    uniques        = list(uniques)
+
+    if table is not None:
+        uniques = [table.intern(x) for x in uniques]
+
+    return codes.astype("int32"), uniques
+
+
+def _decode(codes, uniques):
+    # Missing values have code -1, which picks the final None
+    return np.asarray(list(uniques) + [None], dtype=object)[codes]
+
+
+class Transaction_Batch:
+    """
+    Column-packed list of transactions
+    """
+
+    __slots__ = ("day", "time", "label", "origin", "target", "slugs", "amount", "currency", "currencies", "tag")
+
+    def __init__(self, day, time, label, origin, target, slugs, amount, currency, currencies, tag):
+        self.day        = day        # int16 array
+        self.time       = time       # object array
+        self.label      = label      # object array
+        self.origin     = origin     # int32 codes into slugs
+        self.target     = target     # int32 codes into slugs
+        self.slugs      = slugs      # list of interned account slugs
+        self.amount     = amount     # int64 minor units
+        self.currency   = currency   # int32 codes into currencies
+        self.currencies = currencies # list of currency codes
+        self.tag        = tag        # object array
+
+    # ─────────────── Builders ─────────────── #
+
+    @classmethod
+    def from_columns(cls, day, time, label, origin, target, amount, currency, tag):
+        """
+        Build a batch from column sequences, amount in minor units
+        """
+        n = len(day)
+
+        # Origin and target share the same slugs list
+        slug_codes, slugs   = _encode(np.concatenate([np.asarray(origin, dtype=object), np.asarray(target, dtype=object)]), SLUGS)
+        cur_codes, cur_list = _encode(currency)
+
+        return cls(
+            day        = np.asarray(day, dtype="int16"),
+            time       = np.asarray(time,  dtype=object),
+            label      = np.asarray(label, dtype=object),
+            origin     = slug_codes[:n],
+            target     = slug_codes[n:],
+            slugs      = slugs,
+            amount     = np.asarray(amount, dtype="int64"),
+            currency   = cur_codes,
+            currencies = cur_list,
+            tag        = np.asarray(tag,   dtype=object),
+        )
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Build a batch from importer (day, label, origin, target, amount,
+        currency, source_id) tuples, amount being a Decimal value
+        """
+        rows = list(rows)
+        days, labels, origins, targets, values, currencies, _ = zip(*rows) if rows else ((),) * 7
+
+        return cls.from_columns(
+            day      = days,
+            time     = [None] * len(rows),
+            label    = labels,
+            origin   = origins,
+            target   = targets,
+            amount   = [int((x * amounts.SCALE).to_integral_value()) for x in values],
+            currency = currencies,
+            tag      = [None] * len(rows),
+        )
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        transactions = list(transactions)
+
+        return cls.from_columns(
+            day      = [x.day    for x in transactions],
+            time     = [x.time   for x in transactions],
+            label    = [x.label  for x in transactions],
+            origin   = [x.origin for x in transactions],
+            target   = [x.target for x in transactions],
+            amount   = [int((x.amount.amount * amounts.SCALE).to_integral_value()) for x in transactions],
+            currency = [x.amount.currency for x in transactions],
+            tag      = [x.tag    for x in transactions],
+        )
+
+    @classmethod
+    def from_frame(cls, df: "pd.DataFrame"):
+        """
+        Build a batch from a transactions DataFrame (Money or columnar amounts)
+        """
+        if amounts.is_columnar(df):
+            minor, currency = df["amount"].to_numpy(), df["currency"].astype(object).to_numpy()
+        else:
+            minor, currency = amounts.from_money(df["amount"])
+            currency        = np.asarray(currency, dtype=object)
+
+        return cls.from_columns(
+            day      = df["day"].to_numpy(),
+            time     = df["time"].astype(object).to_numpy(),
+            label    = df["label"].astype(object).to_numpy(),
+            origin   = df["origin"].astype(object).to_numpy(),
+            target   = df["target"].astype(object).to_numpy(),
+            amount   = minor,
+            currency = currency,
+            tag      = df["tag"].astype(object).to_numpy(),
+        )
+
+    # ─────────────── Accessors ────────────── #
+
+    def __len__(self):
+        return len(self.day)
+
+    def __getitem__(self, key):
+        """
+        An integer key returns a Transaction, a slice or a mask returns
+        a new batch sharing the same slugs and currencies lists
+        """
+        if isinstance(key, (int, np.integer)):
+            return self._transaction(int(key))
+
+        return Transaction_Batch(
+            day        = self.day[key],
+            time       = self.time[key],
+            label      = self.label[key],
+            origin     = self.origin[key],
+            target     = self.target[key],
+            slugs      = self.slugs,
+            amount     = self.amount[key],
+            currency   = self.currency[key],
+            currencies = self.currencies,
+            tag        = self.tag[key],
+        )
+
+    def __iter__(self):
+        # Amounts are formatted in one pass over the column
+        return map(self._transaction, range(len(self)), amounts.format_values(self.amount).tolist())
+
+    def _transaction(self, i, value=None):
+        currency = self.currencies[self.currency[i]]
+        if value is None:
+            value = amounts.format_values(self.amount[i:i+1])[0]
+
+        return Transaction(
+            day    = int(self.day[i]),
+            time   = self.time[i],
+            label  = self.label[i],
+            origin = self.slugs[self.origin[i]] if self.origin[i] >= 0 else None,
+            target = self.slugs[self.target[i]] if self.target[i] >= 0 else None,
+            amount = money.Money(value, currency),
+            tag    = self.tag[i],
+        )
+
+    def account_mask(self, slug: str):
+        """
+        Boolean mask of the rows involving the given account
+        """
+        if slug not in self.slugs:
+            return np.zeros(len(self), dtype=bool)
+
+        code = self.slugs.index(slug)
+        return (self.origin == code) | (self.target == code)
+
+    @property
+    def nbytes(self):
+        """
+        Size of the packed arrays, not counting the strings they refer to
+        """
+        return sum(getattr(self, x).nbytes for x in ("day", "time", "label", "origin", "target", "amount", "currency", "tag"))
+
+    # ────────────── Conversion ────────────── #
+
+    def to_frame(self, columnar: bool = False):
+        """
+        Convert to a DataFrame in the transactions.load schema
+        """
+        df = pd.DataFrame({
+            "day":      self.day.astype("int64"),
+            "time":     self.time,
+            "label":    self.label,
+            "origin":   _decode(self.origin, self.slugs),
+            "target":   _decode(self.target, self.slugs),
+            "amount":   self.amount,
+            "tag":      self.tag,
+            "currency": pd.Categorical.from_codes(self.currency, categories=self.currencies),
+        })
+
+        return df if columnar else amounts.with_money(df)
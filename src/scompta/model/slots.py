@@ -0,0 +1,49 @@
+"""
+┌─────────────────────┐
+│ Slotted dataclasses │
+└─────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+dataclass(slots=True) only exists from python 3.10, this decorator does
+the same for older versions: instances have no __dict__, which saves
+memory when millions of them are built.
+"""
+
+from dataclasses import fields
+
+
+def _getstate(self):
+    return [getattr(self, x) for x in self.__slots__]
+
+def _setstate(self, state):
+    # object.__setattr__ so it also works for frozen dataclasses
+    for name, value in zip(self.__slots__, state):
+        object.__setattr__(self, name, value)
+
+
+def slotted(cls):
+    """
+    Rebuild the given dataclass with __slots__ for its fields. Must be
+    applied after @dataclass.
+    """
+    names    = tuple(x.name for x in fields(cls))
+    cls_dict = dict(cls.__dict__)
+
+    # Defaults are kept by the generated __init__, class attributes
+    # would conflict with the slots
+    for name in names:
+        cls_dict.pop(name, None)
+
+    cls_dict.pop("__dict__",    None)
+    cls_dict.pop("__weakref__", None)
+
+    cls_dict["__slots__"]    = names
+    cls_dict["__getstate__"] = _getstate
+    cls_dict["__setstate__"] = _setstate
+
+    new_cls              = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+
+    return new_cls
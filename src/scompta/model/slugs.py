@@ -0,0 +1,75 @@
+"""
+┌────────────────────────────┐
+│ Account slugs intern table │
+└────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+The same account slugs (assets/person1/checking) appear in most
+transactions. Loaders and importers go through a shared intern table, so
+each slug is stored once in memory whatever the number of rows.
+"""
+
+from scompta.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+SLUG_COLUMNS = ("origin", "target")
+
+
+class Slug_Table:
+    """
+    Maps each slug to its canonical string object
+    """
+
+    def __init__(self):
+        self._slugs = {}
+
+    def __len__(self):
+        return len(self._slugs)
+
+    def __contains__(self, slug):
+        return slug in self._slugs
+
+    def intern(self, slug):
+        if not isinstance(slug, str):
+            return slug # None, NaN
+
+        # setdefault is atomic, no lock needed between threads
+        return self._slugs.setdefault(slug, slug)
+
+    def intern_values(self, values):
+        """
+        Return an object array with the interned values. Only distinct
+        values are looked up in the table.
+        """
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+        uniques        = np.asarray([self.intern(x) for x in uniques] + [None], dtype=object)
+
+        # Missing values have code -1, which picks the final None
+        return uniques[codes]
+
+    def intern_frame(self, df: "pd.DataFrame", columns=SLUG_COLUMNS):
+        """
+        Intern the slug columns of a transactions DataFrame, in place
+        """
+        for col in columns:
+            if col not in df.columns:
+                continue
+
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].cat.rename_categories([self.intern(x) for x in df[col].cat.categories])
+            else:
+                df[col] = self.intern_values(df[col])
+
+        return df
+
+
+# Table shared by importers and loaders
+SLUGS = Slug_Table()
+
+intern        = SLUGS.intern
+intern_values = SLUGS.intern_values
+intern_frame  = SLUGS.intern_frame
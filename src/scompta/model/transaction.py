@@ -7,8 +7,6 @@
  October 2022
 """
 
-from money       import Money
-
 from .account    import Account
 from .account    import Account_Type
 
@@ -16,11 +14,14 @@ from dataclasses import dataclass
 
 from typing      import Optional
 
+from .slots      import slotted
+
 
 # ┌────────────────────────────────────────┐
 # │ Main trasaction dataclass              │
 # └────────────────────────────────────────┘
 
+@slotted
 @dataclass
 class Transaction:
     day: int
@@ -28,7 +29,25 @@ class Transaction:
 
     origin: str
     target: str
-    amount: Money
+    amount: "money.Money"
+
+    label: Optional[str]
+    tag: Optional[str]
+
+
+@slotted
+@dataclass(frozen=True)
+class Frozen_Transaction:
+    """
+    Immutable and hashable variant of Transaction
+    """
+
+    day: int
+    time: str
+
+    origin: str
+    target: str
+    amount: "money.Money"
 
     label: Optional[str]
     tag: Optional[str]
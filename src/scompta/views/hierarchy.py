@@ -0,0 +1,170 @@
+"""
+┌─────────────────────────────────────┐
+│ Roll-up over the account slugs tree │
+└─────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+Account slugs are paths (outcome/common/household/food): each prefix of a
+slug is a node of the accounts tree. Totals of a node include all the
+accounts below it.
+"""
+
+import logging
+
+from scompta.db import amounts
+
+from scompta.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+money = lazy_import("money")
+
+log = logging.getLogger(__file__)
+
+
+# ┌────────────────────────────────────────┐
+# │ Accounts tree                          │
+# └────────────────────────────────────────┘
+
+def ancestors(slug: str):
+    """
+    Return the nodes from the root to the given slug:
+    a/b/c -> a, a/b, a/b/c
+    """
+    parts = slug.split("/")
+    return ["/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+class Account_Tree:
+    """
+    Prefix tree of account slugs
+    """
+
+    def __init__(self, slugs=()):
+        self.children   = {"": set()} # node -> child nodes, "" is the root
+        self._ancestors = {}          # slug -> ancestor nodes
+        self.add(slugs)
+
+    @classmethod
+    def from_accounts(cls, df_accounts):
+        return cls(df_accounts.index)
+
+    def add(self, slugs):
+        for slug in slugs:
+            parent = ""
+            for node in ancestors(slug):
+                self.children.setdefault(node, set())
+                self.children[parent].add(node)
+                parent = node
+
+    def ancestors_frame(self, slugs):
+        """
+        Return a (slug, node) DataFrame linking each slug to all its
+        ancestor nodes. Slugs missing from the tree are added to it.
+        """
+        pairs = []
+        for slug in slugs:
+            nodes = self._ancestors.get(slug)
+            if nodes is None:
+                self.add([slug])
+                nodes = self._ancestors[slug] = ancestors(slug)
+
+            pairs += [(slug, node) for node in nodes]
+
+        return pd.DataFrame(pairs, columns=["slug", "node"])
+
+    @property
+    def nodes(self):
+        return sorted(x for x in self.children if x)
+
+    def subtree(self, node: str):
+        """
+        Return the set of nodes under the given node, including itself
+        """
+        result = set()
+        stack  = [node]
+
+        while stack:
+            cur = stack.pop()
+            if cur in self.children:
+                result.add(cur)
+                stack.extend(self.children[cur])
+
+        return result
+
+
+# ┌────────────────────────────────────────┐
+# │ Roll-up                                │
+# └────────────────────────────────────────┘
+
+def _slug_flows(df):
+    """
+    Per slug and currency sums of money coming in (as target) and going
+    out (as origin), in a single groupby
+    """
+    if not amounts.is_columnar(df):
+        df = amounts.columnar(df)
+
+    n     = len(df)
+    flows = pd.DataFrame({
+        "slug":     np.concatenate([df["target"].astype(object).to_numpy(), df["origin"].astype(object).to_numpy()]),
+        "currency": np.concatenate([df["currency"].astype(object).to_numpy()] * 2),
+        "in":       np.concatenate([df["amount"].to_numpy(), np.zeros(n, dtype="int64")]),
+        "out":      np.concatenate([np.zeros(n, dtype="int64"), df["amount"].to_numpy()]),
+    })
+
+    return flows.dropna(subset=["slug"]).groupby(["slug", "currency"], sort=False)[["in", "out"]].sum().reset_index()
+
+
+def rollup(df, tree: Account_Tree = None):
+    """
+    Compute totals for every node of the accounts tree from the given
+    transactions (a period or the whole ledger). Returns a DataFrame with
+    node, depth, currency, in, out and net columns, in minor units (see
+    scompta.db.amounts). Slugs missing from the given tree are added
+    to it.
+    """
+    flows   = _slug_flows(df)
+    tree    = tree if tree is not None else Account_Tree()
+
+    # Each slug contributes to all its ancestors
+    mapping = tree.ancestors_frame(flows["slug"].unique())
+
+    totals        = flows.merge(mapping, on="slug").groupby(["node", "currency"])[["in", "out"]].sum().reset_index()
+    totals["net"] = totals["in"] - totals["out"]
+    totals.insert(1, "depth", totals["node"].str.count("/") + 1)
+
+    return totals
+
+
+def node_total(totals: "pd.DataFrame", node: str):
+    """
+    Net total of the given node from a rollup() result. Returns a dict
+    currency -> Money
+    """
+    rows = totals.loc[totals["node"] == node]
+    return {cur: money.Money(v, cur) for cur, v in zip(rows["currency"], amounts.format_values(rows["net"].to_numpy()))}
+
+
+def subtree_total(df, node: str, tree: Account_Tree = None):
+    """
+    Net total of a single node, without computing the whole tree
+    """
+    if not amounts.is_columnar(df):
+        df = amounts.columnar(df)
+
+    if tree is not None:
+        nodes = tree.subtree(node)
+        in_target = df["target"].isin(nodes).to_numpy()
+        in_origin = df["origin"].isin(nodes).to_numpy()
+    else:
+        in_target = ((df["target"] == node) | df["target"].astype(str).str.startswith(node + "/")).to_numpy()
+        in_origin = ((df["origin"] == node) | df["origin"].astype(str).str.startswith(node + "/")).to_numpy()
+
+    # Transfers inside the subtree cancel out
+    sign = in_target.astype("int64") - in_origin.astype("int64")
+
+    return amounts.total(df.assign(amount=df["amount"].to_numpy() * sign))
@@ -0,0 +1,180 @@
+"""
+┌─────────────────────────────────┐
+│ Transactions queries by periods │
+└─────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+
+A Period_Index keeps the row positions of one period by origin, target
+and tag, along with the columns used by filters. It is built once per
+period version (see scompta.db.cache), then queries only touch the rows
+of the requested accounts.
+"""
+
+import logging
+import re
+
+from dataclasses import dataclass
+from decimal     import Decimal
+from typing      import Optional
+
+from scompta.db  import amounts
+
+from scompta.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+log = logging.getLogger(__file__)
+
+RE_DATE = re.compile(r"^(\d{4}-\d{2})(?:-(\d{2}))?$")
+
+
+def _empty():
+    return np.zeros(0, dtype="int64")
+
+
+# ┌────────────────────────────────────────┐
+# │ Query                                  │
+# └────────────────────────────────────────┘
+
+def parse_date(value: str):
+    """
+    Parse a YYYY-MM-DD or YYYY-MM date into a (period, day) tuple,
+    day being None for a whole month
+    """
+    match = RE_DATE.match(value)
+    if match is None:
+        raise ValueError(f"Invalid date: {value}")
+
+    return match.group(1), int(match.group(2)) if match.group(2) else None
+
+
+@dataclass
+class Transaction_Query:
+    account:    Optional[str]     = None
+    subtree:    bool              = False # Include accounts below account
+    tag:        Optional[str]     = None
+    date_from:  Optional[str]     = None  # YYYY-MM-DD or YYYY-MM, included
+    date_to:    Optional[str]     = None  # YYYY-MM-DD or YYYY-MM, included
+    amount_min: Optional[Decimal] = None
+    amount_max: Optional[Decimal] = None
+    currency:   Optional[str]     = None
+    label:      Optional[str]     = None  # Case insensitive substring
+
+    def periods(self, names):
+        """
+        Filter the period names in the date range
+        """
+        start = parse_date(self.date_from)[0] if self.date_from else None
+        end   = parse_date(self.date_to  )[0] if self.date_to   else None
+
+        return [x for x in sorted(names) if (start is None or x >= start) and (end is None or x <= end)]
+
+    def day_range(self, period: str):
+        """
+        Range of days to keep in the given period
+        """
+        first, last = 1, 31
+
+        if self.date_from:
+            start, day = parse_date(self.date_from)
+            if period == start and day is not None:
+                first = day
+
+        if self.date_to:
+            end, day = parse_date(self.date_to)
+            if period == end and day is not None:
+                last = day
+
+        return first, last
+
+
+# ┌────────────────────────────────────────┐
+# │ Period index                           │
+# └────────────────────────────────────────┘
+
+def _positions(values):
+    """
+    Map each distinct value to the sorted array of its row positions
+    """
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    order          = np.argsort(codes, kind="stable")
+    bounds         = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+    # Missing values have code -1, they come first and are left out
+    return {x: order[bounds[i]:bounds[i + 1]] for i, x in enumerate(uniques)}
+
+
+class Period_Index:
+    """
+    Row positions of one period by origin, target and tag
+    """
+
+    def __init__(self, df: "pd.DataFrame"):
+        if not amounts.is_columnar(df):
+            df = amounts.columnar(df)
+
+        self.size     = len(df)
+
+        self.origin   = _positions(df["origin"])
+        self.target   = _positions(df["target"])
+        self.tag      = _positions(df["tag"])
+
+        self.day      = df["day"].to_numpy()
+        self.amount   = df["amount"].to_numpy()
+        self.currency = df["currency"].astype(object).to_numpy()
+        self.label    = df["label"].fillna("").astype(str).str.lower().to_numpy()
+
+    def __sizeof__(self):
+        arrays = [self.day, self.amount, self.currency, self.label]
+        arrays += [x for idx in (self.origin, self.target, self.tag) for x in idx.values()]
+
+        return sum(x.nbytes for x in arrays)
+
+    def _account_rows(self, account: str, subtree: bool):
+        prefix = account + "/"
+        parts  = []
+
+        for idx in (self.origin, self.target):
+            if subtree:
+                parts += [rows for slug, rows in idx.items() if slug == account or slug.startswith(prefix)]
+            else:
+                parts.append(idx.get(account, _empty()))
+
+        # Transfers inside a subtree appear on both sides
+        return np.unique(np.concatenate(parts)) if parts else _empty()
+
+    def select(self, query: Transaction_Query, period: str):
+        """
+        Return the sorted positions of the rows matching the query
+        """
+        if query.account is not None:
+            rows = self._account_rows(query.account, query.subtree)
+        else:
+            rows = np.arange(self.size)
+
+        if query.tag is not None:
+            rows = np.intersect1d(rows, self.tag.get(query.tag, _empty()), assume_unique=True)
+
+        # Remaining filters only look at the candidate rows
+        first, last = query.day_range(period)
+        if first > 1 or last < 31:
+            days = self.day[rows]
+            rows = rows[(days >= first) & (days <= last)]
+
+        if query.currency is not None:
+            rows = rows[self.currency[rows] == query.currency]
+
+        if query.amount_min is not None:
+            rows = rows[self.amount[rows] >= int(Decimal(query.amount_min) * amounts.SCALE)]
+
+        if query.amount_max is not None:
+            rows = rows[self.amount[rows] <= int(Decimal(query.amount_max) * amounts.SCALE)]
+
+        if query.label:
+            needle = query.label.lower()
+            rows   = rows[np.fromiter((needle in x for x in self.label[rows]), dtype=bool, count=len(rows))]
+
+        return rows
@@ -9,15 +9,18 @@
 
 import logging
 
-import pandas as pd
-
-from pathlib import Path
-from money   import Money
+from dataclasses import dataclass
+from pathlib     import Path
 
 from scompta.model.account import (
     Account_Type
 )
 
+from scompta.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
 
 # ┌────────────────────────────────────────┐
 # │ Check undefined accounts               │
@@ -29,49 +32,147 @@ def undefined_accounts(df, accs_df):
     Returns the list of undefined acconut names, as well as the concerned transactions
     """
 
-    # Transaction referring to unknown accounts
-    tr_unknown_accounts = df.loc[~(df["origin"].isin(accs_df.index) | df["target"].isin(accs_df.index))]
+    known   = set(accs_df.index)
 
-    tr_from             = tr_unknown_accounts["origin"].rename("path")
-    tr_to               = tr_unknown_accounts["target"].rename("path")
+    # Only distinct slugs are looked up
+    slugs   = set(df["origin"].dropna().unique()) | set(df["target"].dropna().unique())
+    unknown = sorted(slugs - known)
+
+    # Transaction referring to unknown accounts
+    tr_unknown_accounts = df.loc[(df["origin"].isin(unknown) | df["target"].isin(unknown)).to_numpy()]
 
     # List of unknown accounts path
-    l_unknown_accounts  = pd.merge(tr_from, tr_to, how="outer")
+    l_unknown_accounts  = pd.DataFrame({"path": unknown})
 
     return l_unknown_accounts, tr_unknown_accounts
 
 
 # ┌────────────────────────────────────────┐
-# │ Input/Output                           │
+# │ Account types classification           │
 # └────────────────────────────────────────┘
 
-def input(df, df_accounts, account_names: str):
+# Small integer code for each account type, UNKNOWN for undefined accounts
+TYPE_CODES = {tt: i for i, tt in enumerate(Account_Type)}
+UNKNOWN    = len(TYPE_CODES)
+
+
+def account_type_codes(df_accounts, slugs):
     """
-    List transactions that add money to the given accounts
+    Map account slugs to account type codes, with a single hash lookup
+    in the accounts index. Returns a numpy array of codes
     """
+    acc_codes = df_accounts["type"].map(TYPE_CODES).fillna(UNKNOWN).to_numpy(dtype="int8")
+    acc_codes = np.append(acc_codes, np.int8(UNKNOWN)) # Position -1: not found
 
-    accs = account_names
-    if isinstance(accs, str):
-        accs = [accs]
+    # Categorical slugs only need to be looked up once per category
+    slugs = pd.Series(slugs)
+    if isinstance(slugs.dtype, pd.CategoricalDtype):
+        cat_codes = acc_codes[df_accounts.index.get_indexer(slugs.cat.categories)]
+        cat_codes = np.append(cat_codes, np.int8(UNKNOWN)) # NaN values
+        return cat_codes[slugs.cat.codes.to_numpy()]
 
-    if df_accounts is None:
-        return df.loc[df["target"].isin(accs)]
     else:
-        df_from = df_accounts.loc[df["origin"]].reset_index()
-        return df.loc[df["target"].isin(accs) & (df_from["type"] == Account_Type.Income)]
+        return acc_codes[df_accounts.index.get_indexer(slugs)]
 
 
-def output(df, df_accounts, account_names: str):
+@dataclass
+class Classification:
     """
-    List transactions that retrieve money from the given accounts
+    Type codes of the origin and target accounts of each transaction
     """
 
+    origin: "np.ndarray"
+    target: "np.ndarray"
+
+    def origin_is(self, *types):
+        return np.isin(self.origin, [TYPE_CODES[x] for x in types])
+
+    def target_is(self, *types):
+        return np.isin(self.target, [TYPE_CODES[x] for x in types])
+
+    @property
+    def income(self):
+        return self.origin == TYPE_CODES[Account_Type.Income]
+
+    @property
+    def outcome(self):
+        return self.target == TYPE_CODES[Account_Type.Outcome]
+
+    @property
+    def transfer(self):
+        """
+        Transactions between balance sheet accounts (assets, liabilities, equity)
+        """
+        balance = (Account_Type.Assets, Account_Type.Liabilities, Account_Type.Equity)
+        return self.origin_is(*balance) & self.target_is(*balance)
+
+    @property
+    def external(self):
+        """
+        Transactions involving at least one undefined account
+        """
+        return (self.origin == UNKNOWN) | (self.target == UNKNOWN)
+
+
+def classify(df, df_accounts):
+    """
+    Classify the transactions from the types of their origin and target
+    accounts
+    """
+    return Classification(
+        origin = account_type_codes(df_accounts, df["origin"]),
+        target = account_type_codes(df_accounts, df["target"])
+    )
+
+
+# ┌────────────────────────────────────────┐
+# │ Input/Output                           │
+# └────────────────────────────────────────┘
+
+def _in_accounts(column, account_names):
     accs = account_names
     if isinstance(accs, str):
         accs = [accs]
-    
-    if df_accounts is None:
-        return df.loc[df["origin"].isin(accs)]
-    else:
-        df_to = df_accounts.loc[df["target"]].reset_index()
-        return df.loc[df["origin"].isin(accs) & (df_to["type"] == Account_Type.Outcome)]
+
+    return column.isin(accs).to_numpy()
+
+
+def input(df, df_accounts, account_names: str, classification=None):
+    """
+    List transactions that add money to the given accounts
+    """
+
+    mask = _in_accounts(df["target"], account_names)
+
+    if df_accounts is not None:
+        classification = classification or classify(df, df_accounts)
+        mask           = mask & classification.income
+
+    return df.loc[mask]
+
+
+def output(df, df_accounts, account_names: str, classification=None):
+    """
+    List transactions that retrieve money from the given accounts
+    """
+
+    mask = _in_accounts(df["origin"], account_names)
+
+    if df_accounts is not None:
+        classification = classification or classify(df, df_accounts)
+        mask           = mask & classification.outcome
+
+    return df.loc[mask]
+
+
+def transfers(df, df_accounts, account_names: str, classification=None):
+    """
+    List transfers between balance sheet accounts involving the given accounts
+    """
+
+    mask = _in_accounts(df["origin"], account_names) | _in_accounts(df["target"], account_names)
+
+    classification = classification or classify(df, df_accounts)
+    mask           = mask & classification.transfer
+
+    return df.loc[mask]
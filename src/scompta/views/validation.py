@@ -0,0 +1,190 @@
+"""
+┌─────────────────────────┐
+│ Ledger integrity checks │
+└─────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+import logging
+import re
+
+from dataclasses import dataclass, field, asdict
+from typing      import Optional
+
+from scompta.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+log = logging.getLogger(__file__)
+
+# Accounts left by the importers, to be replaced by the user
+PLACEHOLDERS = frozenset(("<ORIGIN>", "<TARGET>"))
+
+RE_CURRENCY  = re.compile(r"^[A-Z]{3}$")
+
+
+# ┌────────────────────────────────────────┐
+# │ Validation results                     │
+# └────────────────────────────────────────┘
+
+@dataclass
+class Validation_Issue:
+    kind:    str # unknown_account, placeholder, bad_currency, missing_field
+    column:  str
+    value:   Optional[str]
+    rows:    list = field(default_factory=list)
+
+    @property
+    def message(self):
+        if self.kind == "unknown_account":
+            return f"Unknown account '{self.value}' in {self.column}"
+        elif self.kind == "placeholder":
+            return f"Placeholder account '{self.value}' in {self.column}"
+        elif self.kind == "bad_currency":
+            return f"Invalid currency '{self.value}'"
+        else:
+            return f"Missing field {self.column}"
+
+
+@dataclass
+class Validation_Result:
+    issues: list = field(default_factory=list)
+
+    @property
+    def ok(self):
+        return not self.issues
+
+    def to_dict(self):
+        return {
+            "ok":     self.ok,
+            "issues": [dict(asdict(x), message=x.message) for x in self.issues]
+        }
+
+
+# ┌────────────────────────────────────────┐
+# │ Validator                              │
+# └────────────────────────────────────────┘
+
+class Ledger_Validator:
+    """
+    Checks transactions against the set of known account slugs. Whole
+    DataFrames are checked in one vectorized pass, single records with
+    a few set lookups.
+
+    If currencies is None, any 3 upper case letters code is accepted.
+    """
+
+    def __init__(self, slugs=(), currencies=None):
+        self.slugs      = frozenset(slugs)
+        self.currencies = frozenset(currencies) if currencies is not None else None
+        self.generation = None
+
+    @classmethod
+    def from_accounts(cls, df_accounts, currencies=None):
+        return cls(df_accounts.index, currencies=currencies)
+
+    # ──────────────── Refresh ─────────────── #
+
+    def refresh(self, df_accounts, generation=None):
+        self.slugs      = frozenset(df_accounts.index)
+        self.generation = generation
+
+    def refresh_from_index(self, index, max_age=None):
+        """
+        Refresh known slugs from an accounts.Account_Index, if it changed.
+        max_age is passed to index.refresh()
+        """
+        index.refresh(max_age)
+        if index.generation != self.generation:
+            self.refresh(index.load(max_age), index.generation)
+
+    # ──────────────── Helpers ─────────────── #
+
+    def _currency_ok(self, currency):
+        if self.currencies is not None:
+            return currency in self.currencies
+        else:
+            return isinstance(currency, str) and RE_CURRENCY.match(currency) is not None
+
+    def _account_issue(self, column, value):
+        if value in PLACEHOLDERS:
+            return "placeholder"
+        elif value not in self.slugs:
+            return "unknown_account"
+        else:
+            return None
+
+    # ──────────────── Checks ──────────────── #
+
+    def check_record(self, record, row=None):
+        """
+        Check a single transaction record (dict or Transaction)
+        """
+        if not isinstance(record, dict):
+            record = {x: getattr(record, x, None) for x in ("origin", "target", "amount")}
+
+        result = Validation_Result()
+
+        for column in ("origin", "target", "amount"):
+            if record.get(column, None) is None:
+                result.issues.append(Validation_Issue("missing_field", column, None, [row]))
+
+        for column in ("origin", "target"):
+            value = record.get(column, None)
+            if value is None:
+                continue
+
+            kind = self._account_issue(column, value)
+            if kind is not None:
+                result.issues.append(Validation_Issue(kind, column, value, [row]))
+
+        amount = record.get("amount", None)
+        if amount is not None and not self._currency_ok(amount.currency):
+            result.issues.append(Validation_Issue("bad_currency", "amount", amount.currency, [row]))
+
+        return result
+
+    def check_records(self, records):
+        """
+        Check a list of records, issues refer to the positions in the list
+        """
+        result = Validation_Result()
+        for i, record in enumerate(records):
+            result.issues += self.check_record(record, row=i).issues
+
+        return result
+
+    def check_frame(self, df: "pd.DataFrame"):
+        """
+        Check a transactions DataFrame (Money or columnar amounts). Issues
+        refer to the DataFrame index labels
+        """
+        result = Validation_Result()
+
+        for column in ("origin", "target"):
+            col = df[column]
+
+            missing = col.isna()
+            if missing.any():
+                result.issues.append(Validation_Issue("missing_field", column, None, df.index[missing.to_numpy()].tolist()))
+
+            # Only distinct values are looked up
+            for value in set(col.dropna().unique()):
+                kind = self._account_issue(column, value)
+                if kind is not None:
+                    rows = df.index[(col == value).to_numpy()].tolist()
+                    result.issues.append(Validation_Issue(kind, column, str(value), rows))
+
+        if "currency" in df.columns:
+            currencies = df["currency"]
+        else:
+            currencies = df["amount"].map(lambda x: getattr(x, "currency", None))
+
+        for value in set(currencies.dropna().unique()):
+            if not self._currency_ok(value):
+                rows = df.index[(currencies == value).to_numpy()].tolist()
+                result.issues.append(Validation_Issue("bad_currency", "amount", str(value), rows))
+
+        return result
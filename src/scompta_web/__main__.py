@@ -11,19 +11,38 @@ import logging
 import numpy
 import pandas as pd
 
+import asyncio
+import json
+import re
+import sys
+import time
 import traceback
 import toml
 
 from   aiohttp     import web
 import aiohttp_cors
 
-from   scompta     import transactions, accounts, periods
+from   scompta.db  import transactions, accounts, periods
+from   scompta.db  import cache
+from   scompta.db  import search
+from   scompta.db  import catalog
+from   scompta.db  import reports
+from   scompta.db  import journal
+from   scompta.db  import snapshot
+
+from   scompta.views.validation import Ledger_Validator
+from   scompta.views.query      import Period_Index, Transaction_Query
 from   dataclasses import dataclass, asdict
 
 from   pathlib     import Path
 from   functools   import partial
+from   collections import defaultdict
+from   itertools   import groupby
+
+from   concurrent.futures import ThreadPoolExecutor
 
 from   money       import Money
+from   decimal     import Decimal
 
 # ┌────────────────────────────────────────┐
 # │ Instanciate logger                     │
@@ -31,6 +50,12 @@ from   money       import Money
 
 log = logging.getLogger(__file__)
 
+RE_PERIOD = re.compile(r"^\d{4}-\d{2}$")
+
+# Seconds between two walks of the accounts folder when validating writes.
+# Accounts created through the API are seen immediately.
+ACCOUNTS_MAX_AGE = 5.0
+
 
 # ┌────────────────────────────────────────┐
 # │ Config dataclass                       │
@@ -38,19 +63,37 @@ log = logging.getLogger(__file__)
 
 @dataclass
 class SComptaWeb_Config:
-    dir_accounts: Path
-    dir_periods:  Path
+    dir_accounts:   Path
+    dir_periods:    Path
+
+    cache_max_size: int = 64 * 1024 * 1024
+
+    workers:        int = 4
+    queue_limit:    int = 64
+
+    compact_interval: float = 2.0
 
     @classmethod
     def from_dict(cls, data):
+        cache_info   = data.get("cache",   {})
+        server_info  = data.get("server",  {})
+        journal_info = data.get("journal", {})
+
         return cls(
-            dir_accounts = Path(data["directories"]["accounts"]),
-            dir_periods  = Path(data["directories"]["periods" ])
+            dir_accounts   = Path(data["directories"]["accounts"]),
+            dir_periods    = Path(data["directories"]["periods" ]),
+
+            cache_max_size = int(cache_info.get("max_size_mb", 64)) * 1024 * 1024,
+
+            workers        = int(server_info.get("workers",     4 )),
+            queue_limit    = int(server_info.get("queue_limit", 64)),
+
+            compact_interval = float(journal_info.get("compact_interval", 2.0))
         )
 
 
 # ┌────────────────────────────────────────┐
-# │ Transactions endpoints                 │
+# │ API errors                             │
 # └────────────────────────────────────────┘
 
 class API_Error(Exception):
@@ -62,22 +105,250 @@ class API_Error(Exception):
         self.error_code = error_code
 
 
+def require_fields(data, names, what):
+    """
+    Check the given fields are in the JSON object data, raise a 400
+    API_Error naming the missing ones otherwise
+    """
+    if not isinstance(data, dict):
+        raise API_Error(f"Expected an object as {what}", 400)
+
+    missing = [x for x in names if x not in data]
+    if missing:
+        raise API_Error(f"Missing field{'s' if len(missing) > 1 else ''} in {what}: {', '.join(missing)}", 400)
+
+    return data
+
+
+# ┌────────────────────────────────────────┐
+# │ Blocking calls executor                │
+# └────────────────────────────────────────┘
+
+class Blocking_Executor:
+    """
+    Runs blocking calls (pandas, file I/O) in a bounded thread pool,
+    so they don't stall the event loop. When queue_limit calls are already
+    pending, new calls are rejected with a 503 error.
+    """
+
+    def __init__(self, workers, queue_limit):
+        self.pool        = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scompta")
+        self.queue_limit = queue_limit
+
+        # Only modified from the event loop thread
+        self.pending     = 0
+
+    async def run(self, fn, *args, **kwargs):
+        if self.pending >= self.queue_limit:
+            raise API_Error("Server busy, try again later", 503)
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, partial(fn, *args, **kwargs))
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True)
+
+
+@web.middleware
+async def timing_middleware(request, handler):
+    """
+    Log each request's duration, and report it in a Server-Timing header
+    """
+    start    = time.perf_counter()
+    response = await handler(request)
+    elapsed  = (time.perf_counter() - start) * 1000
+
+    # Streamed responses have already sent their headers
+    if not response.prepared:
+        response.headers["Server-Timing"] = f"total;dur={elapsed:.1f}"
+
+    log.info(f"{request.method} {request.path} -> {response.status} in {elapsed:.1f} ms")
+
+    return response
+
+
+# ┌────────────────────────────────────────┐
+# │ Conditional requests                   │
+# └────────────────────────────────────────┘
+
+def etag_matches(if_none_match, etag):
+    """
+    True if the If-None-Match header value matches the given ETag, with
+    the weak comparison of RFC 7232
+    """
+    if if_none_match is None:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    def opaque(tag):
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    return any(opaque(x) == opaque(etag) for x in if_none_match.split(","))
+
+
+# ┌────────────────────────────────────────┐
+# │ Period views                           │
+# └────────────────────────────────────────┘
+
+class Period_View:
+    """
+    Everything the endpoints derive from one version of a period file:
+    stable IDs, JSON-encoded rows, whole period JSON body and query index.
+    Built from the same DataFrame, so positions in one match the others.
+    """
+
+    def __init__(self, df_tr, ids, version):
+        self.ids     = ids
+        self.version = version # File_Version the rows were read from
+        self.index   = Period_Index(df_tr)
+
+        df_tr.insert(0, "id", ids)
+        df_tr["amount"] = df_tr["amount"].transform(lambda x: {"currency": x.currency, "amount": str(x.amount)})
+
+        # DataFrame with NaN columns as None
+        df_tr      = df_tr.replace({numpy.nan: None})
+
+        self.rows  = [json.dumps(x).encode("utf-8") for x in df_tr.to_dict(orient="records")]
+        self.json  = b'{"data": [' + b", ".join(self.rows) + b']}'
+
+    def __sizeof__(self):
+        return sys.getsizeof(self.ids) + sys.getsizeof(self.index) + len(self.json) \
+             + sys.getsizeof(self.rows) + sum(len(x) for x in self.rows)
+
+
+# ┌────────────────────────────────────────┐
+# │ Transactions endpoints                 │
+# └────────────────────────────────────────┘
+
 class API_Transactions_Handler:
-    def __init__(self, config):
-        self.config = config
+    def __init__(self, config, executor, accounts_index, journals):
+        self.config         = config
+        self.executor       = executor
+        self.accounts_index = accounts_index
+        self.validator      = Ledger_Validator()
+        self.cache          = cache.Period_Cache(max_bytes=config.cache_max_size)
+        self.labels         = search.Label_Index(config.dir_periods)
+        self.catalog        = catalog.Period_Catalog(config.dir_periods, accounts_index)
+
+        # Changes are journaled, then applied to the transactions files
+        # by compaction. Concurrent commits to a period share one fsync.
+        # Transactions have stable IDs, deletes are tombstones until the
+        # next compaction.
+        self.journals       = journals
 
     # ──────────────── Helpers ─────────────── #
     
     def _transactions_path_for_period(self, period):
         return self.config.dir_periods / period / "transactions.csv"
 
+    def _sync_transactions_period(self, period):
+        # Apply journaled appends and patches before reading the period,
+        # deleted rows are filtered out with the tombstones
+        period_journal = self.journals[period]
+        if period_journal.needs_compaction:
+            period_journal.compact()
+
     def _load_transactions_period(self, period):
+        self._sync_transactions_period(period)
+
+        transactions_path = self._transactions_path_for_period(period)
+
+        if not transactions_path.exists():
+            raise FileNotFoundError()
+
+        return self.cache.load(transactions_path)
+
+    def _view_transactions_period(self, period):
+        """
+        Period_View of the current version of the transactions file
+        """
+        self._sync_transactions_period(period)
+
+        transactions_path = self._transactions_path_for_period(period)
+
+        if not transactions_path.exists():
+            raise FileNotFoundError()
+
+        def build(df_tr, version):
+            ids = self.journals[period].row_ids()
+            if len(ids) != len(df_tr):
+                raise RuntimeError(f"Transactions of {period} changed while reading them")
+
+            return Period_View(df_tr, ids, version)
+
+        return self.cache.derived(transactions_path, "view", build)
+
+    def _live_rows_transactions_period(self, period):
+        """
+        JSON-encoded rows without the deleted transactions
+        """
+        # Read before the rows: a compaction in between only folds them
+        tombstones = self.journals[period].tombstones
+        view       = self._view_transactions_period(period)
+
+        if not tombstones:
+            return view.rows
+
+        return [row for row, tr_id in zip(view.rows, view.ids) if tr_id not in tombstones]
+
+    def _etag_transactions_period(self, period):
+        self._sync_transactions_period(period)
+
         transactions_path = self._transactions_path_for_period(period)
 
         if not transactions_path.exists():
             raise FileNotFoundError()
 
-        return transactions.load(transactions_path)
+        # Deletes change the journal, not the file
+        version = self.cache.version(transactions_path)
+        seq     = self.journals[period].seq
+        return f"{version.mtime_ns:x}-{version.size:x}-{version.inode:x}-{seq:x}"
+
+    def _query_transactions(self, query, offset, limit):
+        """
+        Run the query over the periods in its date range. Returns the
+        JSON rows of the requested page and the total number of matches.
+        """
+        l_periods = [x.name for x in periods.list_from_dir(self.config.dir_periods)]
+        matches   = []
+
+        for period in query.periods(l_periods):
+            if not self._transactions_path_for_period(period).exists():
+                continue
+
+            # Positions, IDs and rows of the same file version
+            tombstones = self.journals[period].tombstones
+            view       = self._view_transactions_period(period)
+            positions  = view.index.select(query, period)
+
+            if tombstones and len(positions):
+                positions = [i for i in positions if view.ids[i] not in tombstones]
+
+            if len(positions):
+                matches.append((view, period, positions))
+
+        total = sum(len(x) for _, _, x in matches)
+
+        # Only the rows of the page are encoded
+        rows  = []
+        end   = total if limit is None else offset + limit
+        start = 0
+        for view, period, positions in matches:
+            page = positions[max(offset - start, 0):max(end - start, 0)]
+            if len(page):
+                prefix = b'{"period": ' + json.dumps(period).encode("utf-8") + b", "
+                rows  += [prefix + view.rows[i][1:] for i in page]
+
+            start += len(positions)
+
+        return rows, total
 
     def _create_transactions_period(self, period):
         log.info(f"Create period {period}")
@@ -86,31 +357,123 @@ class API_Transactions_Handler:
         path_dir = (path_csv / "../").resolve()
 
         log.debug(f"Create directory {path_dir}")
-        path_dir.mkdir(mode=511)
+        path_dir.mkdir(mode=511, exist_ok=True)
 
         # Touch transactions.csv
         log.debug(f"Touch transactions.csv file")
         transactions.create(path_csv)
 
+    RECORD_FIELDS = ("day", "label", "from", "to", "amount")
+
+    @classmethod
+    def _amount_from_json(cls, data):
+        require_fields(data, ("value", "currency"), "amount")
+        return Money(data["value"], data["currency"])
+
+    @classmethod
+    def _record_from_json(cls, data):
+        require_fields(data, cls.RECORD_FIELDS, "transaction")
+
+        return {
+            "day":    data["day"],
+            "time":   data.get("time", None),
+            "label":  data["label"],
+            "origin": data["from"],
+            "target": data["to"],
+            "amount": cls._amount_from_json(data["amount"]),
+            "tag":    data.get("tag", None)
+        }
+
+    def _validate_records(self, records):
+        # Known accounts are only reloaded when account files changed
+        self.validator.refresh_from_index(self.accounts_index, max_age=ACCOUNTS_MAX_AGE)
+        return self.validator.check_records(records)
+
+    def _prepare_periods(self, periods):
+        # Create transactions files if not found
+        for period in periods:
+            if not self._transactions_path_for_period(period).exists():
+                self._create_transactions_period(period)
+
+    def _append_transactions_period(self, period, records):
+        self._prepare_periods([period])
+
+        # Journaled, applied to the file by compaction. Returns the new IDs
+        return self.journals[period].commit([{"op": "append", "records": records}])
+
+    def _check_transaction_ids(self, period, tr_ids):
+        if not self._transactions_path_for_period(period).exists():
+            raise FileNotFoundError()
+
+        period_journal = self.journals[period]
+        for tr_id in tr_ids:
+            if not period_journal.exists(tr_id):
+                raise API_Error(f"Transaction {tr_id} not found in {period}", 404)
+
+        return period_journal
+
+    def _delete_transactions_period(self, period, tr_ids):
+        # Only a tombstone, the row is removed by the next compaction
+        self._check_transaction_ids(period, tr_ids).commit([{"op": "delete", "ids": tr_ids}])
+
+    def _patch_transactions_period(self, period, tr_id, fields):
+        self._check_transaction_ids(period, [tr_id]).commit([{"op": "patch", "id": tr_id, "fields": fields}])
+
 
     # ─────────────── GET stuff ────────────── #
 
     async def all_get(self, request):
+        """
+        Query parameters:
+            - offset [Optional]: index of the first transaction
+            - limit  [Optional]: maximum number of transactions
+            - format [Optional]: "ndjson" to stream one transaction per line
+        """
         try:
             # Extract period
             period = request.match_info["period"]
 
+            # Paging parameters
+            try:
+                offset = int(request.query.get("offset", 0))
+                limit  = int(request.query["limit"]) if "limit" in request.query else None
+            except ValueError as exc:
+                raise API_Error(f"Invalid paging parameter: {exc!s}", 400)
+
+            if offset < 0 or (limit is not None and limit < 0):
+                raise API_Error("Paging parameters must be positive", 400)
+
+            ndjson = (request.query.get("format", None) == "ndjson") \
+                  or ("application/x-ndjson" in request.headers.get("Accept", ""))
+
+            # Unchanged period: nothing to load. Each representation and
+            # page has its own tag.
+            version = await self.executor.run(self._etag_transactions_period, period)
+            etag    = f'"{version}-{"ndjson" if ndjson else "json"}-{offset:x}-{"" if limit is None else f"{limit:x}"}"'
+            headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+
+            if etag_matches(request.headers.get("If-None-Match", None), etag):
+                return web.Response(status=304, headers=headers)
+
+            # Whole period, cached body is only valid without deleted rows
+            if not ndjson and offset == 0 and limit is None and not self.journals[period].tombstones:
+                view = await self.executor.run(self._view_transactions_period, period)
+                body = view.json
+                return web.Response(body=body, status=200, content_type="application/json", headers=headers)
+
             # Load period's transactions
-            df_tr = self._load_transactions_period(period)
-            df_tr["amount"] = df_tr["amount"].transform(lambda x: {"currency": x.currency, "amount": str(x.amount)})
+            rows  = await self.executor.run(self._live_rows_transactions_period, period)
+            total = len(rows)
+            rows  = rows[offset:] if limit is None else rows[offset:offset + limit]
 
-            # DataFrame with NaN columns as None
-            df_tr   = df_tr.replace({numpy.nan: None})
+            if ndjson:
+                return await self._stream_rows(request, rows, headers)
 
-            # Transform to dict
-            dict_tr = df_tr.to_dict(orient="records")
+            else:
+                body = b'{"data": [' + b", ".join(rows) + b'], ' \
+                     + json.dumps({"offset": offset, "limit": limit, "total": total})[1:].encode("utf-8")
 
-            return web.json_response({"data": dict_tr}, status=200)
+                return web.Response(body=body, status=200, content_type="application/json", headers=headers)
 
         except API_Error as exc:
             return web.json_response({
@@ -129,9 +492,171 @@ class API_Transactions_Handler:
                 "traceback": traceback.format_exc().split("\n")
             }, status=500)
 
+    async def query_get(self, request):
+        """
+        Query parameters, all optional:
+            - account:  account slug, matching origin or target
+            - subtree:  "true" to include the accounts below account
+            - tag
+            - from, to: YYYY-MM-DD or YYYY-MM dates, included
+            - min, max: amount range
+            - currency
+            - label:    case insensitive substring of the label
+            - offset, limit: paging
+        """
+        try:
+            try:
+                query = Transaction_Query(
+                    account    = request.query.get("account",  None),
+                    subtree    = request.query.get("subtree",  "false").lower() in ("1", "true", "yes"),
+                    tag        = request.query.get("tag",      None),
+                    date_from  = request.query.get("from",     None),
+                    date_to    = request.query.get("to",       None),
+                    amount_min = Decimal(request.query["min"]) if "min" in request.query else None,
+                    amount_max = Decimal(request.query["max"]) if "max" in request.query else None,
+                    currency   = request.query.get("currency", None),
+                    label      = request.query.get("label",    None),
+                )
+
+                # Check dates before doing anything
+                query.periods([])
+
+                offset = int(request.query.get("offset", 0))
+                limit  = int(request.query["limit"]) if "limit" in request.query else None
+
+            except (ValueError, ArithmeticError) as exc:
+                raise API_Error(f"Invalid query parameter: {exc!s}", 400)
+
+            if offset < 0 or (limit is not None and limit < 0):
+                raise API_Error("Paging parameters must be positive", 400)
+
+            rows, total = await self.executor.run(self._query_transactions, query, offset, limit)
+
+            body = b'{"data": [' + b", ".join(rows) + b'], ' \
+                 + json.dumps({"offset": offset, "limit": limit, "total": total})[1:].encode("utf-8")
+
+            return web.Response(body=body, status=200, content_type="application/json")
+
+        except API_Error as exc:
+            return web.json_response({
+                "error": f"Could not query transactions: {exc!s}",
+                "traceback": traceback.format_exc().split("\n")
+            }, status=exc.error_code)
+
+        except Exception as exc:
+            return web.json_response({
+                "error": f"Could not query transactions: {exc!s}",
+                "traceback": traceback.format_exc().split("\n")
+            }, status=500)
+
+    def _search_labels(self, text, prefix, attempts=3):
+        for _ in range(attempts):
+            # Only modified periods are indexed again
+            self.journals.compact_pending()
+            self.labels.refresh()
+
+            positions, versions = self.labels.search_versions(text, prefix=prefix)
+
+            # Row positions to stable IDs, only valid for the indexed version
+            hits = []
+            for period, rows in groupby(positions, key=lambda x: x[0]):
+                view = self._view_transactions_period(period)
+                if snapshot.version_of(view.version) != versions[period]:
+                    break
+
+                hits += [(period, view.ids[row]) for _, row in rows]
+
+            else:
+                return hits
+
+            log.info(f"Transactions of {period} changed while searching, retry")
+
+        raise API_Error("Transactions changed while searching, try again", 503)
+
+    async def search_get(self, request):
+        """
+        Query parameters:
+            - q:      words to find in labels and tags
+            - prefix [Optional]: "false" to only match whole words
+            - offset, limit [Optional]: paging
+        """
+        try:
+            text   = request.query.get("q", "")
+            prefix = request.query.get("prefix", "true").lower() not in ("0", "false", "no")
+
+            try:
+                offset = int(request.query.get("offset", 0))
+                limit  = int(request.query["limit"]) if "limit" in request.query else None
+            except ValueError as exc:
+                raise API_Error(f"Invalid paging parameter: {exc!s}", 400)
+
+            if offset < 0 or (limit is not None and limit < 0):
+                raise API_Error("Paging parameters must be positive", 400)
+
+            hits  = await self.executor.run(self._search_labels, text, prefix)
+            total = len(hits)
+            hits  = hits[offset:] if limit is None else hits[offset:offset + limit]
+
+            return web.json_response({
+                "data":   [{"period": period, "id": tr_id} for period, tr_id in hits],
+                "offset": offset,
+                "limit":  limit,
+                "total":  total
+            })
+
+        except API_Error as exc:
+            return web.json_response({
+                "error": f"Could not search transactions: {exc!s}",
+                "traceback": traceback.format_exc().split("\n")
+            }, status=exc.error_code)
+
+        except Exception as exc:
+            return web.json_response({
+                "error": f"Could not search transactions: {exc!s}",
+                "traceback": traceback.format_exc().split("\n")
+            }, status=500)
+
+    async def _stream_rows(self, request, rows, headers, chunk_size=1000):
+        response = web.StreamResponse(status=200, headers=headers)
+        response.content_type = "application/x-ndjson"
+        response.enable_chunked_encoding()
+
+        await response.prepare(request)
+
+        for i in range(0, len(rows), chunk_size):
+            await response.write(b"\n".join(rows[i:i + chunk_size]) + b"\n")
+
+        await response.write_eof()
+
+        return response
+
+    def _periods_catalog(self):
+        # Only modified periods are read again
+        self.journals.compact_pending()
+        self.catalog.refresh()
+
+        # Periods without transactions file are listed, without summary
+        l_periods = sorted(x.name for x in periods.list_from_dir(self.config.dir_periods))
+        return l_periods, self.catalog.to_dict()
+
     async def periods_get(self, request):
+        """
+        Response:
+            - periods:   list of period names
+            - summaries: per period number of transactions, first and last
+                         day, and per currency totals (see scompta.db.catalog),
+                         for the periods with a transactions file
+        """
         try:
-            return web.json_response({"periods": list(map(lambda x: x.name, periods.list_from_dir(self.config.dir_periods)))})
+            l_periods, summaries = await self.executor.run(self._periods_catalog)
+            return web.json_response({"periods": l_periods, "summaries": summaries})
+
+        except API_Error as exc:
+            return web.json_response({
+                "error": f"Could not get list of periods: {exc!s}",
+                "traceback": traceback.format_exc().split("\n")
+            }, status=exc.error_code)
+
         except Exception as exc:
             return web.json_response({
                 "error": f"Could not get list of periods: {exc!s}",
@@ -158,57 +683,214 @@ class API_Transactions_Handler:
         try:
             data = await request.json()
 
-            # Load transactions or create if not found
             period = request.match_info["period"]
-            
-            try:
-                df_tr  = self._load_transactions_period(period)
-            except FileNotFoundError as exc:
-                self._create_transactions_period(period)
-                df_tr  = self._load_transactions_period(period)
-
 
             # Build entry record
-            record = {
-                "day":   data["day"],
-                "time":  data.get("time", None),
-                "label": data["label"],
-                "from":  data["from"],
-                "to":    data["to"],
-                "amount": Money(data["amount"]["value"], data["amount"]["currency"]),
-                "tag":   data.get("tag", None)
-            }
-
-            # Add entry record to dataframe
-            df_tr = pd.concat([df_tr, pd.DataFrame.from_records([record])])
-
-            # Save transactions!
-            transactions.save(self._transactions_path_for_period(period), df_tr)
+            record = self._record_from_json(data)
+
+            # Check accounts and currency before writing anything
+            validation = await self.executor.run(self._validate_records, [record])
+            if not validation.ok:
+                return web.json_response({
+                    "error": "Invalid transaction",
+                    **validation.to_dict()
+                }, status=400)
+
+            new_ids = await self.executor.run(self._append_transactions_period, period, [record])
 
             # Return 200 response
-            return web.json_response({}, status=200)
+            return web.json_response({"id": new_ids[0]}, status=200)
+
+        except API_Error as exc:
+            return web.json_response({
+                "error": f"Could not post transaction: {exc!s}",
+                "traceback": traceback.format_exc().split("\n")
+            }, status=exc.error_code)
 
-        except KeyError  as exc:
+        except FileNotFoundError as exc:
             return web.json_response({
-                "error": f"Missing field '{exc!s}'",
+                "error": f"Could not post transaction: {exc!s}",
+                "traceback": traceback.format_exc().split("\n")
+            }, status=404)
+
+        except Exception as exc:
+            return web.json_response({
+                "error": f"Could not post transaction: {exc!s}",
                 "traceback": traceback.format_exc().split("\n")
             }, status=500)
 
+
+    async def batch_post(self, request):
+        """
+        Post data: list of transactions (or {"transactions": [...]}), with
+        the same fields as post() plus their period. All the records are
+        checked and the period files created before writing anything, then
+        each period is written once.
+
+        Periods are separate journals, so the batch is only atomic per
+        period: if a period write fails, the other periods are still
+        written.
+
+        Response: one result per record, in the same order, with its "ok"
+        status. Status is 200 if every record was written, 207 if only some
+        periods were, 500 if none was.
+        """
+        try:
+            data = await request.json()
+            if isinstance(data, dict):
+                data = data.get("transactions", None)
+
+            if not isinstance(data, list):
+                raise API_Error("Expected a list of transactions", 400)
+
+            # Parse all the records first
+            results = [{"index": i, "ok": True, "errors": []} for i in range(len(data))]
+            records = []
+
+            for i, item in enumerate(data):
+                try:
+                    period = require_fields(item, ("period",), "transaction")["period"]
+                    if not RE_PERIOD.match(str(period)):
+                        raise ValueError(f"Invalid period name: {period}")
+
+                    results[i]["period"] = period
+                    records.append(self._record_from_json(item))
+
+                except Exception as exc:
+                    results[i]["errors"].append(str(exc))
+                    records.append(None)
+
+            # Check accounts and currencies of the parsed ones
+            parsed     = [i for i, x in enumerate(records) if x is not None]
+            validation = await self.executor.run(self._validate_records, [records[i] for i in parsed])
+
+            for issue in validation.issues:
+                for row in issue.rows:
+                    results[parsed[row]]["errors"].append(issue.message)
+
+            for result in results:
+                result["ok"] = not result["errors"]
+
+            if not all(x["ok"] for x in results):
+                return web.json_response({
+                    "error":   "Invalid transactions, nothing was written",
+                    "results": results
+                }, status=400)
+
+            # Group by period, keeping the records order
+            by_period = defaultdict(list)
+            for result, record in zip(results, records):
+                by_period[result["period"]].append((result, record))
+
+            # Failures that don't depend on the written data happen before any write
+            try:
+                await self.executor.run(self._prepare_periods, list(by_period))
+            except Exception as exc:
+                raise API_Error(f"nothing was written, {exc!s}", 500)
+
+            async def write_period(period, items):
+                try:
+                    new_ids = await self.executor.run(self._append_transactions_period, period, [x for _, x in items])
+                    for (result, _), tr_id in zip(items, new_ids):
+                        result["id"] = tr_id
+
+                except Exception as exc:
+                    log.error(f"Could not write transactions of {period}: {exc!s}")
+                    for result, _ in items:
+                        result["ok"] = False
+                        result["errors"].append(f"Could not write period {period}: {exc!s}")
+
+            # Periods are different files, they can be written concurrently
+            await asyncio.gather(*(write_period(period, items) for period, items in by_period.items()))
+
+            written = sum(1 for x in results if x["ok"])
+            if written == len(results):
+                status = 200
+            elif written:
+                status = 207
+            else:
+                status = 500
+
+            return web.json_response({
+                "written": written,
+                "results": results
+            }, status=status)
+
         except API_Error as exc:
             return web.json_response({
-                "error": f"Could not post transaction: {exc!s}",
+                "error": f"Could not post transactions: {exc!s}",
+                "traceback": traceback.format_exc().split("\n")
+            }, status=exc.error_code)
+
+        except Exception as exc:
+            return web.json_response({
+                "error": f"Could not post transactions: {exc!s}",
+                "traceback": traceback.format_exc().split("\n")
+            }, status=500)
+
+
+    # ─────────── PATCH transaction ────────── #
+
+    PATCH_FIELDS = {"day": "day", "time": "time", "label": "label", "from": "origin", "to": "target", "tag": "tag"}
+
+    @classmethod
+    def _fields_from_json(cls, data):
+        if not isinstance(data, dict):
+            raise API_Error("Expected an object of fields", 400)
+
+        unknown = set(data) - set(cls.PATCH_FIELDS) - {"amount"}
+        if unknown:
+            raise API_Error(f"Unknown fields: {', '.join(sorted(unknown))}", 400)
+
+        fields = {cls.PATCH_FIELDS[x]: value for x, value in data.items() if x in cls.PATCH_FIELDS}
+        if "amount" in data:
+            fields["amount"] = cls._amount_from_json(data["amount"])
+
+        if not fields:
+            raise API_Error("No fields to change", 400)
+
+        return fields
+
+    async def patch(self, request):
+        """
+        Patch data: any of the post() fields, only those are changed
+        """
+        period = None
+
+        try:
+            period = request.match_info["period"]
+            tr_id  = int(request.match_info["id"])
+            fields = self._fields_from_json(await request.json())
+
+            # Only the given fields are checked
+            validation = await self.executor.run(self._validate_records, [fields])
+            validation.issues = [x for x in validation.issues if x.kind != "missing_field"]
+
+            if not validation.ok:
+                return web.json_response({
+                    "error": "Invalid transaction",
+                    **validation.to_dict()
+                }, status=400)
+
+            await self.executor.run(self._patch_transactions_period, period, tr_id, fields)
+
+            return web.json_response({"id": tr_id}, status=200)
+
+        except API_Error as exc:
+            return web.json_response({
+                "error": f"Could not patch transaction: {exc!s}",
                 "traceback": traceback.format_exc().split("\n")
             }, status=exc.error_code)
 
         except FileNotFoundError as exc:
             return web.json_response({
-                "error": f"Could not post transaction: {exc!s}",
+                "error": f"Period {period} not found",
                 "traceback": traceback.format_exc().split("\n")
             }, status=404)
 
         except Exception as exc:
             return web.json_response({
-                "error": f"Could not post transaction: {exc!s}",
+                "error": f"Could not patch transaction: {exc!s}",
                 "traceback": traceback.format_exc().split("\n")
             }, status=500)
 
@@ -224,15 +906,7 @@ class API_Transactions_Handler:
             period = request.match_info["period"]
             tr_id  = int(request.match_info["id"])
 
-            # Load transactions
-            df_tr = self._load_transactions_period(period)
-
-            # Delete transaction
-            df_tr = df_tr.drop([tr_id])
-
-            # Save data back
-            tr_path = self._transactions_path_for_period(period)
-            transactions.save(tr_path, df_tr)
+            await self.executor.run(self._delete_transactions_period, period, [tr_id])
 
             # Return response
             return web.json_response({}, status=200)
@@ -262,13 +936,19 @@ class API_Transactions_Handler:
     def routes(self, prefix=""):
         return [
             web.get   (prefix + "/transactions/periods"             , self.periods_get ),
+            web.get   (prefix + "/transactions/query"               , self.query_get   ),
+            web.get   (prefix + "/transactions/search"              , self.search_get  ),
             web.get   (prefix + "/transactions/{period:\d{4}-\d{2}}", self.all_get     ),
 
             web.get   (prefix + "/transactions/{inv_period}"        , lambda r: self.raise_error(f"Invalid period name: {r.match_info['inv_period']}", 404)),
 
+            web.post  (prefix + "/transactions/batch"               , self.batch_post),
             web.post  (prefix + "/transactions/{period:\d{4}-\d{2}}", self.post),
             web.post  (prefix + "/transactions/{inv_period}"        , lambda r: self.raise_error(f"Invalid period name: {r.match_info['inv_period']}", 404)),
 
+            web.patch (prefix + "/transactions/{period:\d{4}-\d{2}}/{id:\d+}", self.patch),
+            web.patch (prefix + "/transactions/{period:\d{4}-\d{2}}/{inv_id}", lambda r: self.raise_error(f"Invalid transaction ID: {r.match_info['inv_id']}", 404)),
+
             web.delete(prefix + "/transactions/{period:\d{4}-\d{2}}/{id:\d+}", self.delete),
             web.delete(prefix + "/transactions/{period:\d{4}-\d{2}}/{inv_id}", lambda r: self.raise_error(f"Invalid transaction ID: {r.match_info['inv_id']}", 404))
         ]
@@ -279,24 +959,45 @@ class API_Transactions_Handler:
 # └────────────────────────────────────────┘
 
 class API_Accounts_Handler:
-    def __init__(self, config):
-        self.config = config
+    def __init__(self, config, executor, index):
+        self.config   = config
+        self.executor = executor
+        self.index    = index
+
+        # (index generation, serialized JSON body)
+        self._json  = (None, None)
+
+    # ──────────────── Helpers ─────────────── #
+
+    def _json_accounts(self):
+        self.index.refresh()
+
+        generation, body = self._json
+        if generation == self.index.generation:
+            return body
+
+        # Load accounts
+        df_accounts         = self.index.load()
+        df_accounts["type"] = df_accounts["type"].transform(lambda x: x.value)
+
+        # Replace NaN with None
+        df_accounts   = df_accounts.replace({numpy.nan: None})
+
+        # Transform to dict
+        dict_accounts = df_accounts.to_dict(orient="index")
+
+        body          = json.dumps({"data": dict_accounts}).encode("utf-8")
+        self._json    = (self.index.generation, body)
+
+        return body
 
     # ───────────── GET endpoints ──────────── #
 
     async def all_get(self, request):
         try:
-            # Load accounts
-            df_accounts         = accounts.load_from_dir(self.config.dir_accounts)
-            df_accounts["type"] = df_accounts["type"].transform(lambda x: x.value)
-
-            # Replace NaN with None
-            df_accounts   = df_accounts.replace({numpy.nan: None})
-
-            # Transform to dict
-            dict_accounts = df_accounts.to_dict(orient="index")
+            body = await self.executor.run(self._json_accounts)
 
-            return web.json_response({"data": dict_accounts}, status=200)
+            return web.Response(body=body, status=200, content_type="application/json")
 
         except API_Error as exc:
             return web.json_response({
@@ -306,7 +1007,7 @@ class API_Accounts_Handler:
 
         except FileNotFoundError as exc:
             return web.json_response({
-                "error": f"Could not find period {period}"
+                "error": f"Could not find accounts directory: {exc!s}"
             }, status=404)
 
         except Exception as exc:
@@ -320,7 +1021,7 @@ class API_Accounts_Handler:
     async def post(self, request):
         try:
             path = request.match_info["path"]
-            info = await request.json()
+            info = require_fields(await request.json(), ("name", "type"), "account")
 
             # Instanciate account
             account = accounts.Account(path=path,
@@ -330,16 +1031,12 @@ class API_Accounts_Handler:
             )
 
             # Save to file
-            accounts.save(account, self.config.dir_accounts)
+            await self.executor.run(accounts.save, account, self.config.dir_accounts)
+            await self.executor.run(self.index.refresh)
 
             return web.json_response({}, status=200)
 
 
-        except KeyError  as exc:
-            return web.json_response({
-                "error": f"Missing field {exc!s}"
-            }, status=400)
-
         except API_Error as exc:
             return web.json_response({
                 "error": f"Could not create account: {exc!s}",
@@ -363,6 +1060,76 @@ class API_Accounts_Handler:
         ]
 
 
+# ┌────────────────────────────────────────┐
+# │ Reports endpoints                      │
+# └────────────────────────────────────────┘
+
+class API_Reports_Handler:
+    def __init__(self, config, executor, journals):
+        self.config   = config
+        self.executor = executor
+        self.journals = journals
+
+        # No worker processes forked from the server threads
+        self.engine   = reports.Report_Engine(config.dir_periods, workers=1)
+
+    # ──────────────── Helpers ─────────────── #
+
+    def _series(self, **kwargs):
+        # Only modified periods are computed again
+        self.journals.compact_pending()
+        self.engine.refresh()
+        return reports.series_to_dict(self.engine.series(**kwargs))
+
+    # ─────────────── GET stuff ────────────── #
+
+    async def series_get(self, request):
+        """
+        Query parameters, all optional:
+            - account:  account slug
+            - subtree:  "true" to include the accounts below account
+            - tag
+            - currency
+            - from, to: YYYY-MM periods, included
+
+        Response: per period and currency in, out, net and count
+        """
+        try:
+            for key in ("from", "to"):
+                if key in request.query and not RE_PERIOD.match(request.query[key]):
+                    raise API_Error(f"Invalid period name: {request.query[key]}", 400)
+
+            data = await self.executor.run(partial(self._series,
+                account  = request.query.get("account",  None),
+                subtree  = request.query.get("subtree",  "false").lower() in ("1", "true", "yes"),
+                tag      = request.query.get("tag",      None),
+                currency = request.query.get("currency", None),
+                start    = request.query.get("from",     None),
+                end      = request.query.get("to",       None),
+            ))
+
+            return web.json_response({"data": data})
+
+        except API_Error as exc:
+            return web.json_response({
+                "error": f"Could not compute report: {exc!s}",
+                "traceback": traceback.format_exc().split("\n")
+            }, status=exc.error_code)
+
+        except Exception as exc:
+            return web.json_response({
+                "error": f"Could not compute report: {exc!s}",
+                "traceback": traceback.format_exc().split("\n")
+            }, status=500)
+
+    # ──────────── Routes property ─────────── #
+
+    def routes(self, prefix=""):
+        return [
+            web.get(prefix + "/reports/series", self.series_get),
+        ]
+
+
 # ┌────────────────────────────────────────┐
 # │ Main webapp                            │
 # └────────────────────────────────────────┘
@@ -370,21 +1137,58 @@ class API_Accounts_Handler:
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
 
-    app = web.Application()
+    app = web.Application(middlewares=[timing_middleware])
 
     # Load config
     with open("config.toml", "r") as fhandle:
         config = SComptaWeb_Config.from_dict(toml.load(fhandle))
 
+    # Executor for blocking calls
+    executor = Blocking_Executor(config.workers, config.queue_limit)
+
+    async def shutdown_executor(app):
+        executor.shutdown()
+
+    app.on_cleanup.append(shutdown_executor)
+
+    # Accounts index and periods journals, shared by handlers. Files are
+    # parsed in-process: forking worker processes from a multithreaded
+    # server can deadlock on locks held by other threads.
+    accounts_index = accounts.Account_Index(config.dir_accounts, workers=1)
+    journals       = journal.Journal_Set(config.dir_periods)
+
+    # Journaled changes are applied in the background
+    async def compact_journals():
+        while True:
+            await asyncio.sleep(config.compact_interval)
+            try:
+                await executor.run(journals.compact_pending)
+            except Exception as exc:
+                log.error(f"Could not compact journals: {exc!s}")
+
+    async def start_compactor(app):
+        app["compactor"] = asyncio.create_task(compact_journals())
+
+    async def stop_compactor(app):
+        app["compactor"].cancel()
+
+        # Apply what is left before leaving
+        await asyncio.get_running_loop().run_in_executor(None, journals.compact_pending)
+
+    app.on_startup.append(start_compactor)
+    app.on_cleanup.insert(0, stop_compactor)
+
     # Instanciate handlers
-    h_transactions = API_Transactions_Handler(config)
-    h_accounts     = API_Accounts_Handler    (config)
+    h_transactions = API_Transactions_Handler(config, executor, accounts_index, journals)
+    h_accounts     = API_Accounts_Handler    (config, executor, accounts_index)
+    h_reports      = API_Reports_Handler     (config, executor, journals)
 
 
     # Add routes
     app.router.add_routes([
         *h_transactions.routes(),
-        *h_accounts.routes()
+        *h_accounts.routes(),
+        *h_reports.routes()
     ])
 
     # CORS setup
@@ -0,0 +1,51 @@
+"""
+┌────────────────────────────┐
+│ Tests for columnar amounts │
+└────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+import numpy  as np
+import pandas as pd
+import pytest
+
+from money      import Money
+
+from scompta.db import amounts
+
+
+def test_parse_values():
+    minor, currency = amounts.parse(pd.Series(["EUR 12.5", "USD -0.0001", " GBP +3.10000 ", "EUR .5", "CHF 7"]))
+
+    assert minor.tolist()              == [125000, -1, 31000, 5000, 70000]
+    assert list(currency)              == ["EUR", "USD", "GBP", "EUR", "CHF"]
+    assert list(currency.categories)   == ["CHF", "EUR", "GBP", "USD"]
+
+
+def test_parse_matches_money():
+    values = pd.Series([f"EUR {x:.2f}" for x in np.random.default_rng(0).uniform(-5000, 5000, 1000)])
+    minor, _ = amounts.parse(values)
+
+    expected = [int(Money(x.split(" ")[1], "EUR").amount * amounts.SCALE) for x in values]
+    assert minor.tolist() == expected
+
+
+@pytest.mark.parametrize("value", ["EUR", "EUR 1.2.3", "EUR 1-2", "EUR abc", "EUR 0.12345", "EUR 1 000", "EUR  1.00", "EUR - 1"])
+def test_parse_invalid(value):
+    with pytest.raises(ValueError):
+        amounts.parse(pd.Series([value]))
+
+
+def test_from_money():
+    minor, currency = amounts.from_money(pd.Series([Money("12.5", "EUR"), Money("-0.0001", "USD")]))
+    assert minor.tolist()  == [125000, -1]
+    assert list(currency) == ["EUR", "USD"]
+
+    with pytest.raises(ValueError):
+        amounts.from_money(pd.Series([Money("0.12345", "EUR")]))
+
+
+def test_format_values():
+    assert amounts.format_values([125000, -1, 0]).tolist() == ["12.50", "-0.0001", "0.00"]
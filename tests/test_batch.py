@@ -0,0 +1,27 @@
+"""
+┌───────────────────────────────┐
+│ Tests for packed transactions │
+└───────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+from decimal             import Decimal
+
+from scompta.model.batch import Transaction_Batch
+
+
+def test_iter_matches_getitem():
+    batch = Transaction_Batch.from_rows([
+        (1, "A", "income/salary",   "assets/checking", Decimal("3188.84"), "EUR", None),
+        (2, "B", "assets/checking", "outcome/food",    Decimal("-0.0001"), "USD", None),
+        (3, "C", "assets/checking", "outcome/food",    Decimal("12"),      "EUR", None),
+    ])
+
+    transactions = list(batch)
+
+    assert transactions == [batch[i] for i in range(len(batch))]
+    assert [str(x.amount.amount) for x in transactions] == ["3188.84", "-0.0001", "12.00"]
+    assert [x.amount.currency    for x in transactions] == ["EUR", "USD", "EUR"]
+    assert transactions[1].origin == "assets/checking"
@@ -0,0 +1,102 @@
+"""
+┌────────────────────────┐
+│ Tests for period cache │
+└────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+import os
+
+from money      import Money
+
+from scompta.db import cache, journal, transactions
+
+HEADER = "day;time;label;origin;target;amount;tag\n"
+
+
+def _period(root, name, *labels):
+    fpath = root / name / "transactions.csv"
+    fpath.parent.mkdir(parents=True, exist_ok=True)
+    fpath.write_text(HEADER + "".join(f"1;;{x};income/salary;assets/checking;EUR 1.00;\n" for x in labels))
+
+    return fpath
+
+
+def _counting_loader(calls):
+    def loader(fpath):
+        calls.append(fpath)
+        return transactions.load(fpath)
+
+    return loader
+
+
+def test_loaded_once_per_version(tmp_path):
+    fpath = _period(tmp_path, "2023-01", "A", "B")
+    calls = []
+
+    period_cache = cache.Period_Cache(loader=_counting_loader(calls))
+    assert period_cache.load(fpath)["label"].tolist() == ["A", "B"]
+    assert period_cache.load(fpath)["label"].tolist() == ["A", "B"]
+    assert len(calls) == 1
+
+    # Copies, the cached DataFrame is left untouched
+    df = period_cache.load(fpath)
+    df.loc[0, "label"] = "Z"
+    assert period_cache.load(fpath)["label"].tolist() == ["A", "B"]
+
+    # New version: same size, other mtime
+    fpath.write_text(HEADER + "1;;C;income/salary;assets/checking;EUR 1.00;\n1;;D;income/salary;assets/checking;EUR 1.00;\n")
+    os.utime(str(fpath), ns=(1, 1))
+
+    assert period_cache.load(fpath)["label"].tolist() == ["C", "D"]
+    assert len(calls) == 2
+
+
+def test_lru_eviction(tmp_path):
+    paths = [_period(tmp_path, f"2023-0{i}", "A" * 100) for i in range(1, 4)]
+    calls = []
+
+    period_cache = cache.Period_Cache(loader=_counting_loader(calls))
+    period_cache.load(paths[0])
+
+    # Room for two periods
+    period_cache.max_bytes = period_cache._nbytes * 2
+
+    period_cache.load(paths[1])
+    period_cache.load(paths[0])
+    period_cache.load(paths[2])
+    assert len(calls) == 3
+
+    # Least recently used one was evicted
+    period_cache.load(paths[0])
+    assert len(calls) == 3
+
+    period_cache.load(paths[1])
+    assert len(calls) == 4
+
+
+def test_derived_rebuilt_after_compaction(tmp_path):
+    fpath  = _period(tmp_path, "2023-01", "A")
+    builds = []
+
+    def build(df, version):
+        builds.append(version)
+        return df["label"].tolist()
+
+    period_cache   = cache.Period_Cache()
+    period_journal = journal.Period_Journal(fpath.parent)
+    period_journal.row_ids()
+
+    assert period_cache.derived(fpath, "labels", build) == ["A"]
+    assert period_cache.derived(fpath, "labels", build) == ["A"]
+    assert len(builds) == 1
+
+    # Journaled only, the file is unchanged
+    period_journal.commit([{"op": "append", "records": [{"day": 2, "time": None, "label": "B", "origin": "income/salary", "target": "assets/checking", "amount": Money("1.00", "EUR"), "tag": None}]}])
+    assert period_cache.derived(fpath, "labels", build) == ["A"]
+
+    period_journal.compact()
+    assert period_cache.derived(fpath, "labels", build) == ["A", "B"]
+    assert builds[1] != builds[0]
@@ -0,0 +1,64 @@
+"""
+┌──────────────────────────┐
+│ Tests for period catalog │
+└──────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+from scompta.db import accounts, catalog
+
+HEADER = "day;time;label;origin;target;amount;tag\n"
+
+
+def _account(root, path, tt):
+    fpath = root / f"{path}.toml"
+    fpath.parent.mkdir(parents=True, exist_ok=True)
+    fpath.write_text(f'[account]\nname = "{path}"\ntype = "{tt}"\n')
+
+
+def test_in_out_from_account_types(tmp_path):
+    _account(tmp_path / "accounts", "job/salary",   "income")
+    _account(tmp_path / "accounts", "bank/current", "assets")
+    _account(tmp_path / "accounts", "shops/food",   "outcome")
+
+    fpath = tmp_path / "periods" / "2023-01" / "transactions.csv"
+    fpath.parent.mkdir(parents=True)
+    fpath.write_text(HEADER
+        + "1;;Salary;job/salary;bank/current;EUR 100.00;\n"
+        + "2;;Food;bank/current;shops/food;EUR 30.00;\n"
+        + "3;;Refund;income/misc;bank/current;EUR 5.00;\n"
+    )
+
+    index          = accounts.Account_Index(tmp_path / "accounts", workers=1)
+    period_catalog = catalog.Period_Catalog(tmp_path / "periods", index)
+    period_catalog.refresh()
+
+    totals = period_catalog.summary("2023-01").to_dict()["totals"]["EUR"]
+    assert totals == {"total": "135.00", "in": "100.00", "out": "30.00"}
+
+    # Summaries follow account types changes
+    _account(tmp_path / "accounts", "income/misc", "income")
+    assert period_catalog.refresh()
+    assert period_catalog.summary("2023-01").to_dict()["totals"]["EUR"]["in"] == "105.00"
+
+    # Stored with the accounts key
+    reloaded = catalog.Period_Catalog(tmp_path / "periods", index)
+    assert not reloaded.refresh()
+
+
+def test_no_accounts(tmp_path):
+    (tmp_path / "accounts").mkdir()
+
+    fpath = tmp_path / "periods" / "2023-01" / "transactions.csv"
+    fpath.parent.mkdir(parents=True)
+    fpath.write_text(HEADER + "1;;Salary;job/salary;bank/current;EUR 100.00;\n")
+
+    assert accounts.load_from_dir(tmp_path / "accounts").index.name == "path"
+
+    period_catalog = catalog.Period_Catalog(tmp_path / "periods", accounts.Account_Index(tmp_path / "accounts", workers=1))
+    period_catalog.refresh()
+
+    assert period_catalog.periods == ["2023-01"]
+    assert period_catalog.summary("2023-01").to_dict()["totals"]["EUR"] == {"total": "100.00", "in": "0.00", "out": "0.00"}
@@ -0,0 +1,81 @@
+"""
+┌────────────────────────────────────┐
+│ Tests for idempotent imports dedup │
+└────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+import pandas as pd
+
+from scompta.db       import journal, transactions
+from scompta.importer import dedup
+
+HEADER  = "day;time;label;origin;target;amount;tag\n"
+ACCOUNT = "assets/checking"
+
+
+def _statement(*rows):
+    """
+    Columnar importer frame from (day, label, minor units, fitid) rows
+    """
+    return pd.DataFrame({
+        "day":      [x[0] for x in rows],
+        "time":     [None] * len(rows),
+        "label":    [x[1] for x in rows],
+        "origin":   ["<ORIGIN>"] * len(rows),
+        "target":   [ACCOUNT] * len(rows),
+        "amount":   pd.array([x[2] for x in rows], dtype="int64"),
+        "tag":      [None] * len(rows),
+        "currency": pd.Categorical(["EUR"] * len(rows)),
+        "fitid":    [x[3] for x in rows],
+    })
+
+
+def test_fingerprints_tell_identical_rows_apart():
+    df = _statement((1, "Café", 25000, None), (1, "CAFE", 25000, None), (2, "Café", 25000, None))
+
+    fps = dedup.fingerprints(df, ACCOUNT)
+    assert len(set.union(*fps)) == 3
+
+    # Same content, same order: same fingerprints
+    assert dedup.fingerprints(df, ACCOUNT) == fps
+
+
+def test_reimport_only_adds_new_rows(tmp_path):
+    period_dir = tmp_path / "2023-01"
+
+    first  = _statement((1, "Salary", 1000000, "F1"), (2, "Coffee", 25000, None))
+    second = _statement((2, "Coffee", 25000, None), (3, "Bakery", 30000, "F3"))
+
+    assert dedup.merge_into_period(period_dir, ACCOUNT, first)  == 2
+    assert dedup.merge_into_period(period_dir, ACCOUNT, first)  == 0
+    assert dedup.merge_into_period(period_dir, ACCOUNT, second) == 1
+
+    df = transactions.load(period_dir / "transactions.csv")
+    assert df["label"].tolist()                   == ["Salary", "Coffee", "Bakery"]
+    assert [str(x.amount) for x in df["amount"]] == ["100.00", "2.50", "3.00"]
+
+
+def test_import_keeps_ids_and_pending_deletes(tmp_path):
+    period_dir = tmp_path / "2023-01"
+    period_dir.mkdir()
+    (period_dir / "transactions.csv").write_text(HEADER
+        + "1;;Rent;assets/checking;outcome/rent;EUR 500.00;\n"
+        + "2;;Phone;assets/checking;outcome/phone;EUR 20.00;\n"
+    )
+
+    # As the web server would
+    period_journal = journal.Period_Journal(period_dir)
+    assert period_journal.row_ids() == [1, 2]
+    period_journal.commit([{"op": "delete", "ids": [2]}])
+
+    journals = journal.Journal_Set(tmp_path)
+    dedup.merge_into_period(period_dir, ACCOUNT, _statement((3, "Salary", 1000000, "F1")), period_journal=journals["2023-01"])
+    journals.compact_pending()
+
+    df = transactions.load(period_dir / "transactions.csv")
+    assert df["label"].tolist() == ["Rent", "Salary"]
+
+    assert journal.Period_Journal(period_dir).row_ids() == [1, 3]
@@ -0,0 +1,82 @@
+"""
+┌───────────────────────────────┐
+│ Tests for currency conversion │
+└───────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from money      import Money
+
+from scompta.db import amounts, fx
+
+
+@pytest.fixture
+def table(tmp_path):
+    (tmp_path / "USD.csv").write_text("date;rate\n2023-01-02;0.5\n2023-01-06;0.25\n")
+    (tmp_path / "CHF.csv").write_text("date;rate\n2023-01;2.0\n")
+
+    return fx.Rate_Table(tmp_path)
+
+
+def _frame(*rows):
+    return pd.DataFrame({
+        "day":    [x[0] for x in rows],
+        "origin": ["assets/checking"] * len(rows),
+        "target": ["outcome/food"]    * len(rows),
+        "amount": [Money(x[1], x[2]) for x in rows],
+    })
+
+
+def test_forward_fill(table):
+    table.refresh()
+
+    ordinals = fx.period_ordinal("2023-01") + pd.Series([2, 4, 5, 6, 31]).to_numpy() - 1
+    assert table.rates(["USD"] * 5, ordinals).tolist() == [0.5, 0.5, 0.5, 0.25, 0.25]
+
+    # Monthly rate covers the whole month, and later days
+    ordinals = fx.period_ordinal("2023-01") + pd.Series([1, 31, 59]).to_numpy() - 1
+    assert table.rates(["CHF"] * 3, ordinals).tolist() == [2.0, 2.0, 2.0]
+
+
+def test_convert(table):
+    df = _frame((3, "10.00", "USD"), (7, "10.00", "USD"), (7, "10.00", "CHF"), (7, "1.00", "EUR"))
+
+    converted = table.convert(df, period="2023-01")
+    assert amounts.to_strings(converted).tolist() == ["EUR 5.00", "EUR 2.50", "EUR 20.00", "EUR 1.00"]
+
+    # Through the base currency
+    assert amounts.to_strings(table.convert(df.iloc[2:3], to="USD", period="2023-01")).tolist() == ["USD 80.00"]
+
+    assert fx.total(df, table, period="2023-01") == Money("28.50", "EUR")
+
+
+def test_missing_rates(table):
+    # Unknown currency
+    with pytest.raises(KeyError):
+        table.convert(_frame((3, "1.00", "GBP")), period="2023-01")
+
+    # Before the first known rate
+    with pytest.raises(ValueError):
+        table.convert(_frame((1, "1.00", "USD")), period="2023-01")
+
+    with pytest.raises(ValueError):
+        table.convert(_frame((1, "1.00", "USD")), period="2022-12")
+
+
+def test_refresh_on_change(table, tmp_path):
+    assert table.refresh()
+    assert not table.refresh()
+
+    fpath = tmp_path / "USD.csv"
+    fpath.write_text("date;rate\n2023-01-02;0.75\n")
+    os.utime(str(fpath), ns=(1, 1))
+
+    assert table.refresh()
+    assert table.convert(_frame((9, "10.00", "USD")), period="2023-01")["amount"].tolist() == [75000]
@@ -0,0 +1,59 @@
+"""
+┌─────────────────────────────────────┐
+│ Tests for the accounts tree roll-up │
+└─────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+import pandas as pd
+
+from money         import Money
+
+from scompta.views import hierarchy
+
+
+def _frame(*rows):
+    return pd.DataFrame({
+        "day":    [1] * len(rows),
+        "origin": [x[0] for x in rows],
+        "target": [x[1] for x in rows],
+        "amount": [Money(x[2], "EUR") for x in rows],
+    })
+
+
+def test_tree_nodes():
+    tree = hierarchy.Account_Tree(["outcome/common/food", "outcome/common/rent", "assets/checking"])
+
+    assert tree.nodes                        == ["assets", "assets/checking", "outcome", "outcome/common", "outcome/common/food", "outcome/common/rent"]
+    assert tree.subtree("outcome/common")    == {"outcome/common", "outcome/common/food", "outcome/common/rent"}
+    assert hierarchy.ancestors("a/b/c")      == ["a", "a/b", "a/b/c"]
+
+
+def test_rollup():
+    df = _frame(
+        ("income/salary",   "assets/checking",     "100.00"),
+        ("assets/checking", "outcome/common/food", "30.00"),
+        ("assets/checking", "outcome/common/rent", "50.00"),
+        ("assets/checking", "assets/savings",      "10.00"),
+    )
+
+    tree   = hierarchy.Account_Tree()
+    totals = hierarchy.rollup(df, tree)
+
+    # Nodes include all the accounts below them
+    assert hierarchy.node_total(totals, "outcome/common") == {"EUR": Money("80.00", "EUR")}
+    assert hierarchy.node_total(totals, "outcome")        == {"EUR": Money("80.00", "EUR")}
+    assert hierarchy.node_total(totals, "income")         == {"EUR": Money("-100.00", "EUR")}
+
+    # Transfers inside a node count in and out, net is unchanged
+    assets = totals.loc[totals["node"] == "assets"].iloc[0]
+    assert (assets["in"], assets["out"], assets["net"]) == (1100000, 900000, 200000)
+    assert assets["depth"] == 1
+
+    # Slugs were added to the tree
+    assert "outcome/common/rent" in tree.nodes
+
+    assert hierarchy.subtree_total(df, "assets")       == {"EUR": Money("20.00", "EUR")}
+    assert hierarchy.subtree_total(df, "assets", tree) == {"EUR": Money("20.00", "EUR")}
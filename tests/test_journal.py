@@ -0,0 +1,222 @@
+"""
+┌──────────────────────────────────────┐
+│ Tests for the period changes journal │
+└──────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+import threading
+
+import pytest
+
+from money      import Money
+
+from scompta.db import journal, transactions
+
+HEADER = "day;time;label;origin;target;amount;tag\n"
+
+
+def _record(label, value="1.00"):
+    return {"day": 1, "time": None, "label": label, "origin": "income/salary", "target": "assets/checking", "amount": Money(value, "EUR"), "tag": None}
+
+
+@pytest.fixture
+def period_dir(tmp_path):
+    dpath = tmp_path / "2023-01"
+    dpath.mkdir()
+    (dpath / "transactions.csv").write_text(HEADER
+        + "1;;A;income/salary;assets/checking;EUR 10.00;\n"
+        + "2;;B;assets/checking;outcome/food;EUR 2.50;\n"
+    )
+
+    return dpath
+
+
+def _labels(dpath):
+    return transactions.load(dpath / "transactions.csv")["label"].tolist()
+
+
+def test_commit_and_compact(period_dir):
+    period_journal = journal.Period_Journal(period_dir)
+    assert period_journal.row_ids() == [1, 2]
+
+    assert period_journal.commit([{"op": "append", "records": [_record("C"), _record("D")]}]) == [3, 4]
+    assert period_journal.needs_compaction
+    assert period_journal.exists(4)
+
+    # Journaled only
+    assert _labels(period_dir) == ["A", "B"]
+
+    assert period_journal.compact() == 1
+    assert _labels(period_dir)      == ["A", "B", "C", "D"]
+    assert period_journal.row_ids() == [1, 2, 3, 4]
+    assert not period_journal.pending
+
+
+def test_ids_stable_across_deletes_and_patches(period_dir):
+    period_journal = journal.Period_Journal(period_dir)
+    period_journal.row_ids()
+
+    period_journal.commit([{"op": "delete", "ids": [1]}])
+    period_journal.commit([{"op": "patch", "id": 2, "fields": {"label": "B2", "amount": Money("3.00", "EUR")}}])
+
+    # Deletes alone are tombstones, not compacted
+    assert period_journal.tombstones == {1}
+    assert not period_journal.exists(1)
+
+    period_journal.compact()
+
+    df = transactions.load(period_dir / "transactions.csv")
+    assert df["label"].tolist()                   == ["B2"]
+    assert [str(x.amount) for x in df["amount"]] == ["3.00"]
+    assert period_journal.row_ids()               == [2]
+    assert period_journal.tombstones              == frozenset()
+
+    # New appends never reuse IDs
+    assert period_journal.commit([{"op": "append", "records": [_record("E")]}]) == [3]
+
+
+def test_reopen_replays_journal(period_dir):
+    period_journal = journal.Period_Journal(period_dir)
+    period_journal.row_ids()
+    period_journal.commit([{"op": "append", "records": [_record("C")]}, {"op": "delete", "ids": [2]}])
+
+    reopened = journal.Period_Journal(period_dir)
+    assert reopened.tombstones == {2}
+    assert reopened.exists(3)
+    assert reopened.commit([{"op": "append", "records": [_record("D")]}]) == [4]
+
+    reopened.compact()
+    assert _labels(period_dir) == ["A", "C", "D"]
+
+
+def test_read_applies_in_memory(period_dir):
+    period_journal = journal.Period_Journal(period_dir)
+    period_journal.row_ids()
+    period_journal.commit([{"op": "append", "records": [_record("C")]}, {"op": "delete", "ids": [1]}])
+    period_journal.commit([{"op": "patch", "id": 2, "fields": {"label": "B2"}}])
+
+    content = (period_dir / "transactions.csv").read_bytes()
+
+    # From another process
+    reader = journal.Period_Journal(period_dir)
+    assert reader.read()["label"].tolist() == ["B2", "C"]
+
+    df = reader.read(columnar=True)
+    assert df["amount"].tolist()        == [25000, 10000]
+    assert df["currency"].tolist()      == ["EUR", "EUR"]
+
+    assert (period_dir / "transactions.csv").read_bytes() == content
+    assert period_journal.compact() == 3
+    assert reader.read()["label"].tolist() == ["B2", "C"]
+
+
+def test_interrupted_compaction(period_dir, monkeypatch):
+    period_journal = journal.Period_Journal(period_dir)
+    period_journal.row_ids()
+    period_journal.commit([{"op": "append", "records": [_record("C")]}])
+
+    # Crash after the state is written, before the new file replaces the old one
+    replace = journal._replace
+    def crash(tmp_path, fpath):
+        if fpath.name == "transactions.csv":
+            raise KeyboardInterrupt()
+        replace(tmp_path, fpath)
+
+    monkeypatch.setattr(journal, "_replace", crash)
+    with pytest.raises(KeyboardInterrupt):
+        period_journal.compact()
+    monkeypatch.setattr(journal, "_replace", replace)
+
+    reopened = journal.Period_Journal(period_dir)
+    assert reopened.row_ids() == [1, 2]
+    assert reopened.exists(3)
+
+    reopened.compact()
+    assert _labels(period_dir)  == ["A", "B", "C"]
+    assert reopened.row_ids()   == [1, 2, 3]
+
+
+def test_out_of_journal_write_gets_new_ids(period_dir):
+    period_journal = journal.Period_Journal(period_dir)
+    assert period_journal.row_ids() == [1, 2]
+
+    with open(str(period_dir / "transactions.csv"), "a") as fhandle:
+        fhandle.write("3;;C;income/salary;assets/checking;EUR 1.00;\n")
+
+    assert period_journal.row_ids() == [3, 4, 5]
+    assert not period_journal.exists(1)
+
+
+def test_failed_flush(period_dir, monkeypatch):
+    period_journal = journal.Period_Journal(period_dir)
+
+    def fail(lines):
+        raise OSError("disk full")
+
+    flush = period_journal._flush
+    monkeypatch.setattr(period_journal, "_flush", fail)
+
+    with pytest.raises(OSError):
+        period_journal.commit([{"op": "delete", "ids": [1]}])
+
+    # The failure is forgotten once reported, the next commits go through
+    assert period_journal._failed  == []
+    assert not period_journal._flushing
+    assert period_journal.tombstones == frozenset()
+
+    monkeypatch.setattr(period_journal, "_flush", flush)
+    period_journal.commit([{"op": "delete", "ids": [2]}])
+    assert period_journal.tombstones == {2}
+
+
+def test_interrupted_flush_releases_writers(period_dir, monkeypatch):
+    period_journal = journal.Period_Journal(period_dir)
+
+    def interrupt(lines):
+        raise KeyboardInterrupt()
+
+    monkeypatch.setattr(period_journal, "_flush", interrupt)
+
+    with pytest.raises(KeyboardInterrupt):
+        period_journal.commit([{"op": "delete", "ids": [1]}])
+
+    assert not period_journal._flushing
+
+
+def test_concurrent_commits(period_dir):
+    period_journal = journal.Period_Journal(period_dir)
+    period_journal.row_ids()
+
+    results = []
+    def worker(i):
+        results.append(period_journal.commit([{"op": "append", "records": [_record(f"T{i}")]}]))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(x for ids in results for x in ids) == list(range(3, 19))
+
+    period_journal.compact()
+    assert len(_labels(period_dir)) == 18
+
+
+def test_out_of_journal_write_with_pending_deletes(period_dir):
+    period_journal = journal.Period_Journal(period_dir)
+    period_journal.row_ids()
+    period_journal.commit([{"op": "delete", "ids": [2]}, {"op": "append", "records": [_record("C")]}])
+
+    with open(str(period_dir / "transactions.csv"), "a") as fhandle:
+        fhandle.write("3;;D;income/salary;assets/checking;EUR 1.00;\n")
+
+    # The delete would be silently dropped
+    with pytest.raises(RuntimeError):
+        period_journal.compact()
+
+    assert _labels(period_dir) == ["A", "B", "D"]
+    assert period_journal.pending
@@ -0,0 +1,76 @@
+"""
+┌────────────────────────┐
+│ Tests for lazy imports │
+└────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+import importlib.util
+import sys
+import threading
+
+from pathlib import Path
+
+import pytest
+
+from scompta.lazy import lazy_import
+
+
+@pytest.fixture
+def slow_module(tmp_path, monkeypatch):
+    (tmp_path / "scompta_slow_module.py").write_text(
+        "import time\n"
+        "first = 1\n"
+        "time.sleep(0.2)\n"
+        "last = 2\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "scompta_slow_module"
+    sys.modules.pop("scompta_slow_module", None)
+
+
+def test_loaded_on_first_access(slow_module):
+    module = lazy_import(slow_module)
+    assert slow_module not in sys.modules
+
+    assert module.last == 2
+    assert slow_module in sys.modules
+
+    # Already imported modules are returned as is
+    assert lazy_import(slow_module) is sys.modules[slow_module]
+
+
+def test_concurrent_first_access(slow_module):
+    module  = lazy_import(slow_module)
+    results = []
+
+    def worker():
+        try:
+            results.append((module.first, module.last))
+        except Exception as exc:
+            results.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [(1, 2)] * 8
+
+
+def test_missing_module():
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import("scompta_no_such_module")
+
+
+def test_modules_import_no_heavy_dependencies():
+    # Same check as benchmarks/bench_startup.py, without the time budget
+    fpath = Path(__file__).resolve().parent.parent / "benchmarks" / "bench_startup.py"
+    spec  = importlib.util.spec_from_file_location("bench_startup", str(fpath))
+    bench = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bench)
+
+    assert bench.check(bench.run(bench.MODULES, repeat=1)) == []
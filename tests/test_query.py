@@ -0,0 +1,76 @@
+"""
+┌────────────────────────────────┐
+│ Tests for transactions queries │
+└────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+from decimal       import Decimal
+
+import pandas as pd
+import pytest
+
+from money         import Money
+
+from scompta.views import query
+
+
+def _frame(*rows):
+    return pd.DataFrame({
+        "day":    [x[0] for x in rows],
+        "time":   [None] * len(rows),
+        "label":  [x[1] for x in rows],
+        "origin": [x[2] for x in rows],
+        "target": [x[3] for x in rows],
+        "amount": [Money(x[4], x[5] if len(x) > 5 else "EUR") for x in rows],
+        "tag":    [x[6] if len(x) > 6 else None for x in rows],
+    })
+
+
+@pytest.fixture
+def index():
+    return query.Period_Index(_frame(
+        (1,  "Salary",       "income/salary",   "assets/checking",     "100.00"),
+        (3,  "Supermarché",  "assets/checking", "outcome/food",        "30.00"),
+        (5,  "Restaurant",   "assets/checking", "outcome/food/out",    "45.00", "EUR", "holidays"),
+        (10, "Transfer",     "assets/checking", "assets/savings",      "10.00"),
+        (20, "Train ticket", "assets/card",     "outcome/transport",   "25.00", "CHF", "holidays"),
+    ))
+
+
+def test_account_filters(index):
+    assert index.select(query.Transaction_Query(account="assets/checking"), "2023-01").tolist() == [0, 1, 2, 3]
+    assert index.select(query.Transaction_Query(account="outcome/food"),    "2023-01").tolist() == [1]
+
+    # Subtree matches origin or target below the account, once per row
+    assert index.select(query.Transaction_Query(account="outcome/food", subtree=True), "2023-01").tolist() == [1, 2]
+    assert index.select(query.Transaction_Query(account="assets",       subtree=True), "2023-01").tolist() == [0, 1, 2, 3, 4]
+
+    assert index.select(query.Transaction_Query(account="unknown"), "2023-01").tolist() == []
+
+
+def test_value_filters(index):
+    def select(period="2023-01", **kwargs):
+        return index.select(query.Transaction_Query(**kwargs), period).tolist()
+
+    assert select(tag="holidays")                                   == [2, 4]
+    assert select(tag="holidays", currency="EUR")                   == [2]
+    assert select(amount_min=Decimal("25"), amount_max=Decimal("45")) == [1, 2, 4]
+    assert select(label="MARCHÉ")                                   == [1]
+    assert select(label="ticket", account="outcome", subtree=True) == [4]
+
+    # Days only limit the first and last periods of the range
+    assert select(date_from="2023-01-05", date_to="2023-01-10") == [2, 3]
+    assert select(date_from="2023-01-05", period="2023-02")     == [0, 1, 2, 3, 4]
+
+
+def test_periods_in_range():
+    names = ["2023-03", "2022-12", "2023-01", "2023-02"]
+
+    assert query.Transaction_Query().periods(names)                                          == ["2022-12", "2023-01", "2023-02", "2023-03"]
+    assert query.Transaction_Query(date_from="2023-01-15", date_to="2023-02").periods(names) == ["2023-01", "2023-02"]
+
+    with pytest.raises(ValueError):
+        query.Transaction_Query(date_from="2023/01").periods(names)
@@ -0,0 +1,62 @@
+"""
+┌───────────────────────────┐
+│ Tests for the label index │
+└───────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+import os
+
+from scompta.db import search
+
+HEADER = "day;time;label;origin;target;amount;tag\n"
+
+
+def _period(root, name, *labels):
+    fpath = root / name / "transactions.csv"
+    fpath.parent.mkdir(parents=True, exist_ok=True)
+    fpath.write_text(HEADER + "".join(f"1;;{x};income/salary;assets/checking;EUR 1.00;\n" for x in labels))
+
+    return fpath
+
+
+def test_refresh_only_writes_changed_periods(tmp_path):
+    _period(tmp_path, "2023-01", "Café du coin", "Salaire")
+    fpath = _period(tmp_path, "2023-02", "Salaire mars")
+
+    index = search.Label_Index(tmp_path)
+    assert index.refresh()
+    assert index.search("sal") == [("2023-01", 1), ("2023-02", 0)]
+    assert index.search("cafe", prefix=False) == [("2023-01", 0)]
+
+    unchanged = (tmp_path / ".labels" / "2023-01.json").stat().st_mtime_ns
+
+    fpath.write_text(HEADER + "1;;Boulangerie;assets/checking;outcome/food;EUR 2.00;\n")
+    os.utime(str(fpath), ns=(1, 1))
+
+    assert index.refresh()
+    assert index.search("sal")  == [("2023-01", 1)]
+    assert index.search("boul") == [("2023-02", 0)]
+    assert "mars" not in index._sorted
+
+    assert (tmp_path / ".labels" / "2023-01.json").stat().st_mtime_ns == unchanged
+
+    # Reloaded from the index files
+    reloaded = search.Label_Index(tmp_path)
+    assert not reloaded.refresh()
+    assert reloaded.search("boul") == [("2023-02", 0)]
+    assert reloaded._sorted == index._sorted
+
+
+def test_removed_period(tmp_path):
+    fpath = _period(tmp_path, "2023-01", "Salaire")
+
+    index = search.Label_Index(tmp_path)
+    index.refresh()
+
+    fpath.unlink()
+    assert index.refresh()
+    assert index.search("salaire") == []
+    assert not (tmp_path / ".labels" / "2023-01.json").exists()
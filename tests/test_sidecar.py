@@ -0,0 +1,113 @@
+"""
+┌──────────────────────────────┐
+│ Tests for the binary sidecar │
+└──────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from scompta.db import sidecar, transactions
+
+HEADER = "day;time;label;origin;target;amount;tag\n"
+
+
+def _write(fpath, *rows):
+    fpath.write_text(HEADER + "".join(f"{x}\n" for x in rows))
+
+
+def test_sidecar_invalidated_on_change(tmp_path):
+    fpath = tmp_path / "transactions.csv"
+    _write(fpath, "1;;A;income/salary;assets/checking;EUR 10.00;")
+
+    df = transactions.load(fpath, columnar=True)
+    assert df["amount"].tolist() == [100000]
+    assert (sidecar.sidecar_path(fpath) / "meta.json").exists()
+
+    _write(fpath, "1;;A;income/salary;assets/checking;EUR 10.00;", "2;;B;assets/checking;outcome/food;EUR 2.5;")
+    os.utime(str(fpath), ns=(0, 0))
+
+    df = transactions.load(fpath, columnar=True)
+    assert df["amount"].tolist() == [100000, 25000]
+    assert df["label"].tolist()  == ["A", "B"]
+
+
+def test_sidecar_touched_file(tmp_path):
+    fpath = tmp_path / "transactions.csv"
+    _write(fpath, "1;;A;income/salary;assets/checking;EUR 10.00;")
+
+    expected = transactions.load(fpath, columnar=True)
+    os.utime(str(fpath), ns=(0, 0))
+
+    df = transactions.load(fpath, columnar=True)
+    assert df["amount"].tolist() == expected["amount"].tolist()
+    assert sidecar._read_meta(fpath)["stat"][0] == 0
+
+
+def test_sidecar_columns_are_mapped(tmp_path):
+    fpath = tmp_path / "transactions.csv"
+    _write(fpath, "1;;A;income/salary;assets/checking;EUR 10.00;")
+
+    transactions.load(fpath, columnar=True)
+    df = transactions.load(fpath, columnar=True)
+
+    # Not read into memory
+    arr = df["amount"].to_numpy()
+    while arr is not None and not isinstance(arr, np.memmap):
+        arr = arr.base
+    assert arr is not None
+
+    with pytest.raises(ValueError):
+        df.loc[0, "amount"] = 0
+
+    # Modified through a copy
+    copied = df.copy()
+    copied.loc[0, "amount"] = 0
+    assert df["amount"].tolist() == [100000]
+
+
+def test_money_mode_keeps_text(tmp_path):
+    fpath = tmp_path / "transactions.csv"
+    _write(fpath, "1;;A;income/salary;assets/checking;EUR 1000.000;", "2;;B;assets/checking;outcome/food;EUR 0.12345;")
+
+    df = transactions.load(fpath)
+    assert [str(x.amount) for x in df["amount"]] == ["1000.000", "0.12345"]
+    assert not sidecar.sidecar_path(fpath).exists()
+
+
+def test_concurrent_writers(tmp_path):
+    fpath = tmp_path / "transactions.csv"
+    _write(fpath, *[f"{i % 28 + 1};;L{i};income/salary;assets/checking;EUR {i}.01;" for i in range(200)])
+
+    expected = transactions.load(fpath, columnar=True, sidecar=False)
+    stat     = sidecar._stat(fpath)
+    digest   = sidecar.content_hash(fpath.read_bytes())
+    errors   = []
+
+    def worker():
+        try:
+            for _ in range(10):
+                sidecar.write(fpath, expected, stat, digest)
+                df = sidecar.load(fpath, lambda data: expected)
+                assert df["amount"].tolist() == expected["amount"].tolist()
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+
+    # Only the last generation is left
+    meta = sidecar._read_meta(fpath)
+    assert all(x.name.startswith(meta["generation"]) for x in sidecar.sidecar_path(fpath).glob("*.npy"))
+    assert not list(sidecar.sidecar_path(fpath).glob("*.tmp"))
@@ -0,0 +1,136 @@
+"""
+┌────────────────────────────────────────────────┐
+│ Tests for data derived from the periods folder │
+└────────────────────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+import os
+
+from money      import Money
+
+from scompta.db import balances, journal, ledger, reports, snapshot
+
+HEADER = "day;time;label;origin;target;amount;tag\n"
+
+
+def _period(root, name, *rows):
+    fpath = root / name / "transactions.csv"
+    fpath.parent.mkdir(parents=True, exist_ok=True)
+    fpath.write_text(HEADER + "".join(f"{x}\n" for x in rows))
+
+    return fpath
+
+
+def test_changes(tmp_path):
+    _period(tmp_path, "2023-01", "1;;A;income/salary;assets/checking;EUR 10.00;")
+    fpath = _period(tmp_path, "2023-02", "1;;B;income/salary;assets/checking;EUR 20.00;")
+
+    changes = snapshot.changes(tmp_path, {})
+    assert changes.names == ["2023-01", "2023-02"]
+    assert sorted(changes.changed) == ["2023-01", "2023-02"]
+
+    versions = {name: ver for name, (_, ver) in changes.changed.items()}
+    assert not snapshot.changes(tmp_path, versions)
+
+    os.utime(str(fpath), ns=(1, 1))
+    versions["2022-12"] = [0, 0, 0]
+
+    changes = snapshot.changes(tmp_path, versions)
+    assert list(changes.changed) == ["2023-02"]
+    assert changes.removed       == {"2022-12"}
+
+
+def test_frames_parsed_once(tmp_path, monkeypatch):
+    fpath   = _period(tmp_path, "2023-01", "1;;A;income/salary;assets/checking;EUR 10.00;")
+    version = snapshot.version(fpath)
+    calls   = []
+
+    load_period = ledger._load_period
+    monkeypatch.setattr(ledger, "_load_period", lambda *args: calls.append(args) or load_period(*args))
+
+    first  = snapshot.load_frame(fpath, version)
+    second = snapshot.load_frame(fpath, version)
+
+    assert first is second
+    assert len(calls) == 1
+
+
+def test_balances_prefix_sums(tmp_path):
+    _period(tmp_path, "2023-01", "1;;A;income/salary;assets/checking;EUR 100.00;")
+    _period(tmp_path, "2023-02", "1;;B;assets/checking;outcome/food;EUR 30.00;")
+    fpath = _period(tmp_path, "2023-03", "1;;C;income/salary;assets/checking;EUR 100.00;")
+
+    engine = balances.Balance_Engine(tmp_path)
+    assert engine.refresh()
+
+    assert str(engine.balance("assets/checking", "2023-02")["EUR"].amount) == "70.00"
+    assert str(engine.balance("assets/checking")["EUR"].amount)            == "170.00"
+
+    # Only later closings move
+    _period(tmp_path, "2023-02", "1;;B;assets/checking;outcome/food;EUR 50.00;")
+    os.utime(str(tmp_path / "2023-02" / "transactions.csv"), ns=(1, 1))
+
+    reloaded = balances.Balance_Engine(tmp_path)
+    assert reloaded.refresh()
+    assert str(reloaded.balance("assets/checking", "2023-01")["EUR"].amount) == "100.00"
+    assert str(reloaded.balance("assets/checking")["EUR"].amount)            == "150.00"
+
+    fpath.unlink()
+    assert reloaded.refresh()
+    assert str(reloaded.balance("assets/checking")["EUR"].amount) == "50.00"
+
+
+def test_balances_decimals(tmp_path):
+    _period(tmp_path, "2023-01", "1;;A;income/salary;assets/checking;EUR 100.125;", "2;;B;assets/checking;outcome/food;EUR 0.125;")
+
+    engine = balances.Balance_Engine(tmp_path)
+    engine.refresh()
+
+    # As written in transactions files, at least 2 decimals
+    assert str(engine.balance("assets/checking")["EUR"].amount) == "100.00"
+    assert str(engine.balance("outcome/food")["EUR"].amount)    == "0.125"
+
+
+def test_pending_journal_applied_in_memory(tmp_path):
+    fpath = _period(tmp_path, "2023-01",
+        "1;;A;income/salary;assets/checking;EUR 100.00;",
+        "2;;B;assets/checking;outcome/food;EUR 30.00;",
+    )
+
+    engine = balances.Balance_Engine(tmp_path)
+    engine.refresh()
+
+    # As the web server would, in another process
+    period_journal = journal.Period_Journal(fpath.parent)
+    period_journal.row_ids()
+    period_journal.commit([
+        {"op": "delete", "ids": [2]},
+        {"op": "append", "records": [{"day": 2, "time": None, "label": "C", "origin": "assets/checking", "target": "outcome/food", "amount": Money("5.00", "EUR"), "tag": None}]},
+    ])
+
+    content = fpath.read_bytes()
+    assert engine.refresh()
+    assert str(engine.balance("assets/checking")["EUR"].amount) == "95.00"
+
+    # Only the server compacts
+    assert fpath.read_bytes() == content
+    assert period_journal.pending
+
+    df = ledger.load_ledger(tmp_path, workers=1, journals=True)
+    assert df["label"].tolist() == ["A", "C"]
+
+
+def test_reports_refresh(tmp_path):
+    _period(tmp_path, "2023-01", "1;;A;income/salary;assets/checking;EUR 100.00;")
+
+    engine = reports.Report_Engine(tmp_path, workers=1)
+    assert engine.refresh()
+    assert not engine.refresh()
+
+    series = engine.series(account="assets/checking")
+    assert series[["period", "in", "out"]].values.tolist() == [["2023-01", 1000000, 0]]
+
+    assert not list(tmp_path.glob(".*.tmp"))
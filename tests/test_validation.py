@@ -0,0 +1,40 @@
+"""
+┌───────────────────────────────────┐
+│ Tests for ledger integrity checks │
+└───────────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+from money                    import Money
+
+from scompta.db               import accounts
+from scompta.views.validation import Ledger_Validator
+
+
+def _account(root, path):
+    fpath = root / f"{path}.toml"
+    fpath.parent.mkdir(parents=True, exist_ok=True)
+    fpath.write_text(f'[account]\nname = "{path}"\ntype = "{path.split("/")[0]}"\n')
+
+
+def test_refresh_from_index_max_age(tmp_path):
+    _account(tmp_path, "assets/checking")
+    _account(tmp_path, "income/salary")
+
+    index     = accounts.Account_Index(tmp_path, workers=1)
+    validator = Ledger_Validator()
+    record    = {"origin": "income/salary", "target": "assets/savings", "amount": Money("10", "EUR")}
+
+    validator.refresh_from_index(index, max_age=60)
+    assert [x.value for x in validator.check_record(record).issues] == ["assets/savings"]
+
+    # Not seen until the index is walked again
+    _account(tmp_path, "assets/savings")
+    validator.refresh_from_index(index, max_age=60)
+    assert not validator.check_record(record).ok
+
+    index.refresh()
+    validator.refresh_from_index(index, max_age=60)
+    assert validator.check_record(record).ok
@@ -0,0 +1,264 @@
+"""
+┌─────────────────────────────┐
+│ Tests for the web endpoints │
+└─────────────────────────────┘
+
+ Florian Dupeyron
+ October 2026
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from aiohttp            import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from scompta.db         import accounts, journal, search
+
+from scompta_web        import __main__ as scompta_web
+
+HEADER = "day;time;label;origin;target;amount;tag\n"
+
+
+def _period(root, name, *rows):
+    fpath = root / "periods" / name / "transactions.csv"
+    fpath.parent.mkdir(parents=True, exist_ok=True)
+    fpath.write_text(HEADER + "".join(f"{x}\n" for x in rows))
+
+
+def _account(root, path, tt):
+    fpath = root / "accounts" / f"{path}.toml"
+    fpath.parent.mkdir(parents=True, exist_ok=True)
+    fpath.write_text(f'[account]\nname = "{path}"\ntype = "{tt}"\n')
+
+
+def _run(root, scenario):
+    """
+    Run scenario(client) against the endpoints serving the given root
+    """
+    (root / "accounts").mkdir(exist_ok=True)
+    (root / "periods" ).mkdir(exist_ok=True)
+
+    async def main():
+        config   = scompta_web.SComptaWeb_Config(dir_accounts=root / "accounts", dir_periods=root / "periods")
+        executor = scompta_web.Blocking_Executor(config.workers, config.queue_limit)
+
+        accounts_index = accounts.Account_Index(config.dir_accounts, workers=1)
+        journals       = journal.Journal_Set(config.dir_periods)
+
+        app = web.Application()
+        app.router.add_routes([
+            *scompta_web.API_Transactions_Handler(config, executor, accounts_index, journals).routes(),
+            *scompta_web.API_Accounts_Handler    (config, executor, accounts_index).routes(),
+            *scompta_web.API_Reports_Handler     (config, executor, journals).routes(),
+        ])
+
+        try:
+            async with TestClient(TestServer(app)) as client:
+                return await scenario(client)
+        finally:
+            executor.shutdown()
+
+    return asyncio.run(main())
+
+
+def test_periods_without_accounts(tmp_path):
+    _period(tmp_path, "2023-01", "1;;Salary;job/salary;bank/current;EUR 100.00;")
+
+    async def scenario(client):
+        resp = await client.get("/transactions/periods")
+        assert resp.status == 200
+
+        data = await resp.json()
+        assert data["periods"]                     == ["2023-01"]
+        assert data["summaries"]["2023-01"]["rows"] == 1
+
+    _run(tmp_path, scenario)
+
+
+def test_post_missing_fields(tmp_path):
+    _period(tmp_path, "2023-01")
+
+    async def scenario(client):
+        resp = await client.post("/transactions/2023-01", json={"day": 1, "label": "A", "from": "job/salary", "amount": {"value": "1.00"}})
+        assert resp.status == 400
+        assert "to" in (await resp.json())["error"]
+
+        resp = await client.post("/transactions/2023-01", json={"day": 1, "label": "A", "from": "job/salary", "to": "bank/current", "amount": {"value": "1.00"}})
+        assert resp.status == 400
+        assert "currency" in (await resp.json())["error"]
+
+        # No accounts defined: invalid, not a server error
+        resp = await client.post("/transactions/2023-01", json={"day": 1, "label": "A", "from": "job/salary", "to": "bank/current", "amount": {"value": "1.00", "currency": "EUR"}})
+        assert resp.status == 400
+        assert (await resp.json())["error"] == "Invalid transaction"
+
+        resp = await client.post("/accounts/savings", json={"type": "assets"})
+        assert resp.status == 400
+        assert "name" in (await resp.json())["error"]
+
+    _run(tmp_path, scenario)
+
+
+def test_search_ids_match_indexed_version(tmp_path, monkeypatch):
+    _period(tmp_path, "2023-01", "1;;Rent;bank/current;home/rent;EUR 500.00;", "2;;Salary;job/salary;bank/current;EUR 100.00;")
+
+    async def scenario(client):
+        resp = await client.get("/transactions/2023-01")
+        ids  = {x["label"]: x["id"] for x in (await resp.json())["data"]}
+
+        resp = await client.get("/transactions/search", params={"q": "salary"})
+        assert resp.status == 200
+        assert (await resp.json())["data"] == [{"period": "2023-01", "id": ids["Salary"]}]
+
+        # Rows move while the index lags behind: positions are not used
+        monkeypatch.setattr(search.Label_Index, "refresh", lambda self: False)
+
+        fpath = tmp_path / "periods" / "2023-01" / "transactions.csv"
+        fpath.write_text(HEADER + "2;;Salary;job/salary;bank/current;EUR 100.00;\n")
+        os.utime(str(fpath), ns=(1, 1))
+
+        resp = await client.get("/transactions/search", params={"q": "salary"})
+        assert resp.status == 503
+
+    _run(tmp_path, scenario)
+
+
+def test_query_across_periods(tmp_path):
+    _period(tmp_path, "2023-01", "1;;A;job/salary;bank/current;EUR 100.00;", "2;;B;bank/current;shops/food;EUR 30.00;")
+    _period(tmp_path, "2023-02", "1;;C;bank/current;shops/food;EUR 20.00;", "9;;D;bank/current;shops/food/bakery;EUR 5.00;")
+    _period(tmp_path, "2023-03", "1;;E;bank/current;shops/food;EUR 10.00;")
+
+    async def scenario(client):
+        async def labels(**params):
+            resp = await client.get("/transactions/query", params=params)
+            assert resp.status == 200
+
+            data = await resp.json()
+            return [(x["period"], x["label"]) for x in data["data"]], data["total"]
+
+        # Periods in order, rows in file order
+        assert await labels(account="shops/food", subtree="true") == ([("2023-01", "B"), ("2023-02", "C"), ("2023-02", "D"), ("2023-03", "E")], 4)
+        assert await labels(account="shops/food", **{"from": "2023-02-05", "to": "2023-03"}) == ([("2023-03", "E")], 1)
+
+        # Pages cut across periods
+        assert await labels(account="bank/current", offset="1", limit="2") == ([("2023-01", "B"), ("2023-02", "C")], 5)
+
+        resp = await client.get("/transactions/query", params={"from": "2023/01"})
+        assert resp.status == 400
+
+    _run(tmp_path, scenario)
+
+
+def _record(period, label):
+    return {"period": period, "day": 1, "label": label, "from": "job/salary", "to": "bank/current", "amount": {"value": "1.00", "currency": "EUR"}}
+
+
+@pytest.fixture
+def ledger_root(tmp_path):
+    _account(tmp_path, "job/salary",   "income")
+    _account(tmp_path, "bank/current", "assets")
+    _period(tmp_path, "2023-01", "1;;A;job/salary;bank/current;EUR 100.00;")
+
+    return tmp_path
+
+
+def test_batch_status(ledger_root, monkeypatch):
+    commit = journal.Period_Journal.commit
+
+    def failing(periods):
+        def fail(self, operations):
+            if self.period_dir.name in periods:
+                raise OSError("disk full")
+            return commit(self, operations)
+
+        monkeypatch.setattr(journal.Period_Journal, "commit", fail)
+
+    async def scenario(client):
+        async def post(records):
+            resp = await client.post("/transactions/batch", json=records)
+            return resp.status, await resp.json()
+
+        status, data = await post([_record("2023-01", "B"), _record("2023-02", "C")])
+        assert status == 200
+        assert data["written"] == 2
+        assert all(x["ok"] and "id" in x for x in data["results"])
+
+        # Invalid records: nothing written
+        status, data = await post([_record("2023-01", "D"), {"period": "2023-01", "day": 1}])
+        assert status == 400
+        assert [x["ok"] for x in data["results"]] == [True, False]
+
+        failing({"2023-03"})
+        status, data = await post([_record("2023-01", "E"), _record("2023-03", "F")])
+        assert status == 207
+        assert [x["ok"] for x in data["results"]] == [True, False]
+
+        failing({"2023-01", "2023-03"})
+        status, data = await post([_record("2023-01", "G"), _record("2023-03", "H")])
+        assert status == 500
+        assert data["written"] == 0
+
+        monkeypatch.setattr(journal.Period_Journal, "commit", commit)
+
+        resp = await client.get("/transactions/2023-01")
+        assert [x["label"] for x in (await resp.json())["data"]] == ["A", "B", "E"]
+
+    _run(ledger_root, scenario)
+
+
+def test_patch_status(ledger_root):
+    async def scenario(client):
+        resp  = await client.get("/transactions/2023-01")
+        tr_id = (await resp.json())["data"][0]["id"]
+
+        resp = await client.patch(f"/transactions/2023-01/{tr_id}", json={"label": "A2", "amount": {"value": "2.00", "currency": "EUR"}})
+        assert resp.status == 200
+
+        resp = await client.get("/transactions/2023-01")
+        row  = (await resp.json())["data"][0]
+        assert (row["id"], row["label"], row["amount"]) == (tr_id, "A2", {"currency": "EUR", "amount": "2.00"})
+
+        # Client errors
+        resp = await client.patch(f"/transactions/2023-01/{tr_id}", json={"unknown": 1})
+        assert resp.status == 400
+
+        resp = await client.patch(f"/transactions/2023-01/{tr_id}", json={"amount": {"value": "2.00"}})
+        assert resp.status == 400
+
+        resp = await client.patch(f"/transactions/2023-01/{tr_id}", json={"to": "unknown/account"})
+        assert resp.status == 400
+
+        resp = await client.patch(f"/transactions/2023-01/{tr_id + 100}", json={"label": "X"})
+        assert resp.status == 404
+
+        resp = await client.patch(f"/transactions/2024-01/{tr_id}", json={"label": "X"})
+        assert resp.status == 404
+
+    _run(ledger_root, scenario)
+
+
+def test_reports_series(ledger_root):
+    _period(ledger_root, "2023-02", "1;;B;bank/current;job/salary;EUR 30.00;")
+
+    async def scenario(client):
+        resp = await client.get("/reports/series", params={"account": "bank/current"})
+        assert resp.status == 200
+        data = (await resp.json())["data"]
+        assert [x["period"] for x in data] == ["2023-01", "2023-02"]
+
+        resp = await client.get("/reports/series", params={"account": "bank/current", "from": "2023-02", "to": "2023-02"})
+        assert resp.status == 200
+        assert [x["period"] for x in (await resp.json())["data"]] == ["2023-02"]
+
+        resp = await client.get("/reports/series", params={"account": "unknown/account"})
+        assert resp.status == 200
+        assert (await resp.json())["data"] == []
+
+        for key in ("from", "to"):
+            resp = await client.get("/reports/series", params={key: "2023/01"})
+            assert resp.status == 400
+
+    _run(ledger_root, scenario)